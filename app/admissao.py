@@ -0,0 +1,186 @@
+"""Controle de admissão da página pública de vagas (/vagas/publico/{slug})
+
+A rota não tem autenticação: um crawler ou um pico de acessos pode ocupar
+as threads do threadpool e as conexões do pool que as rotas dos
+recrutadores também usam. `admitir_publico` é uma dependência async,
+resolvida no event loop antes de a rota ir para o threadpool ou abrir uma
+sessão, e aplica nesta ordem:
+
+- um balde de tokens por IP do cliente e outro por slug: acima da taxa,
+  429 com Retry-After. Um slug que não existe (404) consultou o banco e
+  gasta o token como qualquer outra requisição; só as primeiras
+  PUBLICO_DEVOLUCOES_IP por minuto de cada IP o devolvem, o bastante para
+  quem segue um link quebrado e pouco para quem varre slugs ao acaso;
+- um limite de requisições públicas simultâneas que deixa
+  PUBLICO_RESERVA_POOL da capacidade do pool (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+  para as rotas autenticadas: sem vaga livre, 503 com Retry-After na hora,
+  sem esperar em fila.
+
+O IP é o de `request.client`; atrás de um proxy, rode o uvicorn com
+--proxy-headers/--forwarded-allow-ips para ele vir do X-Forwarded-For.
+Baldes e contadores ficam em memória, por processo (GET /diagnostico/admissao).
+"""
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import HTTPException, Request
+
+from .database import DB_MAX_OVERFLOW, DB_POOL_SIZE
+
+PUBLICO_TAXA_IP = float(os.getenv("PUBLICO_TAXA_IP", "5"))              # Requisições/s por IP (0 desliga)
+PUBLICO_RAJADA_IP = int(os.getenv("PUBLICO_RAJADA_IP", "20"))           # Rajada aceita por IP
+PUBLICO_TAXA_SLUG = float(os.getenv("PUBLICO_TAXA_SLUG", "50"))         # Requisições/s por slug (0 desliga)
+PUBLICO_RAJADA_SLUG = int(os.getenv("PUBLICO_RAJADA_SLUG", "100"))      # Rajada aceita por slug
+PUBLICO_RESERVA_POOL = float(os.getenv("PUBLICO_RESERVA_POOL", "0.5"))  # Fração do pool reservada às rotas autenticadas
+PUBLICO_CONCORRENCIA = int(os.getenv("PUBLICO_CONCORRENCIA", "0"))      # Limite explícito (0 = calculado pela reserva)
+PUBLICO_MAX_CHAVES = int(os.getenv("PUBLICO_MAX_CHAVES", "10000"))      # Baldes mantidos em memória (LRU)
+PUBLICO_DEVOLUCOES_IP = int(os.getenv("PUBLICO_DEVOLUCOES_IP", "5"))    # 404/min por IP que devolvem o token
+
+
+class Rejeitada(Exception):
+    """Requisição pública recusada; vale tentar de novo depois de `retry_after` segundos"""
+
+    def __init__(self, status_code: int, motivo: str, retry_after: int):
+        super().__init__(motivo)
+        self.status_code = status_code
+        self.motivo = motivo
+        self.retry_after = retry_after
+
+
+class Baldes:
+    """Um balde de tokens por chave (IP ou slug), com no máximo `max_chaves` baldes (LRU)
+
+    Cada balde enche `taxa` tokens por segundo até `rajada`. Uma chave
+    descartada pelo LRU volta com o balde cheio, o que só favorece quem
+    ficou muito tempo sem aparecer.
+    """
+
+    def __init__(self, taxa: float, rajada: int, max_chaves: int = PUBLICO_MAX_CHAVES):
+        self.taxa = taxa
+        self.rajada = max(1, rajada)
+        self.max_chaves = max_chaves
+        self._baldes = OrderedDict()  # chave -> (tokens, instante da última atualização)
+        self._lock = threading.Lock()
+
+    def retirar(self, chave: str, agora: Optional[float] = None) -> float:
+        """Consome um token: 0 se havia, senão os segundos até o próximo token"""
+        if self.taxa <= 0:
+            return 0.0
+        agora = time.monotonic() if agora is None else agora
+        with self._lock:
+            tokens, instante = self._baldes.pop(chave, (self.rajada, agora))
+            tokens = min(self.rajada, tokens + (agora - instante) * self.taxa)
+            if tokens >= 1:
+                tokens -= 1
+                espera = 0.0
+            else:
+                espera = (1 - tokens) / self.taxa
+            self._baldes[chave] = (tokens, agora)
+            while len(self._baldes) > self.max_chaves:
+                self._baldes.popitem(last=False)
+        return espera
+
+    def devolver(self, chave: str):
+        """Devolve o token consumido por `retirar` (sem passar da rajada)"""
+        if self.taxa <= 0:
+            return
+        with self._lock:
+            if chave in self._baldes:
+                tokens, instante = self._baldes[chave]
+                self._baldes[chave] = (min(self.rajada, tokens + 1), instante)
+
+    def __len__(self):
+        return len(self._baldes)
+
+
+def limite_concorrencia(reserva: float = PUBLICO_RESERVA_POOL) -> int:
+    """Requisições públicas simultâneas que deixam `reserva` do pool livre (no mínimo 1)"""
+    if PUBLICO_CONCORRENCIA > 0:
+        return PUBLICO_CONCORRENCIA
+    return max(1, int((DB_POOL_SIZE + DB_MAX_OVERFLOW) * (1 - reserva)))
+
+
+class Controle:
+    """Baldes por IP e por slug e o limite de concorrência, com os contadores de cada decisão"""
+
+    def __init__(self, taxa_ip: float = PUBLICO_TAXA_IP, rajada_ip: int = PUBLICO_RAJADA_IP,
+                 taxa_slug: float = PUBLICO_TAXA_SLUG, rajada_slug: int = PUBLICO_RAJADA_SLUG,
+                 concorrencia: Optional[int] = None, devolucoes_ip: int = PUBLICO_DEVOLUCOES_IP):
+        self.por_ip = Baldes(taxa_ip, rajada_ip)
+        self.devolucoes_ip = Baldes(devolucoes_ip / 60, devolucoes_ip) if devolucoes_ip > 0 else None
+        self.por_slug = Baldes(taxa_slug, rajada_slug)
+        self.concorrencia = limite_concorrencia() if concorrencia is None else concorrencia  # 0 = sem limite
+        self._lock = threading.Lock()
+        self.em_andamento = 0
+        self.pico = 0
+        self.contadores = {"admitidas": 0, "limitadas_ip": 0, "limitadas_slug": 0, "descartadas": 0,
+                           "devolvidas_ip": 0}
+
+    def _contar(self, nome: str):
+        with self._lock:
+            self.contadores[nome] += 1
+
+    def admitir(self, ip: str, slug: str):
+        """Reserva uma vaga para a requisição ou levanta Rejeitada (429 ou 503)"""
+        for baldes, chave, contador in ((self.por_ip, ip, "limitadas_ip"), (self.por_slug, slug, "limitadas_slug")):
+            espera = baldes.retirar(chave)
+            if espera > 0:
+                self._contar(contador)
+                raise Rejeitada(429, "Muitas requisições", max(1, math.ceil(espera)))
+        with self._lock:
+            if self.concorrencia and self.em_andamento >= self.concorrencia:
+                self.contadores["descartadas"] += 1
+                raise Rejeitada(503, "Servidor ocupado", 1)
+            self.em_andamento += 1
+            self.pico = max(self.pico, self.em_andamento)
+            self.contadores["admitidas"] += 1
+
+    def devolver_ip(self, ip: str):
+        """Devolve o token do IP de uma requisição cujo slug não existia, dentro da cota de devoluções"""
+        if self.devolucoes_ip is None or self.devolucoes_ip.retirar(ip) > 0:
+            return
+        self.por_ip.devolver(ip)
+        self._contar("devolvidas_ip")
+
+    def liberar(self):
+        with self._lock:
+            self.em_andamento -= 1
+
+    def estado(self) -> dict:
+        with self._lock:
+            return {
+                "limite_concorrencia": self.concorrencia,
+                "em_andamento": self.em_andamento,
+                "pico": self.pico,
+                **self.contadores,
+                "baldes_ip": len(self.por_ip),
+                "baldes_slug": len(self.por_slug),
+            }
+
+
+controle = Controle()
+
+
+def configurar(novo: Controle):
+    """Troca o controle usado pela rota pública (ex.: nos testes e no teste de carga)"""
+    global controle
+    controle = novo
+
+
+async def admitir_publico(slug: str, request: Request):
+    """Dependência da rota pública: a vaga fica reservada até a resposta terminar de ser enviada"""
+    atual = controle
+    ip = request.client.host if request.client else "desconhecido"
+    atual.admitir(ip, slug)
+    try:
+        yield
+    except HTTPException as exc:
+        if exc.status_code == 404:
+            atual.devolver_ip(ip)
+        raise
+    finally:
+        atual.liberar()
@@ -0,0 +1,165 @@
+"""Armazenamento dos vídeos dos candidatos fora da linha do banco
+
+Os arquivos ficam em um blob store endereçado por conteúdo: o nome é o
+SHA-256 dos bytes, então o mesmo vídeo enviado duas vezes (ou por dois
+candidatos) ocupa espaço uma vez só. A linha do candidato guarda apenas
+video_digest, video_tamanho e video_tipo.
+
+O upload é lido em streaming para um arquivo temporário enquanto o hash é
+calculado, e só então movido (os.replace, atômico) para o caminho final.
+O download aceita um intervalo de Range e usa a extensão ASGI
+`http.response.zerocopysend` (sendfile) quando o servidor oferece; caso
+contrário envia fatias de um mmap do arquivo.
+"""
+import hashlib
+import mmap
+import os
+import re
+import tempfile
+from typing import AsyncIterator, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from starlette.concurrency import run_in_threadpool
+from starlette.types import Receive, Scope, Send
+
+BLOB_DIR = os.getenv("BLOB_DIR", "./blobs")                                   # Raiz do blob store local
+BLOB_MAX_BYTES = int(os.getenv("BLOB_MAX_BYTES", str(512 * 1024 * 1024)))     # Tamanho máximo de um upload
+BLOB_PEDACO = 1024 * 1024                                                     # Bytes por envio no download
+
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+class BlobGrandeDemais(ValueError):
+    """O upload passou de BLOB_MAX_BYTES"""
+
+
+class LocalBlobStore:
+    """Blob store no sistema de arquivos local: <raiz>/<2 hex>/<2 hex>/<sha256>"""
+
+    def __init__(self, raiz: str):
+        self.raiz = raiz
+
+    def caminho(self, digest: str) -> str:
+        return os.path.join(self.raiz, digest[:2], digest[2:4], digest)
+
+    def existe(self, digest: str) -> bool:
+        return os.path.exists(self.caminho(digest))
+
+    async def gravar(self, pedacos: AsyncIterator[bytes], max_bytes: Optional[int] = None) -> Tuple[str, int]:
+        """Grava o stream e devolve (sha256, tamanho); conteúdo repetido não é gravado de novo"""
+        max_bytes = BLOB_MAX_BYTES if max_bytes is None else max_bytes
+        os.makedirs(self.raiz, exist_ok=True)
+        descritor, temporario = tempfile.mkstemp(dir=self.raiz, prefix=".upload-")
+        sha = hashlib.sha256()
+        tamanho = 0
+        try:
+            with os.fdopen(descritor, "wb") as arquivo:
+                async for pedaco in pedacos:
+                    if not pedaco:
+                        continue
+                    tamanho += len(pedaco)
+                    if tamanho > max_bytes:
+                        raise BlobGrandeDemais(tamanho)
+                    sha.update(pedaco)
+                    await run_in_threadpool(arquivo.write, pedaco)
+            digest = sha.hexdigest()
+            destino = self.caminho(digest)
+            if os.path.exists(destino):
+                os.unlink(temporario)
+            else:
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                os.replace(temporario, destino)
+            return digest, tamanho
+        except BaseException:
+            if os.path.exists(temporario):
+                os.unlink(temporario)
+            raise
+
+
+def _store_padrao() -> LocalBlobStore:
+    return LocalBlobStore(BLOB_DIR)
+
+
+store = _store_padrao()
+
+
+def configurar_store(novo):
+    """Troca o blob store em uso (ex.: diretório temporário nos testes)"""
+    global store
+    store = novo
+
+
+# ===== DOWNLOAD COM RANGE =====
+
+def ler_range(cabecalho: Optional[str], tamanho: int) -> Optional[Tuple[int, int]]:
+    """Intervalo [inicio, fim] pedido em `Range`; None = arquivo inteiro
+
+    Só um intervalo é atendido; pedidos com vários intervalos recebem o
+    arquivo inteiro, o que a RFC 9110 permite. Intervalo impossível: 416.
+    """
+    if not cabecalho:
+        return None
+    encontrado = _RANGE.match(cabecalho.strip())
+    if encontrado is None:
+        return None
+    inicio, fim = encontrado.groups()
+    if inicio == "" and fim == "":
+        return None
+    if inicio == "":
+        # bytes=-N: os últimos N bytes
+        inicio, fim = max(tamanho - int(fim), 0), tamanho - 1
+    else:
+        inicio, fim = int(inicio), min(int(fim), tamanho - 1) if fim else tamanho - 1
+    if inicio >= tamanho or inicio > fim:
+        raise HTTPException(status_code=416, detail="Intervalo inválido",
+                            headers={"Content-Range": f"bytes */{tamanho}"})
+    return inicio, fim
+
+
+class RespostaBlob(Response):
+    """Envia [inicio, fim] do arquivo sem copiá-lo para a memória do processo"""
+
+    def __init__(self, caminho: str, inicio: int, fim: int, status_code: int, headers: dict, media_type: str):
+        super().__init__(status_code=status_code, headers=headers, media_type=media_type)
+        self.caminho = caminho
+        self.inicio = inicio
+        self.quantidade = fim - inicio + 1
+        self.headers["content-length"] = str(self.quantidade)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"] == "HEAD" or self.quantidade <= 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+        with open(self.caminho, "rb") as arquivo:
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                await send({"type": "http.response.zerocopysend", "file": arquivo.fileno(),
+                            "offset": self.inicio, "count": self.quantidade})
+                return
+            with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                visao = memoryview(mapa)
+                try:
+                    fim = self.inicio + self.quantidade
+                    for posicao in range(self.inicio, fim, BLOB_PEDACO):
+                        limite = min(posicao + BLOB_PEDACO, fim)
+                        await send({"type": "http.response.body", "body": bytes(visao[posicao:limite]),
+                                    "more_body": limite < fim})
+                finally:
+                    visao.release()
+
+
+def responder_blob(digest: str, tamanho: int, tipo: Optional[str], request: Request) -> Response:
+    """Resposta de GET do blob: 304 com If-None-Match, 206 com Range, 200 caso contrário"""
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Accept-Ranges": "bytes", "Cache-Control": "private, max-age=0, must-revalidate"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    intervalo = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range == etag:
+        intervalo = ler_range(request.headers.get("range"), tamanho)
+    inicio, fim = intervalo if intervalo is not None else (0, tamanho - 1)
+    if intervalo is not None:
+        headers["Content-Range"] = f"bytes {inicio}-{fim}/{tamanho}"
+    return RespostaBlob(store.caminho(digest), inicio, fim, 206 if intervalo is not None else 200,
+                        headers, tipo or "application/octet-stream")
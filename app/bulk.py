@@ -0,0 +1,130 @@
+"""Importação de candidatos em lote (POST /candidatos/bulk)
+
+Aceita um array JSON ou um stream NDJSON (uma linha JSON por candidato).
+As linhas são validadas com schemas.CandidatoCreate e gravadas em lotes de
+BULK_TAMANHO_LOTE com um INSERT multi-linha por lote; erros são reportados
+por linha (posição a partir de 1 no array ou número da linha no NDJSON)
+sem interromper a importação; candidaturas repetidas (e-mail já inscrito
+na vaga, inclusive por outra requisição durante a importação) entram nos
+erros. No NDJSON o corpo é lido em
+streaming, então a memória fica limitada a um lote.
+"""
+import json
+import os
+from typing import AsyncIterator, List, Tuple
+
+from fastapi import HTTPException, Request
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from . import crud, schemas
+
+TAMANHO_LOTE = int(os.getenv("BULK_TAMANHO_LOTE", "500"))
+
+TIPOS_NDJSON = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines")
+
+
+def _formatar_erros(erro: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in erro.errors()]
+
+
+async def _linhas_ndjson(request: Request) -> AsyncIterator[Tuple[int, object]]:
+    """Lê o corpo em streaming e devolve (linha, objeto ou exceção) para cada linha não vazia"""
+    resto = b""
+    numero = 0
+    async for pedaco in request.stream():
+        resto += pedaco
+        *linhas, resto = resto.split(b"\n")
+        for linha in linhas:
+            numero += 1
+            if linha.strip():
+                yield numero, _decodificar(linha)
+    if resto.strip():
+        yield numero + 1, _decodificar(resto)
+
+
+def _decodificar(linha: bytes):
+    try:
+        return json.loads(linha)
+    except ValueError as e:
+        return e
+
+
+async def _registros(request: Request) -> AsyncIterator[Tuple[int, object]]:
+    tipo = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if tipo in TIPOS_NDJSON:
+        async for registro in _linhas_ndjson(request):
+            yield registro
+    elif tipo in ("application/json", ""):
+        try:
+            dados = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(status_code=400, detail="JSON inválido")
+        if not isinstance(dados, list):
+            raise HTTPException(status_code=400, detail="Esperado um array JSON de candidatos")
+        for posicao, item in enumerate(dados, start=1):
+            yield posicao, item
+    else:
+        raise HTTPException(status_code=415, detail="Use application/json ou application/x-ndjson")
+
+
+def processar_lote(db: Session, lote: List[Tuple[int, object]], resultado: schemas.ResultadoBulk):
+    """Valida um lote, confere as vagas referenciadas e grava as linhas válidas"""
+    validos = []
+    for linha, dados in lote:
+        if isinstance(dados, Exception):
+            resultado.erros.append(schemas.ItemBulkErro(linha=linha, erros=[f"JSON inválido: {dados}"]))
+            continue
+        try:
+            candidato = schemas.CandidatoCreate.model_validate(dados)
+        except ValidationError as e:
+            resultado.erros.append(schemas.ItemBulkErro(linha=linha, erros=_formatar_erros(e)))
+            continue
+        if candidato.transcricao is None or candidato.Perfil is None:
+            # A importação em lote não passa pelo pipeline de app/processamento.py
+            resultado.erros.append(schemas.ItemBulkErro(
+                linha=linha, erros=["transcricao, Perfil: obrigatórios na importação em lote"]))
+            continue
+        validos.append((linha, candidato))
+
+    vagas = crud.get_vagas_existentes(db, [c.vaga_id for _, c in validos])
+    # Candidaturas repetidas (no banco ou dentro do próprio lote) não são gravadas de novo
+    inscritos = {chave: f"id {candidato_id}" for chave, candidato_id in
+                 crud.get_candidaturas_existentes(db, [(c.vaga_id, c.email) for _, c in validos]).items()}
+    gravaveis = []
+    for linha, candidato in validos:
+        chave = (candidato.vaga_id, candidato.email.lower())
+        if candidato.vaga_id not in vagas:
+            resultado.erros.append(schemas.ItemBulkErro(linha=linha, erros=["vaga_id: Vaga não encontrada"]))
+        elif chave in inscritos:
+            resultado.erros.append(schemas.ItemBulkErro(
+                linha=linha, erros=[f"email: já inscrito nesta vaga ({inscritos[chave]})"]))
+        else:
+            inscritos[chave] = f"linha {linha}"
+            gravaveis.append((linha, candidato))
+
+    ids, repetidas = crud.create_candidatos_bulk(db, [c for _, c in gravaveis])
+    # Inscritas por outra requisição entre a checagem acima e o INSERT
+    for posicao in repetidas:
+        resultado.erros.append(schemas.ItemBulkErro(linha=gravaveis[posicao][0],
+                                                    erros=["email: já inscrito nesta vaga"]))
+    puladas = set(repetidas)
+    criados = [schemas.ItemBulkCriado(linha=linha, id=id_)
+               for posicao, ((linha, _), id_) in enumerate(zip(gravaveis, ids)) if posicao not in puladas]
+    resultado.criados.extend(criados)
+    resultado.total_inseridos += len(criados)
+
+
+async def importar(request: Request, db: Session, tamanho_lote: int = TAMANHO_LOTE) -> schemas.ResultadoBulk:
+    """Consome o corpo da requisição gravando um lote por vez"""
+    resultado = schemas.ResultadoBulk()
+    lote = []
+    async for registro in _registros(request):
+        lote.append(registro)
+        if len(lote) >= tamanho_lote:
+            await run_in_threadpool(processar_lote, db, lote, resultado)
+            lote = []
+    if lote:
+        await run_in_threadpool(processar_lote, db, lote, resultado)
+    return resultado
@@ -0,0 +1,182 @@
+"""Cache read-through da página pública de vagas (/vagas/publico/{slug})
+
+O corpo JSON já serializado fica em um backend de cache com TTL. O backend
+padrão é um LRU em memória do processo; um Redis pode ser plugado com
+`configurar_backend(RedisCache(cliente))` ou VAGA_CACHE_REDIS_URL, para que
+todos os workers compartilhem as entradas e as invalidações.
+
+Chaves usadas:
+    vaga:slug:<slug>     -> "<etag>\\n<corpo json>"
+    vaga:geracao:<slug>  -> marca aleatória trocada a cada invalidação
+
+A invalidação usa o slug devolvido pelo próprio UPDATE/DELETE ... RETURNING
+em crud.py, então não depende de nenhuma outra entrada que o LRU possa ter
+descartado. Uma leitura do banco que começou antes de um PUT/DELETE não
+repõe a versão antiga: a rota lê a geração antes de buscar a vaga, e
+`guardar_vaga_publica` só mantém a entrada se ela não mudou.
+"""
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import Request, Response
+
+from . import schemas
+
+VAGA_CACHE_TTL = int(os.getenv("VAGA_CACHE_TTL", "60"))              # Segundos de validade de cada entrada
+VAGA_CACHE_MAX_ITENS = int(os.getenv("VAGA_CACHE_MAX_ITENS", "1024"))  # Limite do LRU em memória
+VAGA_CACHE_REDIS_URL = os.getenv("VAGA_CACHE_REDIS_URL")
+
+
+class CacheBackend:
+    """Interface dos backends de cache (valores são bytes)"""
+
+    def get(self, chave: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, chave: str, valor: bytes, ttl: int):
+        raise NotImplementedError
+
+    def delete(self, *chaves: str):
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """LRU em memória com TTL por entrada e número máximo de itens"""
+
+    def __init__(self, max_itens: int = VAGA_CACHE_MAX_ITENS):
+        self.max_itens = max_itens
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            expira_em, valor = item
+            if expira_em <= time.monotonic():
+                del self._itens[chave]
+                return None
+            self._itens.move_to_end(chave)
+            return valor
+
+    def set(self, chave: str, valor: bytes, ttl: int):
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + ttl, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def delete(self, *chaves: str):
+        with self._lock:
+            for chave in chaves:
+                self._itens.pop(chave, None)
+
+    def __len__(self):
+        return len(self._itens)
+
+
+class RedisCache(CacheBackend):
+    """Backend sobre um cliente compatível com redis-py (get/set com px/delete)"""
+
+    def __init__(self, cliente, prefixo: str = "hireai:"):
+        self.cliente = cliente
+        self.prefixo = prefixo
+
+    def get(self, chave: str) -> Optional[bytes]:
+        return self.cliente.get(self.prefixo + chave)
+
+    def set(self, chave: str, valor: bytes, ttl: int):
+        self.cliente.set(self.prefixo + chave, valor, px=int(ttl * 1000))
+
+    def delete(self, *chaves: str):
+        if chaves:
+            self.cliente.delete(*(self.prefixo + chave for chave in chaves))
+
+
+def _backend_padrao() -> CacheBackend:
+    if VAGA_CACHE_REDIS_URL:
+        import redis  # Dependência opcional, só necessária com VAGA_CACHE_REDIS_URL
+
+        return RedisCache(redis.Redis.from_url(VAGA_CACHE_REDIS_URL))
+    return MemoryCache()
+
+
+backend: CacheBackend = _backend_padrao()
+
+
+def configurar_backend(novo: CacheBackend):
+    """Troca o backend de cache em uso (ex.: Redis em produção, fake em testes)"""
+    global backend
+    backend = novo
+
+
+# ===== PÁGINA PÚBLICA DA VAGA =====
+
+class EntradaVaga:
+    """Corpo JSON serializado de uma vaga e o ETag correspondente"""
+
+    __slots__ = ("etag", "corpo")
+
+    def __init__(self, etag: str, corpo: bytes):
+        self.etag = etag
+        self.corpo = corpo
+
+
+def ler_vaga_publica(slug: str) -> Optional[EntradaVaga]:
+    """Entrada em cache para o slug, ou None se ausente/expirada"""
+    valor = backend.get(f"vaga:slug:{slug}")
+    if valor is None:
+        return None
+    etag, _, corpo = valor.partition(b"\n")
+    return EntradaVaga(etag.decode(), corpo)
+
+
+def geracao_vaga(slug: str) -> Optional[bytes]:
+    """Marca da última invalidação do slug (lida antes de buscar a vaga no banco)"""
+    return backend.get(f"vaga:geracao:{slug}")
+
+
+def guardar_vaga_publica(vaga, geracao: Optional[bytes]) -> EntradaVaga:
+    """Serializa a vaga e devolve a entrada; guarda no cache se o slug não foi invalidado desde `geracao`
+
+    A geração é conferida antes e depois do set: uma invalidação que caia entre
+    os dois apaga o que acabou de ser guardado.
+    """
+    corpo = schemas.Vaga.model_validate(vaga).model_dump_json().encode()
+    etag = '"' + hashlib.blake2b(corpo, digest_size=12).hexdigest() + '"'
+    chave = f"vaga:slug:{vaga.slug}"
+    if geracao_vaga(vaga.slug) == geracao:
+        backend.set(chave, etag.encode() + b"\n" + corpo, VAGA_CACHE_TTL)
+        if geracao_vaga(vaga.slug) != geracao:
+            backend.delete(chave)
+    return EntradaVaga(etag, corpo)
+
+
+def invalidar_vaga(*slugs: str):
+    """Remove do cache a página pública da vaga (chamado em update/delete com os slugs antigo e novo)"""
+    slugs = {slug for slug in slugs if slug is not None}
+    marca = uuid.uuid4().hex.encode()
+    for slug in slugs:
+        backend.set(f"vaga:geracao:{slug}", marca, VAGA_CACHE_TTL)
+    backend.delete(*(f"vaga:slug:{slug}" for slug in slugs))
+
+
+def _etag_confere(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidatos = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidatos or etag in candidatos
+
+
+def responder_vaga_publica(entrada: EntradaVaga, request: Request) -> Response:
+    """Resposta 200 com o corpo em cache, ou 304 se o cliente já tem essa versão"""
+    headers = {"ETag": entrada.etag, "Cache-Control": f"public, max-age={VAGA_CACHE_TTL}"}
+    if _etag_confere(request.headers.get("if-none-match"), entrada.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entrada.corpo, media_type="application/json", headers=headers)
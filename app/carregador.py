@@ -0,0 +1,112 @@
+"""Busca por lista de ids e agrupamento das buscas por um id só
+
+`?ids=1,2,3` em GET /candidatos/ e GET /vagas/ resolve a lista em um único
+SELECT ... WHERE id IN (...). Para GET /candidatos/{id}, Carregador agrupa no
+estilo DataLoader as buscas que chegam na mesma volta do event loop (ou
+dentro de CARREGADOR_JANELA_MS): o frontend que abre dezenas de detalhes em
+paralelo faz uma query por rodada em vez de uma por requisição.
+
+Não há cache: cada rodada lê o banco de novo, então o agrupamento nunca
+devolve um dado mais antigo que uma busca individual devolveria.
+"""
+import asyncio
+import os
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from . import crud, crud_async
+
+IDS_MAX = int(os.getenv("IDS_MAX", "100"))                                 # Ids aceitos em `?ids=`
+CARREGADOR_JANELA_MS = float(os.getenv("CARREGADOR_JANELA_MS", "0"))       # 0 = mesma volta do event loop
+LOTE_MAX = 500  # Ids por query (abaixo do limite de parâmetros dos bancos)
+
+
+def ler_ids(ids: str) -> List[int]:
+    """Converte `ids=1,2,3` na lista de ids, sem repetições e na ordem recebida"""
+    try:
+        lista = list(dict.fromkeys(int(parte) for parte in ids.split(",") if parte.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids deve ser uma lista de inteiros separados por vírgula")
+    if len(lista) > IDS_MAX:
+        raise HTTPException(status_code=400, detail=f"No máximo {IDS_MAX} ids por requisição")
+    return lista
+
+
+class Carregador:
+    """Agrupa as buscas por id de uma mesma rodada em uma chamada a `buscar(bind, ids)`
+
+    As buscas são separadas pelo bind da sessão (primário ou réplica, lido por
+    `bind_da_sessao`), e `buscar` abre sobre ele uma sessão só do lote, fechada
+    ao fim da rodada. Nenhuma requisição empresta a sua: se uma delas for
+    cancelada e a sessão dela fechada, a query das outras não é interrompida,
+    e os objetos devolvidos não ficam presos à sessão de outra requisição.
+    """
+
+    def __init__(self, buscar: Callable[[object, List[int]], Awaitable[Iterable]],
+                 bind_da_sessao: Callable[[object], object] = lambda db: db.get_bind(),
+                 janela_ms: float = CARREGADOR_JANELA_MS, lote_max: int = LOTE_MAX):
+        self.buscar = buscar
+        self.bind_da_sessao = bind_da_sessao
+        self.janela_ms = janela_ms
+        self.lote_max = lote_max
+        self.lotes = 0  # queries feitas, para os testes e o diagnóstico
+        self._grupos: Dict[object, tuple] = {}
+
+    async def carregar(self, db, objeto_id: int) -> Optional[object]:
+        """O objeto com esse id (None se não existir), buscado junto com os da mesma rodada"""
+        loop = asyncio.get_running_loop()
+        chave = self.bind_da_sessao(db)
+        # Grupo de um loop que já terminou (ex.: outro TestClient) nunca seria despachado
+        if chave not in self._grupos or self._grupos[chave][1] is not loop:
+            self._grupos[chave] = ({}, loop)
+            if self.janela_ms > 0:
+                loop.call_later(self.janela_ms / 1000, self._despachar, chave)
+            else:
+                loop.call_soon(self._despachar, chave)
+        pendentes = self._grupos[chave][0]
+        futuro = pendentes.get(objeto_id)
+        if futuro is None:
+            futuro = pendentes[objeto_id] = loop.create_future()
+            if len(pendentes) >= self.lote_max:
+                self._despachar(chave)
+        # shield: uma requisição cancelada não cancela o resultado das outras
+        return await asyncio.shield(futuro)
+
+    def _despachar(self, chave):
+        grupo = self._grupos.pop(chave, None)
+        if grupo is not None:
+            pendentes, loop = grupo
+            loop.create_task(self._executar(chave, pendentes))
+
+    async def _executar(self, bind, pendentes: Dict[int, asyncio.Future]):
+        self.lotes += 1
+        try:
+            encontrados = {objeto.id: objeto for objeto in await self.buscar(bind, list(pendentes))}
+        except Exception as exc:
+            for futuro in pendentes.values():
+                if not futuro.done():
+                    futuro.set_exception(exc)
+            return
+        for objeto_id, futuro in pendentes.items():
+            if not futuro.done():
+                futuro.set_result(encontrados.get(objeto_id))
+
+
+def _candidatos_por_ids(bind, ids: List[int]):
+    with Session(bind=bind, autoflush=False, expire_on_commit=False) as db:
+        return crud.get_candidatos_por_ids(db, ids)
+
+
+async def _candidatos_por_ids_async(bind, ids: List[int]):
+    async with AsyncSession(bind=bind, autoflush=False, expire_on_commit=False) as db:
+        return await crud_async.get_candidatos_por_ids(db, ids)
+
+
+# Rotas síncronas de main.py: a query roda no threadpool, no engine escolhido por get_db_leitura
+candidatos = Carregador(lambda bind, ids: run_in_threadpool(_candidatos_por_ids, bind, ids))
+# Rotas de app/routes_async.py (DATABASE_ASYNC=1): a query roda no driver assíncrono (AsyncSession.bind)
+candidatos_async = Carregador(_candidatos_por_ids_async, bind_da_sessao=lambda db: db.bind)
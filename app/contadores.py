@@ -0,0 +1,58 @@
+"""Reconciliação de vagas.total_candidatos
+
+Uso:
+    python -m app.contadores
+
+Os triggers de models.py mantêm o contador a cada escrita em candidato.
+Este job recalcula todos com um único COUNT(*) GROUP BY e corrige apenas as
+vagas com desvio (escritas feitas com os triggers ausentes, restauração
+parcial de backup, edição manual no banco). Rode periodicamente (cron) e
+depois de manutenções; em um banco sem desvio ele não escreve nada.
+"""
+import argparse
+import time
+
+from sqlalchemy import and_, exists, func, select, text, update
+
+from . import models
+from .database import get_engine
+
+
+def reconciliar(conexao) -> list:
+    """Corrige os contadores dentro da transação de `conexao`; devolve os ids de vaga corrigidos"""
+    vaga, candidato = models.Vaga, models.Candidato
+    if conexao.dialect.name == "postgresql":
+        # Sem escritas em candidato entre a contagem e o UPDATE (leituras continuam liberadas)
+        conexao.execute(text("LOCK TABLE candidato IN SHARE MODE"))
+    contagem = (
+        select(candidato.vaga_id, func.count().label("total"))
+        .group_by(candidato.vaga_id)
+        .subquery()
+    )
+    corrigidas = conexao.scalars(
+        update(vaga)
+        .where(and_(vaga.id == contagem.c.vaga_id, vaga.total_candidatos != contagem.c.total))
+        .values(total_candidatos=contagem.c.total)
+        .returning(vaga.id)
+    ).all()
+    # Vagas sem nenhum candidato não aparecem no GROUP BY
+    corrigidas += conexao.scalars(
+        update(vaga)
+        .where(vaga.total_candidatos != 0, ~exists().where(candidato.vaga_id == vaga.id))
+        .values(total_candidatos=0)
+        .returning(vaga.id)
+    ).all()
+    return corrigidas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+    inicio = time.perf_counter()
+    with get_engine().begin() as conexao:
+        corrigidas = reconciliar(conexao)
+    print(f"{len(corrigidas)} vaga(s) corrigida(s) em {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,177 @@
-import random
-import string
-import unicodedata
-
-def gerar_slug(nome: str):
-    """Gera um slug legível e único a partir do nome da vaga"""
-    # Remove acentos usando unicodedata (biblioteca padrão do Python)
-    nome_sem_acentos = ''.join(c for c in unicodedata.normalize('NFD', nome.lower())
-                              if not unicodedata.combining(c))
-    nome_normalizado = nome_sem_acentos.replace(" ", "-")
-    sufixo = ''.join(random.choices(string.digits, k=4))
-    return f"{nome_normalizado}-{sufixo}"
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
 
+from sqlalchemy import and_, case, delete, func, insert, or_, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from . import models, schemas
+from . import cache, eventos, matching, models, projection, schemas, slugs
+
+class CandidaturaDuplicada(ValueError):
+    """O e-mail já tem uma candidatura nesta vaga"""
+
+def _candidatura_duplicada(exc: IntegrityError) -> bool:
+    """A violação de integridade veio do índice único (vaga_id, lower(email))?"""
+    return "ux_candidato_vaga_email" in str(exc.orig)
+
+class VagaComCandidatos(ValueError):
+    """A vaga ainda tem candidatos; eles precisam ser removidos antes dela"""
 
 def get_vaga(db: Session, vaga_id: int):
     """Buscar vaga por ID"""
     return db.query(models.Vaga).filter(models.Vaga.id == vaga_id).first()
 
-def get_vagas(db: Session, skip: int = 0, limit: int = 100):
+def get_vaga_por_slug(db: Session, slug: str):
+    """Buscar vaga por SLUG"""
+    return db.query(models.Vaga).filter(models.Vaga.slug == slug).first()
+
+def _paginar(query, coluna_id, skip: int, limit: int, apos_id: Optional[int]):
+    """Aplica paginação por offset ou, se `apos_id` for informado, por keyset"""
+    query = query.order_by(coluna_id)
+    if apos_id is not None:
+        query = query.filter(coluna_id > apos_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+def get_vagas(db: Session, skip: int = 0, limit: int = 100, apos_id: Optional[int] = None):
     """Listar todas as vagas com paginação"""
-    return db.query(models.Vaga).offset(skip).limit(limit).all()
+    return _paginar(db.query(models.Vaga), models.Vaga.id, skip, limit, apos_id)
 
-def create_vaga(db: Session, vaga: schemas.VagaCreate):
-    """Criar nova vaga"""
-    db_vaga = models.Vaga(**vaga.model_dump())
-    db.add(db_vaga)
+def _na_ordem(objetos, ids: Sequence[int]) -> list:
+    """Reordena o resultado de um `IN` na ordem de `ids`, omitindo os que não existem"""
+    por_id = {objeto.id: objeto for objeto in objetos}
+    return [por_id[i] for i in ids if i in por_id]
+
+def get_vagas_por_ids(db: Session, ids: Sequence[int]):
+    """Vagas com esses ids em um único SELECT ... IN, na ordem pedida"""
+    if not ids:
+        return []
+    return _na_ordem(db.scalars(select(models.Vaga).where(models.Vaga.id.in_(ids))), ids)
+
+def get_candidatos_de_vagas(db: Session, vaga_ids: Sequence[int], limite_por_vaga: int = 20):
+    """Candidatos de várias vagas em uma única query, no máximo `limite_por_vaga` por vaga
+
+    Usa row_number() particionado por vaga, então o número de queries não
+    cresce com o número de vagas. A numeração é feita só sobre (id, vaga_id)
+    e as colunas completas são lidas apenas para os ids que entram no limite.
+    Devolve {vaga_id: [candidatos]}.
+    """
+    por_vaga = {vaga_id: [] for vaga_id in vaga_ids}
+    if not por_vaga:
+        return por_vaga
+    numerados = (
+        select(
+            models.Candidato.id,
+            func.row_number().over(partition_by=models.Candidato.vaga_id, order_by=models.Candidato.id).label("posicao"),
+        )
+        .where(models.Candidato.vaga_id.in_(por_vaga))
+        .subquery()
+    )
+    stmt = (
+        select(models.Candidato)
+        .join(numerados, numerados.c.id == models.Candidato.id)
+        .where(numerados.c.posicao <= limite_por_vaga)
+        .order_by(models.Candidato.vaga_id, models.Candidato.id)
+    )
+    for db_candidato in db.scalars(stmt):
+        por_vaga[db_candidato.vaga_id].append(db_candidato)
+    return por_vaga
+
+# As escritas usam um único statement com RETURNING: as colunas geradas pelo
+# banco (id, created_at) voltam no próprio INSERT/UPDATE, sem refresh nem
+# SELECT prévio. Requer sessões com expire_on_commit=False (ver database.py).
+# Os eventos do feed de candidatos são publicados antes do commit, na mesma
+# transação (ver eventos.py): só saem se a escrita for confirmada.
+
+def _publicar(db: Session, tipo: Optional[str], candidato):
+    """Publica no feed da vaga a mudança de um candidato (tipo None: não publica)"""
+    if tipo is not None and candidato is not None:
+        eventos.publicar(db, tipo, candidato.vaga_id, eventos.resumo(candidato))
+
+def _inserir(db: Session, modelo, dados: dict, evento: Optional[str] = None):
+    """INSERT ... RETURNING devolvendo o objeto ORM já preenchido"""
+    objeto = db.scalars(insert(modelo).values(**dados).returning(modelo)).one()
+    _publicar(db, evento, objeto)
     db.commit()
-    db.refresh(db_vaga)
-    return db_vaga
+    return objeto
+
+def _atualizar(db: Session, modelo, objeto_id: int, dados: dict, evento: Optional[str] = None):
+    """UPDATE ... RETURNING; devolve None se o registro não existir"""
+    if not dados:
+        return db.get(modelo, objeto_id)
+    stmt = (
+        update(modelo)
+        .where(modelo.id == objeto_id)
+        .values(**dados)
+        .returning(modelo)
+    )
+    objeto = db.scalars(stmt).one_or_none()
+    _publicar(db, evento, objeto)
+    db.commit()
+    return objeto
+
+def create_vaga(db: Session, vaga: schemas.VagaCreate):
+    """Criar nova vaga; sem slug informado, o slug é gerado a partir do nome e do id"""
+    dados = vaga.model_dump()
+    try:
+        if dados["slug"] is None:
+            db_vaga = db.scalars(slugs.inserir_com_slug(db.get_bind().dialect.name, dados)).one()
+            db.commit()
+            return db_vaga
+        slugs.validar_do_cliente(dados["slug"])
+        return _inserir(db, models.Vaga, dados)
+    except IntegrityError as exc:
+        db.rollback()
+        if not slugs.conflito_de_slug(exc):
+            raise
+        raise slugs.SlugEmUso(dados["slug"]) from exc
 
 def update_vaga(db: Session, vaga_id: int, vaga: schemas.VagaUpdate):
-    """Atualizar vaga existente"""
-    db_vaga = db.query(models.Vaga).filter(models.Vaga.id == vaga_id).first()
-    if db_vaga:
-        update_data = vaga.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_vaga, field, value)
-        db.commit()
-        db.refresh(db_vaga)
+    """Atualizar vaga existente
+
+    A página pública em cache sai pelo slug devolvido no RETURNING. Trocando o
+    slug, o antigo é lido antes (o RETURNING do SQLite só vê o valor novo).
+    """
+    slug_antigo = None
+    if vaga.slug is not None:
+        slug_antigo = db.scalar(select(models.Vaga.slug).where(models.Vaga.id == vaga_id))
+        if slug_antigo is None:
+            return None
+        slugs.validar_do_cliente(vaga.slug, slug_antigo)
+    try:
+        db_vaga = _atualizar(db, models.Vaga, vaga_id, vaga.model_dump(exclude_unset=True))
+    except IntegrityError as exc:
+        db.rollback()
+        if not slugs.conflito_de_slug(exc):
+            raise
+        raise slugs.SlugEmUso(vaga.slug) from exc
+    if db_vaga is not None:
+        cache.invalidar_vaga(slug_antigo, db_vaga.slug)
     return db_vaga
 
 def delete_vaga(db: Session, vaga_id: int):
-    """Deletar vaga"""
-    db_vaga = db.query(models.Vaga).filter(models.Vaga.id == vaga_id).first()
-    if db_vaga:
-        db.delete(db_vaga)
+    """Deletar vaga sem candidatos (o slug volta no RETURNING, para tirar a página pública do cache)
+
+    Com candidatos levanta VagaComCandidatos em vez de deixá-los órfãos (SQLite
+    sem PRAGMA foreign_keys) ou esbarrar na FK (PostgreSQL). A checagem vai no
+    próprio DELETE; só quando nada é removido uma segunda query diz se a vaga existe.
+    """
+    v, c = models.Vaga, models.Candidato
+    sem_candidatos = ~select(c.id).where(c.vaga_id == vaga_id).exists()
+    try:
+        slug = db.scalar(delete(v).where(v.id == vaga_id, sem_candidatos).returning(v.slug))
         db.commit()
-        return True
-    return False
+    except IntegrityError as exc:
+        # Candidato inserido entre a checagem e o DELETE (FK do PostgreSQL)
+        db.rollback()
+        raise VagaComCandidatos(vaga_id) from exc
+    if slug is None:
+        if db.get(v, vaga_id) is not None:
+            raise VagaComCandidatos(vaga_id)
+        return False
+    cache.invalidar_vaga(slug)
+    return True
 
 # ===== FUNÇÕES CRUD PARA CANDIDATOS =====
 
@@ -56,38 +179,350 @@ def get_candidato(db: Session, candidato_id: int):
     """Buscar candidato por ID"""
     return db.query(models.Candidato).filter(models.Candidato.id == candidato_id).first()
 
-def get_candidatos(db: Session, skip: int = 0, limit: int = 100):
+def _query_candidatos(db: Session, campos: Optional[Sequence[str]]):
+    """Query de candidatos carregando só `campos` (todas as colunas se None)"""
+    query = db.query(models.Candidato)
+    if campos is not None:
+        query = query.options(projection.opcao_load_only(campos))
+    return query
+
+def get_candidatos_por_ids(db: Session, ids: Sequence[int], campos: Optional[Sequence[str]] = None):
+    """Candidatos com esses ids em um único SELECT ... IN, na ordem pedida (todas as colunas se `campos` for None)"""
+    if not ids:
+        return []
+    return _na_ordem(_query_candidatos(db, campos).filter(models.Candidato.id.in_(ids)), ids)
+
+def get_candidatos(db: Session, skip: int = 0, limit: int = 100, apos_id: Optional[int] = None,
+                   campos: Optional[Sequence[str]] = None):
     """Listar todos os candidatos com paginação"""
-    return db.query(models.Candidato).offset(skip).limit(limit).all()
+    return _paginar(_query_candidatos(db, campos), models.Candidato.id, skip, limit, apos_id)
+
+def get_candidatos_por_vaga(db: Session, vaga_id: int, skip: int = 0, limit: int = 100,
+                            apos_id: Optional[int] = None, campos: Optional[Sequence[str]] = None):
+    """Listar candidatos de uma vaga em ordem de inscrição (created_at, id)
 
-def get_candidatos_por_vaga(db: Session, vaga_id: int, skip: int = 0, limit: int = 100):
-    """Listar candidatos de uma vaga específica"""
-    return db.query(models.Candidato).filter(models.Candidato.vaga_id == vaga_id).offset(skip).limit(limit).all()
+    Filtro, ordenação e cursor usam o índice ix_candidato_vaga_criacao. O
+    cursor segue sendo o id do último candidato visto; a posição
+    (created_at, id) dele é lida pelo próprio banco, sem converter datas (no
+    SQLite o now() do banco e os datetimes do Python são gravados em formatos
+    de texto diferentes).
+    """
+    c = models.Candidato
+    query = _query_candidatos(db, campos).filter(c.vaga_id == vaga_id).order_by(c.created_at, c.id)
+    if apos_id is None:
+        return query.offset(skip).limit(limit).all()
+    # Âncora na própria vaga: o candidato do cursor, com a sua posição exata (empates de
+    # created_at são desfeitos pelo id). Se ele foi removido, o anterior da vaga pelo id,
+    # que só difere em ordem se um created_at ficou fora da ordem dos ids
+    ancora = (
+        select(c.created_at, c.id)
+        .where(c.vaga_id == vaga_id, c.id <= apos_id)
+        .order_by(c.id.desc())
+        .limit(1)
+    )
+    return query.filter(tuple_(c.created_at, c.id) > ancora.scalar_subquery()).limit(limit).all()
+
+def get_candidatura(db: Session, vaga_id: int, email: str):
+    """Candidato da vaga com este e-mail (sem diferenciar maiúsculas), pelo índice ux_candidato_vaga_email"""
+    c = models.Candidato
+    return db.scalars(select(c).where(c.vaga_id == vaga_id, func.lower(c.email) == func.lower(email))).one_or_none()
+
+def get_candidaturas_existentes(db: Session, pares) -> Dict[Tuple[int, str], int]:
+    """Dentre os pares (vaga_id, email), os que já têm candidatura: {(vaga_id, email minúsculo): id}"""
+    chaves = {(vaga_id, email.lower()) for vaga_id, email in pares}
+    if not chaves:
+        return {}
+    c = models.Candidato
+    linhas = db.execute(
+        select(c.vaga_id, func.lower(c.email), c.id).where(tuple_(c.vaga_id, func.lower(c.email)).in_(chaves))
+    )
+    return {(vaga_id, email): candidato_id for vaga_id, email, candidato_id in linhas}
+
+# INSERT ... ON CONFLICT DO NOTHING dos dialetos que o suportam
+_INSERT_IGNORANDO_CONFLITO = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def criar_ou_obter_candidato(db: Session, candidato: schemas.CandidatoCreate):
+    """Criar candidato ou, se o e-mail já se inscreveu na vaga, devolver a candidatura existente
+
+    Devolve (candidato, criado). Quem decide é o índice único (vaga_id, lower(email)),
+    com ON CONFLICT DO NOTHING: requisições simultâneas não criam duplicatas e o
+    caminho comum continua sendo um único INSERT ... RETURNING.
+    """
+    dados = candidato.model_dump()
+    if dados["transcricao"] is None or dados["Perfil"] is None:
+        dados["transcricao"] = dados["transcricao"] or ""
+        dados["Perfil"] = dados["Perfil"] or ""
+        dados["status_processamento"] = "pendente"
+    dados["vetor"] = matching.vetorizar(dados["skill"], dados["transcricao"])
+    inserir = _INSERT_IGNORANDO_CONFLITO.get(db.get_bind().dialect.name)
+    if inserir is None:
+        try:
+            db_candidato = _inserir(db, models.Candidato, dados, evento="criado")
+        except IntegrityError:
+            db.rollback()
+            db_candidato = None
+    else:
+        stmt = inserir(models.Candidato).values(**dados).on_conflict_do_nothing().returning(models.Candidato)
+        db_candidato = db.scalars(stmt).one_or_none()
+        _publicar(db, "criado", db_candidato)
+        db.commit()
+    if db_candidato is None:
+        return get_candidatura(db, candidato.vaga_id, candidato.email), False
+    return db_candidato, True
 
 def create_candidato(db: Session, candidato: schemas.CandidatoCreate):
-    """Criar novo candidato"""
-    db_candidato = models.Candidato(**candidato.model_dump())
-    db.add(db_candidato)
+    """Criar novo candidato (sem transcrição ou perfil, fica "pendente" para o pipeline)
+
+    Candidatura repetida (mesmo e-mail na mesma vaga) devolve a existente.
+    """
+    return criar_ou_obter_candidato(db, candidato)[0]
+
+def create_candidatos_bulk(db: Session, candidatos: List[schemas.CandidatoCreate]):
+    """Criar vários candidatos em um único INSERT multi-linha
+
+    Devolve (ids, repetidas): os ids na mesma ordem da entrada e as posições
+    não gravadas porque o e-mail já estava inscrito na vaga (id None). O INSERT
+    usa ON CONFLICT DO NOTHING, então uma candidatura gravada por outra
+    requisição depois da checagem do lote é pulada em vez de derrubar o lote.
+    Em dialetos sem RETURNING para executemany, cai para um executemany simples
+    e devolve None em cada posição.
+    """
+    if not candidatos:
+        return [], []
+    linhas = [candidato.model_dump() for candidato in candidatos]
+    vetores = matching.vetorizar_lote([(linha["skill"], linha["transcricao"]) for linha in linhas])
+    for linha, vetor in zip(linhas, vetores):
+        linha["vetor"] = matching.vetor_para_bytes(vetor)
+    dialeto = db.get_bind().dialect
+    inserir = _INSERT_IGNORANDO_CONFLITO.get(dialeto.name)
+    if inserir is not None and dialeto.insert_executemany_returning:
+        colunas = [getattr(models.Candidato, campo) for campo in projection.CAMPOS_RESUMO]
+        stmt = inserir(models.Candidato).on_conflict_do_nothing().returning(*colunas)
+        # As linhas puladas não voltam no RETURNING: cada criado é casado com a entrada pela chave única
+        criados = {(criado.vaga_id, criado.email.lower()): criado for criado in db.execute(stmt, linhas)}
+        ids, repetidas = [], []
+        for posicao, linha in enumerate(linhas):
+            criado = criados.pop((linha["vaga_id"], linha["email"].lower()), None)
+            if criado is None:
+                repetidas.append(posicao)
+                ids.append(None)
+            else:
+                _publicar(db, "criado", criado)
+                ids.append(criado.id)
+        db.commit()
+        return ids, repetidas
+    # Sem RETURNING não há o que publicar no feed: quem acompanha a vaga só vê esses candidatos ao recarregar
+    db.execute(insert(models.Candidato), linhas)
     db.commit()
-    db.refresh(db_candidato)
+    return [None] * len(linhas), []
+
+def get_estatisticas_vagas(db: Session) -> dict:
+    """Totais a partir de vagas.total_candidatos: uma leitura de vagas, nenhuma de candidato"""
+    total = models.Vaga.total_candidatos
+    linha = db.execute(select(
+        func.count().label("total_vagas"),
+        func.coalesce(func.sum(total), 0).label("total_candidatos"),
+        func.coalesce(func.max(total), 0).label("max_candidatos_por_vaga"),
+        func.count().filter(total == 0).label("vagas_sem_candidatos"),
+    )).one()._asdict()
+    linha["media_candidatos_por_vaga"] = linha["total_candidatos"] / linha["total_vagas"] if linha["total_vagas"] else 0.0
+    return linha
+
+def get_vagas_existentes(db: Session, vaga_ids):
+    """Dentre `vaga_ids`, devolve o conjunto dos que existem"""
+    if not vaga_ids:
+        return set()
+    return set(db.scalars(select(models.Vaga.id).where(models.Vaga.id.in_(set(vaga_ids)))))
+
+def update_candidato(db: Session, candidato_id: int, candidato: schemas.CandidatoUpdate,
+                     colunas: Optional[dict] = None):
+    """Atualizar candidato existente (`colunas`: campos internos gravados no mesmo UPDATE)"""
+    dados = candidato.model_dump(exclude_unset=True)
+    dados.update(colunas or {})
+    if "skill" in dados or "transcricao" in dados:
+        # Com só um dos textos em mãos o vetor é anulado no UPDATE, para não precisar de
+        # um SELECT antes dele, e gravado logo depois a partir dos textos do RETURNING
+        if "skill" in dados and "transcricao" in dados:
+            dados["vetor"] = matching.vetorizar(dados["skill"], dados["transcricao"])
+        else:
+            dados["vetor"] = None
+    try:
+        db_candidato = _atualizar(db, models.Candidato, candidato_id, dados, evento="atualizado")
+    except IntegrityError as exc:
+        db.rollback()
+        if not _candidatura_duplicada(exc):
+            raise
+        raise CandidaturaDuplicada(dados.get("email")) from exc
+    if db_candidato is not None and "vetor" in dados and dados["vetor"] is None:
+        _gravar_vetor(db, db_candidato)
     return db_candidato
 
-def update_candidato(db: Session, candidato_id: int, candidato: schemas.CandidatoUpdate):
-    """Atualizar candidato existente"""
-    db_candidato = db.query(models.Candidato).filter(models.Candidato.id == candidato_id).first()
-    if db_candidato:
-        update_data = candidato.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_candidato, field, value)
-        db.commit()
-        db.refresh(db_candidato)
+def _gravar_vetor(db: Session, candidato):
+    """Grava o vetor do ranking calculado com os textos que o candidato tem agora
+
+    Usado depois de um UPDATE que anulou o vetor. A condição nos textos descarta
+    o vetor se outra escrita os mudou nesse meio tempo (ela grava o seu).
+    """
+    c = models.Candidato.__table__.c
+    db.execute(
+        update(models.Candidato.__table__)
+        .where(c.id == candidato.id, c.skill == candidato.skill, c.transcricao == candidato.transcricao)
+        .values(vetor=matching.vetorizar(candidato.skill, candidato.transcricao))
+    )
+    db.commit()
+
+def get_video_candidato(db: Session, candidato_id: int):
+    """(video_digest, video_tamanho, video_tipo) do candidato; None se ele não existir"""
+    c = models.Candidato
+    return db.execute(
+        select(c.video_digest, c.video_tamanho, c.video_tipo).where(c.id == candidato_id)
+    ).one_or_none()
+
+def set_video_candidato(db: Session, candidato_id: int, digest: str, tamanho: int, tipo: Optional[str]):
+    """Aponta o candidato para o blob enviado e limpa o base64 legado da linha"""
+    dados = {"video_digest": digest, "video_tamanho": tamanho, "video_tipo": tipo, "video": ""}
+    return _atualizar(db, models.Candidato, candidato_id, dados)
+
+def get_processamento_candidato(db: Session, candidato_id: int):
+    """(status_processamento, erro_processamento) do candidato; None se ele não existir"""
+    c = models.Candidato
+    return db.execute(
+        select(c.status_processamento, c.erro_processamento).where(c.id == candidato_id)
+    ).one_or_none()
+
+def _agora() -> datetime:
+    """Relógio das reservas do pipeline (UTC, sem fuso, como a coluna)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def _sem_worker(reserva_s: float):
+    """Candidatos que um worker pode pegar: pendentes ou com a reserva de "processando" vencida"""
+    c = models.Candidato
+    vencida = _agora() - timedelta(seconds=reserva_s)
+    return or_(
+        c.status_processamento == "pendente",
+        and_(c.status_processamento == "processando",
+             or_(c.processamento_inicio.is_(None), c.processamento_inicio < vencida)),
+    )
+
+def get_candidatos_pendentes(db: Session, reserva_s: float) -> List[int]:
+    """Ids dos candidatos que o pipeline ainda não terminou e que nenhum worker está processando"""
+    c = models.Candidato
+    return db.scalars(select(c.id).where(_sem_worker(reserva_s)).order_by(c.id)).all()
+
+def reservar_candidato(db: Session, candidato_id: int, reserva_s: float):
+    """Passa o candidato para "processando" em nome de um worker; None se ele não existe ou já tem dono
+
+    Um único UPDATE ... WHERE status ... RETURNING: entre workers (e processos)
+    só um recebe a linha. `processamento_inicio` volta junto e identifica a
+    reserva nas gravações seguintes.
+    """
+    c = models.Candidato
+    stmt = (
+        update(c)
+        .where(c.id == candidato_id, _sem_worker(reserva_s))
+        .values(status_processamento="processando", processamento_inicio=_agora())
+        .returning(c.id, c.skill, c.transcricao, c.Perfil, c.video_url, c.video_digest, c.processamento_inicio)
+    )
+    linha = db.execute(stmt).one_or_none()
+    db.commit()
+    return linha
+
+def concluir_processamento(db: Session, lido, transcricao: str, perfil: str):
+    """Grava o resultado do pipeline sem desfazer edições feitas enquanto ele processava
+
+    `lido` é a linha devolvida por reservar_candidato. Só as colunas do pipeline
+    mudam, e cada texto gerado só substitui o valor lido na reserva: se um PUT
+    mudou a coluna nesse meio tempo, a edição fica. O vetor do ranking, calculado
+    com a skill lida, só é gravado se a linha ainda tem essa skill e essa
+    transcrição; senão vai NULL e é recalculado em seguida com os textos do
+    RETURNING. Com a reserva perdida (vencida e retomada por outro worker) nada é
+    gravado e devolve None.
+    """
+    c = models.Candidato
+    dados = {"status_processamento": "concluido", "erro_processamento": None}
+    if transcricao != lido.transcricao:
+        dados["transcricao"] = case((c.transcricao == lido.transcricao, transcricao), else_=c.transcricao)
+        vetor = matching.vetorizar(lido.skill, transcricao)
+        dados["vetor"] = case((and_(c.skill == lido.skill, c.transcricao == lido.transcricao), vetor), else_=None)
+    if perfil != lido.Perfil:
+        dados["Perfil"] = case((c.Perfil == lido.Perfil, perfil), else_=c.Perfil)
+    stmt = (
+        update(c)
+        .where(c.id == lido.id, c.processamento_inicio == lido.processamento_inicio)
+        .values(**dados)
+        .returning(c)
+    )
+    db_candidato = db.scalars(stmt).one_or_none()
+    _publicar(db, "atualizado", db_candidato)
+    db.commit()
+    if (db_candidato is not None and "vetor" in dados
+            and (db_candidato.skill, db_candidato.transcricao) != (lido.skill, transcricao)):
+        _gravar_vetor(db, db_candidato)
     return db_candidato
 
+def set_status_processamento(db: Session, candidato_id: int, reserva: Optional[datetime], status: str,
+                             erro: Optional[str]) -> bool:
+    """Grava o status de uma tentativa que falhou, se a reserva `reserva` ainda for do worker"""
+    c = models.Candidato
+    reservado = c.processamento_inicio.is_(None) if reserva is None else c.processamento_inicio == reserva
+    gravadas = db.execute(
+        update(c)
+        .where(c.id == candidato_id, reservado)
+        .values(status_processamento=status, erro_processamento=erro)
+    ).rowcount
+    db.commit()
+    return gravadas > 0
+
+def get_ranking_vaga(db: Session, vaga_id: int, limit: int = 20):
+    """Candidatos da vaga ordenados por aderência à descrição; None se a vaga não existir
+
+    Só lê (a rota usa a sessão de leitura, que pode estar em uma réplica): os
+    vetores são gravados nas escritas do candidato, e os que ainda faltarem
+    (linhas antigas) são calculados em memória a cada ranking.
+    """
+    vaga = db.get(models.Vaga, vaga_id)
+    if vaga is None:
+        return None
+    # Execução Core (db.connection()): milhares de linhas sem o custo do processamento ORM
+    linhas = db.connection().execute(
+        select(models.Candidato.id, models.Candidato.vetor)
+        .where(models.Candidato.vaga_id == vaga_id)
+        .order_by(models.Candidato.id)
+    ).all()
+    ids, vetores = (list(coluna) for coluna in zip(*linhas)) if linhas else ([], [])
+
+    pendentes = [i for i, vetor in enumerate(vetores) if vetor is None]
+    if pendentes:
+        for i, vetor in zip(pendentes, _calcular_vetores(db, [ids[i] for i in pendentes])):
+            vetores[i] = vetor
+
+    topo, scores = matching.ranquear(f"{vaga.nome_vaga} {vaga.desc_vaga}", matching.matriz_de_bytes(vetores), limit)
+    escolhidos = [ids[i] for i in topo]
+    resumos = {
+        c.id: c for c in _query_candidatos(db, projection.CAMPOS_RESUMO)
+        .filter(models.Candidato.id.in_(escolhidos))
+    }
+    ranking = projection.projetar([resumos[i] for i in escolhidos], projection.CAMPOS_RESUMO)
+    for item, score in zip(ranking, scores):
+        item["score"] = float(score)
+    return ranking
+
+def _calcular_vetores(db: Session, ids: List[int]) -> List[bytes]:
+    """Calcula em lote, sem gravar, os vetores que faltam no banco"""
+    textos = {
+        linha.id: (linha.skill, linha.transcricao)
+        for linha in db.execute(
+            select(models.Candidato.id, models.Candidato.skill, models.Candidato.transcricao)
+            .where(models.Candidato.id.in_(ids))
+        )
+    }
+    return [matching.vetor_para_bytes(v) for v in matching.vetorizar_lote([textos[i] for i in ids])]
+
 def delete_candidato(db: Session, candidato_id: int):
-    """Deletar candidato"""
-    db_candidato = db.query(models.Candidato).filter(models.Candidato.id == candidato_id).first()
-    if db_candidato:
-        db.delete(db_candidato)
-        db.commit()
-        return True
-    return False 
\ No newline at end of file
+    """Deletar candidato (o vaga_id volta no RETURNING, para o evento do feed da vaga)"""
+    c = models.Candidato
+    vaga_id = db.scalar(delete(c).where(c.id == candidato_id).returning(c.vaga_id))
+    if vaga_id is not None:
+        eventos.publicar(db, "removido", vaga_id, {"id": candidato_id})
+    db.commit()
+    return vaga_id is not None 
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""Versões assíncronas das funções de app/crud.py
+
+Cada função executa a função síncrona correspondente dentro de
+`AsyncSession.run_sync`: a ida ao banco usa o driver assíncrono (aiosqlite,
+asyncpg) sem ocupar uma thread, e a regra de negócio continua escrita em um
+único lugar.
+"""
+from typing import Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import crud, schemas
+
+async def get_vaga(db: AsyncSession, vaga_id: int):
+    """Buscar vaga por ID"""
+    return await db.run_sync(crud.get_vaga, vaga_id)
+
+async def get_vaga_por_slug(db: AsyncSession, slug: str):
+    """Buscar vaga por SLUG"""
+    return await db.run_sync(crud.get_vaga_por_slug, slug)
+
+async def get_vagas(db: AsyncSession, skip: int = 0, limit: int = 100, apos_id: Optional[int] = None):
+    """Listar todas as vagas com paginação"""
+    return await db.run_sync(crud.get_vagas, skip, limit, apos_id)
+
+async def get_vagas_por_ids(db: AsyncSession, ids: Sequence[int]):
+    """Vagas com esses ids em um único SELECT ... IN, na ordem pedida"""
+    return await db.run_sync(crud.get_vagas_por_ids, ids)
+
+async def get_candidatos_de_vagas(db: AsyncSession, vaga_ids: Sequence[int], limite_por_vaga: int = 20):
+    """Candidatos de várias vagas em uma única query, no máximo `limite_por_vaga` por vaga"""
+    return await db.run_sync(crud.get_candidatos_de_vagas, vaga_ids, limite_por_vaga)
+
+async def create_vaga(db: AsyncSession, vaga: schemas.VagaCreate):
+    """Criar nova vaga"""
+    return await db.run_sync(crud.create_vaga, vaga)
+
+async def update_vaga(db: AsyncSession, vaga_id: int, vaga: schemas.VagaUpdate):
+    """Atualizar vaga existente"""
+    return await db.run_sync(crud.update_vaga, vaga_id, vaga)
+
+async def delete_vaga(db: AsyncSession, vaga_id: int):
+    """Deletar vaga"""
+    return await db.run_sync(crud.delete_vaga, vaga_id)
+
+# ===== FUNÇÕES CRUD PARA CANDIDATOS =====
+
+async def get_candidato(db: AsyncSession, candidato_id: int):
+    """Buscar candidato por ID"""
+    return await db.run_sync(crud.get_candidato, candidato_id)
+
+async def get_candidatos_por_ids(db: AsyncSession, ids: Sequence[int], campos: Optional[Sequence[str]] = None):
+    """Candidatos com esses ids em um único SELECT ... IN, na ordem pedida"""
+    return await db.run_sync(crud.get_candidatos_por_ids, ids, campos)
+
+async def get_candidatos(db: AsyncSession, skip: int = 0, limit: int = 100, apos_id: Optional[int] = None,
+                         campos: Optional[Sequence[str]] = None):
+    """Listar todos os candidatos com paginação"""
+    return await db.run_sync(crud.get_candidatos, skip, limit, apos_id, campos)
+
+async def get_candidatos_por_vaga(db: AsyncSession, vaga_id: int, skip: int = 0, limit: int = 100,
+                                  apos_id: Optional[int] = None, campos: Optional[Sequence[str]] = None):
+    """Listar candidatos de uma vaga específica"""
+    return await db.run_sync(crud.get_candidatos_por_vaga, vaga_id, skip, limit, apos_id, campos)
+
+async def create_candidato(db: AsyncSession, candidato: schemas.CandidatoCreate):
+    """Criar novo candidato"""
+    return await db.run_sync(crud.create_candidato, candidato)
+
+async def criar_ou_obter_candidato(db: AsyncSession, candidato: schemas.CandidatoCreate):
+    """Criar candidato ou devolver a candidatura existente: (candidato, criado)"""
+    return await db.run_sync(crud.criar_ou_obter_candidato, candidato)
+
+async def update_candidato(db: AsyncSession, candidato_id: int, candidato: schemas.CandidatoUpdate):
+    """Atualizar candidato existente"""
+    return await db.run_sync(crud.update_candidato, candidato_id, candidato)
+
+async def delete_candidato(db: AsyncSession, candidato_id: int):
+    """Deletar candidato"""
+    return await db.run_sync(crud.delete_candidato, candidato_id)
@@ -1,33 +1,266 @@
+import itertools
 import os  # Biblioteca padrão do Python para acessar variáveis de ambiente
-from sqlalchemy import create_engine  # Cria o motor de conexão com o banco
+import threading
+import time
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event, text  # Cria o motor de conexão com o banco
 from sqlalchemy.ext.declarative import declarative_base  # Base para os modelos de dados
-from sqlalchemy.orm import sessionmaker  # Gerencia sessões com o banco (para consultas, inserções etc.)
+from sqlalchemy.orm import Session, sessionmaker  # Gerencia sessões com o banco (para consultas, inserções etc.)
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # Versões assíncronas (modo opcional)
+from sqlalchemy.engine import make_url
+
+from . import metrics, profiler
+from .pool import PoolAssincronoInstrumentado, PoolInstrumentado, resumo
 
 # ▶️ Pega a URL de conexão do banco de dados da variável de ambiente DATABASE_URL
 # Essa variável será configurada no Railway com a string de conexão do Supabase
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 
-# 🔌 Cria o engine de conexão com o banco
-# Esse engine é usado internamente pelo SQLAlchemy para enviar comandos SQL ao banco
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# 🏊 Configuração do pool de conexões (valores padrão pensados para um Postgres com pooler)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))              # Conexões mantidas abertas
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))       # Conexões extras em picos
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))     # Segundos esperando uma conexão livre
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))     # Recicla conexões mais velhas que isso (s)
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1").lower() in ("1", "true", "sim")  # Testa a conexão antes de usar
+
+def opcoes_pool(url, assincrono: bool = False) -> dict:
+    """Argumentos de pool para create_engine, lidos das variáveis DB_POOL_*"""
+    url = make_url(url)
+    # SQLite em memória usa um pool próprio do dialeto (uma conexão por thread)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": PoolAssincronoInstrumentado if assincrono else PoolInstrumentado,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+# 🔌 O engine é criado sob demanda (get_engine), não na importação do módulo:
+# importar a aplicação (workers, testes, reload) não depende do banco estar configurado
+_engine = None
+_engine_lock = threading.Lock()
+
+def _criar_engine(url, **opcoes):
+    """create_engine + métricas e profiler, iguais para o primário e as réplicas"""
+    engine = create_engine(url, **{**opcoes_pool(url), **opcoes})
+    if metrics.METRICAS_ATIVAS:
+        metrics.instrumentar_engine(engine)
+    if profiler.profiler is not None:
+        profiler.profiler.instalar(engine)
+    return engine
+
+def get_engine():
+    """Engine síncrono, criado na primeira chamada a partir de DATABASE_URL"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                if not SQLALCHEMY_DATABASE_URL:
+                    raise RuntimeError("DATABASE_URL não configurada")
+                _engine = _criar_engine(SQLALCHEMY_DATABASE_URL)
+                SessionLocal.configure(bind=_engine)
+    return _engine
+
+# 📖 Réplicas de leitura (opcional): DATABASE_REPLICA_URLS="postgresql://r1/db,postgresql://r2/db"
+# As rotas GET usam get_db_leitura, que lê de uma réplica saudável; escritas ficam sempre no primário
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+DB_REPLICA_STICKY_S = int(os.getenv("DB_REPLICA_STICKY_S", "5"))            # Leituras no primário por N s após uma escrita do cliente
+DB_REPLICA_CHECAGEM_S = float(os.getenv("DB_REPLICA_CHECAGEM_S", "5"))      # Intervalo entre verificações de saúde de cada réplica
+DB_REPLICA_LAG_MAX_S = float(os.getenv("DB_REPLICA_LAG_MAX_S", "10"))       # Atraso de replicação tolerado (PostgreSQL)
+COOKIE_PRIMARIO = "hireai_primario"
+METODOS_SEGUROS = ("GET", "HEAD", "OPTIONS")
+
+# Atraso da réplica em segundos; 0 quando ela já aplicou tudo o que recebeu (primário ocioso)
+_SQL_LAG_POSTGRES = """SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0) END"""
+
+def verificar_replica(engine) -> bool:
+    """A réplica responde (e, no PostgreSQL, está dentro do atraso tolerado)?"""
+    try:
+        with engine.connect() as conexao:
+            if engine.dialect.name == "postgresql":
+                return float(conexao.scalar(text(_SQL_LAG_POSTGRES))) <= DB_REPLICA_LAG_MAX_S
+            conexao.execute(text("SELECT 1"))
+            return True
+    except Exception:
+        return False
+
+class Replica:
+    """Engine de uma réplica com o resultado da última verificação de saúde"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.saudavel = True
+        self.verificada_em = float("-inf")
+        self._lock = threading.Lock()
+        # Conexão perdida no meio de uma leitura: fora da rotação até a próxima verificação
+        event.listen(engine, "handle_error", self._erro)
+
+    def _erro(self, contexto):
+        if contexto.is_disconnect:
+            self.saudavel = False
+            self.verificada_em = time.monotonic()
+
+    def disponivel(self) -> bool:
+        # Só uma requisição por vez verifica; as demais usam o último resultado
+        if time.monotonic() - self.verificada_em >= DB_REPLICA_CHECAGEM_S and self._lock.acquire(blocking=False):
+            try:
+                self.saudavel = verificar_replica(self.engine)
+                self.verificada_em = time.monotonic()
+            finally:
+                self._lock.release()
+        return self.saudavel
+
+_replicas = None
+_rodizio = itertools.count()
+
+def get_replicas() -> list:
+    """Réplicas de DATABASE_REPLICA_URLS, criadas na primeira chamada"""
+    global _replicas
+    if _replicas is None:
+        with _engine_lock:
+            if _replicas is None:
+                # QueuePool simples: as estatísticas de PoolInstrumentado são só as do primário
+                _replicas = [Replica(_criar_engine(url, **({"poolclass": QueuePool} if opcoes_pool(url) else {})))
+                             for url in DATABASE_REPLICA_URLS]
+    return _replicas
+
+def configurar_replicas(engines):
+    """Troca as réplicas em uso (ex.: dois SQLite em arquivo nos testes)"""
+    global _replicas
+    _replicas = [Replica(engine) for engine in engines]
+
+def escolher_replica():
+    """Engine da próxima réplica saudável (rodízio); None = usar o primário"""
+    replicas = get_replicas()
+    for _ in range(len(replicas)):
+        replica = replicas[next(_rodizio) % len(replicas)]
+        if replica.disponivel():
+            return replica.engine
+    return None
+
+class SessaoRoteada(Session):
+    """Session que lê de `replica` (quando definida) e escreve sempre no primário
+
+    INSERT/UPDATE/DELETE e o flush do ORM vão para o bind padrão (primário);
+    SELECTs vão para a réplica escolhida na abertura da sessão.
+    """
+    replica = None
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.replica is not None and not self._flushing and not isinstance(clause, UpdateBase):
+            return self.replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
 
 # 💬 Cria uma fábrica de sessões (SessionLocal)
-# Cada vez que você chamar get_db(), uma nova sessão será criada com essas configurações
+# Cada vez que você chamar get_db(), uma nova sessão será criada com essas configurações;
+# o bind é preenchido por get_engine() quando o engine é criado
 SessionLocal = sessionmaker(
+    class_=SessaoRoteada,  # Sem réplica definida, tudo vai para o primário
     autocommit=False,  # Desliga o commit automático (você controla quando salvar)
     autoflush=False,   # Não envia mudanças para o banco automaticamente antes do commit
-    bind=engine        # Usa o engine definido acima
+    expire_on_commit=False,  # Objetos seguem legíveis após o commit (as escritas do crud usam RETURNING)
+)
+
+# ⚡ Modo assíncrono (opcional): DATABASE_ASYNC=1 troca as rotas de CRUD por versões `async def`
+# que usam AsyncSession, liberando o threadpool do Starlette durante a ida ao banco.
+DATABASE_ASYNC = os.getenv("DATABASE_ASYNC", "0").lower() in ("1", "true", "sim")
+
+# Drivers assíncronos usados para cada driver síncrono da DATABASE_URL
+_DRIVERS_ASSINCRONOS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def url_assincrona(url: str) -> str:
+    """Converte a URL síncrona para o driver assíncrono equivalente"""
+    driver, separador, resto = url.partition("://")
+    return f"{_DRIVERS_ASSINCRONOS.get(driver, driver)}{separador}{resto}"
+
+# ASYNC_DATABASE_URL permite apontar explicitamente para outro driver/banco
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or (
+    url_assincrona(SQLALCHEMY_DATABASE_URL) if SQLALCHEMY_DATABASE_URL else None
+)
+
+# O engine assíncrono só é criado no modo async (e também sob demanda),
+# para não exigir aiosqlite/asyncpg no modo padrão
+_async_engine = None
+
+def get_async_engine():
+    """Engine assíncrono (None fora do modo async), criado na primeira chamada"""
+    global _async_engine
+    if _async_engine is None and DATABASE_ASYNC:
+        with _engine_lock:
+            if _async_engine is None:
+                _async_engine = create_async_engine(
+                    ASYNC_DATABASE_URL, **opcoes_pool(ASYNC_DATABASE_URL, assincrono=True))
+                if metrics.METRICAS_ATIVAS:
+                    metrics.instrumentar_engine(_async_engine)
+                if profiler.profiler is not None:
+                    profiler.profiler.instalar(_async_engine)
+                AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+# expire_on_commit=False: depois do commit os objetos continuam legíveis sem nova consulta,
+# o que é obrigatório no modo async (não há lazy load implícito fora do greenlet)
+AsyncSessionLocal = async_sessionmaker(
+    autoflush=False,
+    expire_on_commit=False,
 )
 
+# `database.engine` e `database.async_engine` continuam acessíveis como atributos do módulo
+def __getattr__(nome):
+    if nome == "engine":
+        return get_engine()
+    if nome == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
 # 📦 Base de onde todos os modelos irão herdar (ex: Vaga, Candidato)
 # Isso permite que o SQLAlchemy saiba como criar as tabelas no banco a partir dos modelos
 Base = declarative_base()
 
 # 🔁 Função que será usada nas rotas para abrir uma sessão com o banco
 # O `yield` permite usar essa função como dependência no FastAPI e garante que a sessão seja fechada no final
-def get_db():
+def get_db(request: Request, response: Response):
+    get_engine()
+    if request.method not in METODOS_SEGUROS and get_replicas():
+        # Ler o que acabou de escrever: as próximas leituras deste cliente vão para o primário
+        response.set_cookie(COOKIE_PRIMARIO, "1", max_age=DB_REPLICA_STICKY_S, httponly=True, samesite="lax")
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# 📖 Sessão das rotas GET: leituras em uma réplica saudável, a não ser que o cliente tenha escrito há pouco
+def get_db_leitura(request: Request):
+    get_engine()
+    db = SessionLocal()
+    if COOKIE_PRIMARIO not in request.cookies:
+        db.replica = escolher_replica()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# 🔁 Equivalente assíncrono de get_db, usado pelas rotas de app/routes_async.py
+async def get_async_db():
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# 📊 Estado e contadores dos pools, exibidos em /diagnostico/pool
+def estado_pool() -> dict:
+    estado = {"sincrono": resumo(get_engine().pool)}
+    if get_async_engine() is not None:
+        estado["assincrono"] = resumo(get_async_engine().pool)
+    if get_replicas():
+        estado["replicas"] = [{"saudavel": r.saudavel, **resumo(r.engine.pool)} for r in get_replicas()]
+    return estado
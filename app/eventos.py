@@ -0,0 +1,338 @@
+"""Feed ao vivo dos candidatos de cada vaga (GET /vagas/{vaga_id}/candidatos/stream)
+
+Na transação de cada candidato criado, atualizado ou removido, o crud
+publica um evento no barramento, que só sai depois do commit (um rollback o
+descarta); a rota entrega os eventos da vaga por Server-Sent Events, e a
+tela do recrutador deixa de refazer a listagem a cada poucos segundos.
+
+Backends (EVENTOS_BACKEND):
+- `memoria` (padrão): pub/sub dentro do processo; com vários workers, cada
+  um só vê as escritas que ele mesmo atendeu;
+- `postgres`: publica com NOTIFY na transação da escrita e cada worker
+  escuta o canal com LISTEN em uma thread, em uma conexão própria fora do
+  pool (driver psycopg2).
+
+Cada evento tem um id único ("<processo>-<n>") e os EVENTOS_HISTORICO mais
+recentes ficam guardados. Uma reconexão com Last-Event-ID recebe o que
+perdeu; se o id não está mais no histórico (muito antigo, ou de antes de um
+restart), o stream começa com um evento `reset` e o cliente recarrega a
+listagem. A fila de cada assinante tem no máximo EVENTOS_FILA_MAX eventos:
+um cliente lento que a enche é desconectado e retoma pelo Last-Event-ID.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import os
+import select
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from . import schemas
+
+EVENTOS_BACKEND = os.getenv("EVENTOS_BACKEND", "memoria")                  # memoria | postgres
+EVENTOS_HISTORICO = int(os.getenv("EVENTOS_HISTORICO", "1000"))            # Eventos guardados para o Last-Event-ID
+EVENTOS_FILA_MAX = int(os.getenv("EVENTOS_FILA_MAX", "100"))               # Eventos pendentes por assinante
+EVENTOS_HEARTBEAT_S = float(os.getenv("EVENTOS_HEARTBEAT_S", "15"))        # Comentário enviado em streams parados
+EVENTOS_DURACAO_MAX_S = float(os.getenv("EVENTOS_DURACAO_MAX_S", "300"))   # Stream fechado depois disso (o cliente reconecta)
+EVENTOS_RETRY_MS = 3000  # Espera sugerida ao EventSource antes de reconectar
+CANAL_POSTGRES = "hireai_candidatos"
+PAYLOAD_MAX = 7900  # NOTIFY aceita até 8000 bytes
+
+ORIGEM = uuid.uuid4().hex[:8]
+_PENDENTES = "eventos_pendentes"  # Session.info: eventos da transação, distribuídos no commit
+
+logger = logging.getLogger(__name__)
+
+
+class Evento(NamedTuple):
+    id: str
+    tipo: str  # criado | atualizado | removido
+    vaga_id: int
+    dados: dict
+
+    def json(self) -> str:
+        return json.dumps(self._asdict(), ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def de_json(cls, payload: str) -> "Evento":
+        return cls(**json.loads(payload))
+
+    def sse(self) -> str:
+        dados = json.dumps(self.dados, ensure_ascii=False, separators=(",", ":"))
+        return f"id: {self.id}\nevent: {self.tipo}\ndata: {dados}\n\n"
+
+
+def resumo(candidato) -> dict:
+    """Dados de `criado`/`atualizado`: os mesmos campos da listagem de candidatos da vaga"""
+    return schemas.CandidatoResumo.model_validate(candidato).model_dump(mode="json")
+
+
+class Assinatura:
+    """Fila limitada de um stream, alimentada no event loop do próprio stream"""
+
+    def __init__(self, vaga_id: int, fila_max: int):
+        self.vaga_id = vaga_id
+        self.loop = asyncio.get_running_loop()
+        self.fila: asyncio.Queue = asyncio.Queue(maxsize=max(1, fila_max))
+        self.encerrada = False
+
+    def entregar(self, evento: Evento) -> bool:
+        """Roda no loop do stream; devolve False se a fila encheu e a assinatura foi encerrada"""
+        if self.encerrada:
+            return True
+        try:
+            self.fila.put_nowait(evento)
+            return True
+        except asyncio.QueueFull:
+            self.encerrar()
+            return False
+
+    def encerrar(self):
+        """Descarta o que ainda não foi enviado e fecha o stream (None é o fim)"""
+        self.encerrada = True
+        while not self.fila.empty():
+            self.fila.get_nowait()
+        self.fila.put_nowait(None)
+
+
+class Barramento:
+    """Pub/sub em memória do processo, com histórico para retomar pelo Last-Event-ID"""
+
+    def __init__(self, historico: int = EVENTOS_HISTORICO, fila_max: int = EVENTOS_FILA_MAX):
+        self.fila_max = fila_max
+        self._historico = deque(maxlen=historico)
+        self._assinantes: Dict[int, set] = {}
+        self._lock = threading.Lock()
+        self._sequencia = itertools.count(1)
+        self.publicados = 0
+        self.desconectados = 0  # assinantes lentos encerrados por fila cheia
+
+    def iniciar(self):
+        pass
+
+    def parar(self):
+        self.encerrar_assinaturas()
+
+    def novo_evento(self, tipo: str, vaga_id: int, dados: dict) -> Evento:
+        return Evento(f"{ORIGEM}-{next(self._sequencia)}", tipo, vaga_id, dados)
+
+    def publicar(self, db, tipo: str, vaga_id: int, dados: dict):
+        """Chamado pelo crud antes do commit (`db` é a sessão que faz a escrita; None distribui na hora)"""
+        evento = self.novo_evento(tipo, vaga_id, dados)
+        if db is None:
+            self.distribuir(evento)
+        else:
+            db.info.setdefault(_PENDENTES, []).append((self, evento))
+
+    def distribuir(self, evento: Evento):
+        """Guarda o evento no histórico e entrega aos assinantes da vaga (de qualquer thread)"""
+        with self._lock:
+            self._historico.append(evento)
+            self.publicados += 1
+            assinantes = list(self._assinantes.get(evento.vaga_id, ()))
+        for assinatura in assinantes:
+            try:
+                assinatura.loop.call_soon_threadsafe(self._entregar, assinatura, evento)
+            except RuntimeError:  # loop do stream já encerrado
+                self.cancelar(assinatura)
+
+    def _entregar(self, assinatura: Assinatura, evento: Evento):
+        if not assinatura.entregar(evento):
+            with self._lock:
+                self.desconectados += 1
+
+    def assinar(self, vaga_id: int, ultimo_id: Optional[str] = None) -> Tuple[Assinatura, Optional[List[Evento]]]:
+        """Nova assinatura e os eventos da vaga publicados depois de `ultimo_id`
+
+        A lista é None quando `ultimo_id` não está no histórico (o cliente
+        precisa recarregar). Registro e leitura do histórico acontecem sob o
+        mesmo lock da publicação: nenhum evento se perde ou chega duas vezes.
+        """
+        assinatura = Assinatura(vaga_id, self.fila_max)
+        with self._lock:
+            self._assinantes.setdefault(vaga_id, set()).add(assinatura)
+            perdidos: Optional[List[Evento]] = []
+            if ultimo_id is not None:
+                historico = list(self._historico)
+                posicao = next((i for i, evento in enumerate(historico) if evento.id == ultimo_id), None)
+                if posicao is None:
+                    perdidos = None
+                else:
+                    perdidos = [evento for evento in historico[posicao + 1:] if evento.vaga_id == vaga_id]
+        return assinatura, perdidos
+
+    def cancelar(self, assinatura: Assinatura):
+        with self._lock:
+            assinantes = self._assinantes.get(assinatura.vaga_id)
+            if assinantes is not None:
+                assinantes.discard(assinatura)
+                if not assinantes:
+                    del self._assinantes[assinatura.vaga_id]
+
+    def ultimo_id(self) -> Optional[str]:
+        with self._lock:
+            return self._historico[-1].id if self._historico else None
+
+    def encerrar_assinaturas(self):
+        """Fecha todos os streams abertos (os clientes reconectam com o Last-Event-ID)"""
+        with self._lock:
+            assinantes = [a for grupo in self._assinantes.values() for a in grupo]
+        for assinatura in assinantes:
+            try:
+                assinatura.loop.call_soon_threadsafe(assinatura.encerrar)
+            except RuntimeError:
+                self.cancelar(assinatura)
+
+    def estado(self) -> dict:
+        with self._lock:
+            return {
+                "backend": type(self).__name__,
+                "assinantes": sum(len(grupo) for grupo in self._assinantes.values()),
+                "publicados": self.publicados,
+                "desconectados": self.desconectados,
+                "historico": len(self._historico),
+            }
+
+
+class PostgresBarramento(Barramento):
+    """NOTIFY na publicação e LISTEN em uma thread: cada worker entrega os eventos de todos
+
+    O NOTIFY sai na própria transação da escrita, antes do commit: o
+    PostgreSQL só o entrega se ela for confirmada, e não há um segundo
+    commit depois dela. O próprio worker também recebe o evento pelo
+    LISTEN, então `publicar` não entrega nada localmente.
+    """
+
+    def __init__(self, engine=None, **opcoes):
+        super().__init__(**opcoes)
+        self.engine = engine
+        self._thread: Optional[threading.Thread] = None
+        self._parar = threading.Event()
+
+    def publicar(self, db, tipo: str, vaga_id: int, dados: dict):
+        evento = self.novo_evento(tipo, vaga_id, dados)
+        payload = evento.json()
+        if len(payload.encode()) > PAYLOAD_MAX:
+            # Só o id: o cliente busca o candidato em GET /candidatos/{id}
+            payload = evento._replace(dados={"id": dados.get("id")}).json()
+        db.execute(text("SELECT pg_notify(:canal, :payload)"), {"canal": CANAL_POSTGRES, "payload": payload})
+
+    def iniciar(self):
+        if self._thread is None:
+            if self.engine is None:
+                from .database import get_engine
+                self.engine = get_engine()
+            self._parar.clear()
+            self._thread = threading.Thread(target=self._escutar, name="eventos-listen", daemon=True)
+            self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        super().parar()
+
+    def _conectar(self):
+        """Conexão DBAPI própria, em autocommit, fora do pool da aplicação"""
+        dialeto = self.engine.dialect
+        cargs, cparams = dialeto.create_connect_args(self.engine.url)
+        conexao = dialeto.connect(*cargs, **cparams)
+        conexao.autocommit = True
+        conexao.cursor().execute(f"LISTEN {CANAL_POSTGRES}")
+        return conexao
+
+    def _escutar(self):
+        primeira = True
+        while not self._parar.is_set():
+            conexao = None
+            try:
+                conexao = self._conectar()
+                if not primeira:
+                    # Notificações enviadas enquanto a conexão esteve fora se perderam
+                    with self._lock:
+                        self._historico.clear()
+                    self.encerrar_assinaturas()
+                primeira = False
+                while not self._parar.is_set():
+                    if select.select([conexao], [], [], 1.0) == ([], [], []):
+                        continue
+                    conexao.poll()
+                    while conexao.notifies:
+                        self.distribuir(Evento.de_json(conexao.notifies.pop(0).payload))
+            except Exception:
+                logger.exception("LISTEN %s falhou; reconectando", CANAL_POSTGRES)
+                primeira = False
+                self._parar.wait(1)
+            finally:
+                if conexao is not None:
+                    conexao.close()
+
+
+barramento: Barramento = PostgresBarramento() if EVENTOS_BACKEND == "postgres" else Barramento()
+
+
+def configurar_barramento(novo: Barramento):
+    """Troca o barramento em uso (ex.: nos testes)"""
+    global barramento
+    barramento = novo
+
+
+def publicar(db, tipo: str, vaga_id: int, dados: dict):
+    """Publica a mudança de um candidato da vaga (chamado pelo crud na transação, antes do commit)"""
+    barramento.publicar(db, tipo, vaga_id, dados)
+
+
+@event.listens_for(Session, "after_commit")
+def _distribuir_pendentes(sessao):
+    for destino, evento in sessao.info.pop(_PENDENTES, ()):
+        destino.distribuir(evento)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _descartar_pendentes(sessao, transacao):
+    # Rollback (ou sessão fechada sem commit): os eventos da transação não aconteceram
+    if transacao.parent is None:
+        sessao.info.pop(_PENDENTES, None)
+
+
+async def _stream(vaga_id: int, ultimo_id: Optional[str]):
+    atual = barramento
+    assinatura, perdidos = atual.assinar(vaga_id, ultimo_id)
+    fim = time.monotonic() + EVENTOS_DURACAO_MAX_S
+    try:
+        yield f"retry: {EVENTOS_RETRY_MS}\n\n"
+        if perdidos is None:
+            recente = atual.ultimo_id()
+            yield (f"id: {recente}\n" if recente else "") + "event: reset\ndata: {}\n\n"
+        for evento in perdidos or ():
+            yield evento.sse()
+        while (restante := fim - time.monotonic()) > 0:
+            try:
+                evento = await asyncio.wait_for(assinatura.fila.get(), min(EVENTOS_HEARTBEAT_S, restante))
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if evento is None:
+                return
+            yield evento.sse()
+    finally:
+        atual.cancelar(assinatura)
+
+
+def resposta_stream(vaga_id: int, ultimo_id: Optional[str] = None) -> StreamingResponse:
+    """Resposta text/event-stream com os eventos da vaga a partir de `ultimo_id`"""
+    return StreamingResponse(
+        _stream(vaga_id, ultimo_id),
+        media_type="text/event-stream",
+        # Sem cache e sem buffer em proxies (nginx), senão os eventos chegam atrasados
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
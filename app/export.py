@@ -0,0 +1,55 @@
+"""Exportação em streaming dos candidatos de uma vaga (CSV ou NDJSON)
+
+As linhas são lidas com `yield_per` (cursor do lado do servidor no
+Postgres, fetchmany no SQLite) e escritas em blocos de EXPORT_LOTE
+linhas, então a memória usada não depende do número de candidatos.
+A coluna `video` fica de fora: o arquivo é para leitura do comitê.
+"""
+import csv
+import io
+import json
+import os
+from typing import Iterator
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from . import models, projection
+
+EXPORT_LOTE = int(os.getenv("EXPORT_LOTE", "500"))
+
+CAMPOS_EXPORTACAO = tuple(campo for campo in projection.CAMPOS_CANDIDATO if campo != "video")
+
+FORMATOS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _linhas(db: Session, vaga_id: int, lote: int):
+    colunas = [getattr(models.Candidato, campo) for campo in CAMPOS_EXPORTACAO]
+    stmt = select(*colunas).where(models.Candidato.vaga_id == vaga_id).order_by(models.Candidato.id)
+    return db.execute(stmt, execution_options={"yield_per": lote})
+
+
+def gerar_csv(db: Session, vaga_id: int, lote: int = EXPORT_LOTE) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(CAMPOS_EXPORTACAO)
+    for bloco in _linhas(db, vaga_id, lote).partitions():
+        escritor.writerows(bloco)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def gerar_ndjson(db: Session, vaga_id: int, lote: int = EXPORT_LOTE) -> Iterator[bytes]:
+    for bloco in _linhas(db, vaga_id, lote).partitions():
+        yield "".join(
+            json.dumps(dict(zip(CAMPOS_EXPORTACAO, linha)), ensure_ascii=False, default=str) + "\n"
+            for linha in bloco
+        ).encode()
+
+
+GERADORES = {"csv": gerar_csv, "ndjson": gerar_ndjson}
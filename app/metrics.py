@@ -0,0 +1,201 @@
+"""Métricas por rota e de banco, no formato texto do Prometheus (GET /metrics)
+
+`MetricasMiddleware` (ASGI puro) mede a latência de cada requisição e
+conta respostas por rota e status. A rota é o template do caminho
+(`/vagas/{vaga_id}`), não a URL, para a cardinalidade ficar limitada.
+Os eventos before/after_cursor_execute do engine somam as queries e o
+tempo de banco na requisição em andamento: o acumulador vive em uma
+ContextVar, que o Starlette propaga para o threadpool das rotas síncronas.
+
+Tudo fica em memória, por processo, atrás de um único lock; com vários
+workers cada um expõe os próprios contadores.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+
+METRICAS_ATIVAS = os.getenv("METRICAS_ATIVAS", "1").lower() in ("1", "true", "sim")
+
+# Limites (s) dos buckets do histograma de latência
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+SEM_ROTA = "<sem_rota>"
+
+
+class _Requisicao:
+    """Queries e tempo de banco da requisição em andamento"""
+
+    __slots__ = ("queries", "tempo_banco", "scope")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.queries = 0
+        self.tempo_banco = 0.0
+        self.scope = scope
+
+
+_requisicao_atual: ContextVar[Optional[_Requisicao]] = ContextVar("requisicao_metricas", default=None)
+
+
+class _PorRota:
+    __slots__ = ("buckets", "soma", "total", "queries", "tempo_banco")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.soma = 0.0
+        self.total = 0
+        self.queries = 0
+        self.tempo_banco = 0.0
+
+
+class Registro:
+    """Contadores acumulados desde o início do processo (ou do último zerar())"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.zerar()
+
+    def zerar(self):
+        with self._lock:
+            self.rotas: Dict[Tuple[str, str], _PorRota] = {}
+            self.respostas: Dict[Tuple[str, str, int], int] = {}
+            self.queries_fora_de_requisicao = 0
+
+    def registrar(self, metodo: str, rota: str, status: int, duracao: float, requisicao: _Requisicao):
+        with self._lock:
+            dados = self.rotas.get((metodo, rota))
+            if dados is None:
+                dados = self.rotas[(metodo, rota)] = _PorRota()
+            dados.buckets[bisect_left(BUCKETS, duracao)] += 1
+            dados.soma += duracao
+            dados.total += 1
+            dados.queries += requisicao.queries
+            dados.tempo_banco += requisicao.tempo_banco
+            chave = (metodo, rota, status)
+            self.respostas[chave] = self.respostas.get(chave, 0) + 1
+
+    def query_fora_de_requisicao(self):
+        with self._lock:
+            self.queries_fora_de_requisicao += 1
+
+    def exportar(self) -> str:
+        """Texto no formato de exposição do Prometheus (versão 0.0.4)"""
+        with self._lock:
+            rotas = sorted(self.rotas.items())
+            respostas = sorted(self.respostas.items())
+            fora = self.queries_fora_de_requisicao
+        linhas = [
+            "# HELP hireai_http_request_duration_seconds Latência das requisições por rota",
+            "# TYPE hireai_http_request_duration_seconds histogram",
+        ]
+        for (metodo, rota), dados in rotas:
+            rotulos = f'method="{metodo}",route="{_escapar(rota)}"'
+            acumulado = 0
+            for limite, quantidade in zip(BUCKETS, dados.buckets):
+                acumulado += quantidade
+                linhas.append(f'hireai_http_request_duration_seconds_bucket{{{rotulos},le="{limite}"}} {acumulado}')
+            linhas.append(f'hireai_http_request_duration_seconds_bucket{{{rotulos},le="+Inf"}} {dados.total}')
+            linhas.append(f"hireai_http_request_duration_seconds_sum{{{rotulos}}} {dados.soma}")
+            linhas.append(f"hireai_http_request_duration_seconds_count{{{rotulos}}} {dados.total}")
+        linhas += [
+            "# HELP hireai_http_requests_total Respostas por rota e status",
+            "# TYPE hireai_http_requests_total counter",
+        ]
+        for (metodo, rota, status), quantidade in respostas:
+            linhas.append(
+                f'hireai_http_requests_total{{method="{metodo}",route="{_escapar(rota)}",status="{status}"}} {quantidade}')
+        linhas += [
+            "# HELP hireai_db_queries_total Statements SQL executados durante requisições da rota",
+            "# TYPE hireai_db_queries_total counter",
+        ]
+        for (metodo, rota), dados in rotas:
+            linhas.append(f'hireai_db_queries_total{{method="{metodo}",route="{_escapar(rota)}"}} {dados.queries}')
+        linhas += [
+            "# HELP hireai_db_seconds_total Tempo gasto no banco durante requisições da rota",
+            "# TYPE hireai_db_seconds_total counter",
+        ]
+        for (metodo, rota), dados in rotas:
+            linhas.append(f'hireai_db_seconds_total{{method="{metodo}",route="{_escapar(rota)}"}} {dados.tempo_banco}')
+        linhas += [
+            "# HELP hireai_db_queries_outside_request_total Statements SQL fora de requisições (migrações, tarefas)",
+            "# TYPE hireai_db_queries_outside_request_total counter",
+            f"hireai_db_queries_outside_request_total {fora}",
+        ]
+        return "\n".join(linhas) + "\n"
+
+
+def rota_atual() -> Optional[str]:
+    """"METHOD /template/da/rota" da requisição em andamento (None fora de requisições)"""
+    requisicao = _requisicao_atual.get()
+    if requisicao is None or requisicao.scope is None:
+        return None
+    return f"{requisicao.scope['method']} {getattr(requisicao.scope.get('route'), 'path', SEM_ROTA)}"
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registro = Registro()
+
+
+# ===== EVENTOS DO ENGINE =====
+
+# Uma conexão executa um statement por vez, então basta um início por conexão
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    conn.info["_metricas_inicio"] = time.perf_counter()
+
+
+def _depois(conn, cursor, statement, parameters, context, executemany):
+    duracao = time.perf_counter() - conn.info["_metricas_inicio"]
+    requisicao = _requisicao_atual.get()
+    if requisicao is None:
+        registro.query_fora_de_requisicao()
+    else:
+        requisicao.queries += 1
+        requisicao.tempo_banco += duracao
+
+
+def instrumentar_engine(engine):
+    """Conta queries e tempo de banco do engine (síncrono ou o sync_engine de um AsyncEngine)"""
+    engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(engine, "before_cursor_execute", _antes):
+        event.listen(engine, "before_cursor_execute", _antes)
+        event.listen(engine, "after_cursor_execute", _depois)
+    return engine
+
+
+# ===== MIDDLEWARE =====
+
+class MetricasMiddleware:
+    """Mede latência, status e custo de banco de cada requisição HTTP"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        requisicao = _Requisicao(scope)
+        token = _requisicao_atual.set(requisicao)
+        status = 500
+        inicio = time.perf_counter()
+
+        async def send_com_status(mensagem):
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, send_com_status)
+        finally:
+            duracao = time.perf_counter() - inicio
+            _requisicao_atual.reset(token)
+            rota = scope.get("route")
+            registro.registrar(scope["method"], getattr(rota, "path", SEM_ROTA), status, duracao, requisicao)
@@ -0,0 +1,142 @@
+"""Criação e atualização do schema do banco
+
+Uso:
+    python -m app.migrations [--remover-repetidas]
+
+Roda uma vez por deploy, antes de subir os workers, em vez de cada
+processo inspecionar o schema ao importar a aplicação. Todos os passos
+são idempotentes: criam só o que falta, então podem rodar de novo em um
+banco já migrado. O hook de lifespan de main.py chama a mesma função
+enquanto DB_CREATE_SCHEMA não for desligado.
+"""
+import argparse
+import time
+
+from sqlalchemy import delete, func, inspect, select, text
+
+from . import contadores, models
+from .database import get_engine
+
+
+def _adicionar_colunas(*nomes):
+    """Passo que cria em candidato as colunas (anuláveis) que bancos antigos ainda não têm"""
+    def passo(conexao):
+        colunas = {coluna["name"] for coluna in inspect(conexao).get_columns("candidato")}
+        for nome in nomes:
+            if nome not in colunas:
+                tipo = models.Candidato.__table__.c[nome].type.compile(dialect=conexao.dialect)
+                conexao.execute(text(f"ALTER TABLE candidato ADD COLUMN {nome} {tipo}"))
+    return passo
+
+
+def _contador_de_candidatos(conexao):
+    """vagas.total_candidatos e os triggers que o mantêm; bancos antigos são preenchidos na hora"""
+    nova = "total_candidatos" not in {coluna["name"] for coluna in inspect(conexao).get_columns("vagas")}
+    if nova:
+        conexao.execute(text("ALTER TABLE vagas ADD COLUMN total_candidatos INTEGER NOT NULL DEFAULT 0"))
+    ddls = {"sqlite": models.DDL_CONTADOR_SQLITE, "postgresql": models.DDL_CONTADOR_POSTGRES}
+    for ddl in ddls.get(conexao.dialect.name, []):
+        conexao.execute(text(ddl))
+    if nova:
+        contadores.reconciliar(conexao)
+
+
+def _nomes_de_indices(conexao, tabela: str) -> set:
+    """Índices da tabela pelo catálogo (a reflexão do SQLite ignora índices de expressão)"""
+    if conexao.dialect.name == "sqlite":
+        sql = "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :tabela"
+    elif conexao.dialect.name == "postgresql":
+        sql = "SELECT indexname FROM pg_indexes WHERE tablename = :tabela"
+    else:
+        return {indice["name"] for indice in inspect(conexao).get_indexes(tabela)}
+    return set(conexao.scalars(text(sql), {"tabela": tabela}))
+
+
+def _candidaturas_repetidas(conexao):
+    """Ids das candidaturas além da primeira (menor id) de cada (vaga_id, lower(email))"""
+    c = models.Candidato.__table__.c
+    primeiras = select(func.min(c.id)).group_by(c.vaga_id, func.lower(c.email))
+    return select(c.id).where(c.id.not_in(primeiras))
+
+
+def remover_candidaturas_repetidas(conexao) -> int:
+    """Apaga as candidaturas repetidas, mantendo a mais antiga; devolve quantas foram removidas"""
+    tabela = models.Candidato.__table__
+    return conexao.execute(delete(tabela).where(tabela.c.id.in_(_candidaturas_repetidas(conexao)))).rowcount
+
+
+def _indices_de_candidato(conexao):
+    """Índices de listagem por vaga e de candidatura única em bancos criados antes deles"""
+    existentes = _nomes_de_indices(conexao, "candidato")
+    for indice in models.Candidato.__table__.indexes:
+        if indice.name in existentes:
+            continue
+        if indice.unique:
+            repetidas = conexao.scalar(select(func.count()).select_from(_candidaturas_repetidas(conexao).subquery()))
+            if repetidas:
+                raise RuntimeError(
+                    f"{repetidas} candidatura(s) repetida(s) (mesmo e-mail na mesma vaga) impedem criar "
+                    f"{indice.name}; rode `python -m app.migrations --remover-repetidas` para manter só a mais antiga"
+                )
+        indice.create(conexao)
+
+
+def _indice_de_busca(conexao):
+    """Índice de busca textual de bancos criados antes de app/search.py"""
+    if conexao.dialect.name == "sqlite":
+        novo = not inspect(conexao).has_table("candidato_fts")
+        for ddl in models.DDL_BUSCA_SQLITE:
+            conexao.execute(text(ddl))
+        if novo:
+            conexao.execute(text("INSERT INTO candidato_fts(candidato_fts) VALUES ('rebuild')"))
+    elif conexao.dialect.name == "postgresql":
+        for ddl in models.DDL_BUSCA_POSTGRES:
+            conexao.execute(text(ddl))
+
+
+PASSOS = [
+    ("tabelas", lambda conexao: models.Base.metadata.create_all(bind=conexao)),
+    ("candidato.vetor", _adicionar_colunas("vetor")),
+    ("candidato.video_*", _adicionar_colunas("video_digest", "video_tamanho", "video_tipo")),
+    ("candidato.*_processamento", _adicionar_colunas("status_processamento", "erro_processamento",
+                                                                "processamento_inicio")),
+    ("candidato.índices", _indices_de_candidato),
+    ("vagas.total_candidatos", _contador_de_candidatos),
+    ("índice de busca", _indice_de_busca),
+]
+
+
+def migrar(engine=None, remover_repetidas: bool = False) -> list:
+    """Aplica todos os passos em uma transação; devolve [(passo, segundos)]
+
+    `remover_repetidas` apaga antes as candidaturas repetidas que impediriam
+    o índice único de (vaga_id, lower(email)).
+    """
+    engine = engine if engine is not None else get_engine()
+    tempos = []
+    with engine.begin() as conexao:
+        if conexao.dialect.name == "postgresql":
+            # Vários processos migrando ao mesmo tempo esperam um pelo outro
+            conexao.execute(text("SELECT pg_advisory_xact_lock(hashtext('hireai-migrations'))"))
+        if remover_repetidas and inspect(conexao).has_table("candidato"):
+            inicio = time.perf_counter()
+            removidas = remover_candidaturas_repetidas(conexao)
+            tempos.append((f"{removidas} repetida(s) removida(s)", time.perf_counter() - inicio))
+        for nome, passo in PASSOS:
+            inicio = time.perf_counter()
+            passo(conexao)
+            tempos.append((nome, time.perf_counter() - inicio))
+    return tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--remover-repetidas", action="store_true",
+                        help="apaga candidaturas repetidas (mesmo e-mail na vaga), mantendo a mais antiga")
+    args = parser.parse_args()
+    for nome, segundos in migrar(remover_repetidas=args.remover_repetidas):
+        print(f"{nome:<20} {segundos * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
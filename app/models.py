@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import DDL, BigInteger, Column, Index, Integer, LargeBinary, String, Text, DateTime, ForeignKey, event
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from .database import Base
 
@@ -13,6 +13,8 @@ class Vaga(Base):
     modelo_trab = Column(String, nullable=False)
     modelo_cont = Column(String, nullable=False)
     slug = Column(String, unique=True, index=True, nullable=False)
+    # Mantido pelos triggers de DDL_CONTADOR_* abaixo; `python -m app.contadores` corrige desvios
+    total_candidatos = Column(Integer, nullable=False, server_default="0")
     
     # Relacionamento com candidatos
     candidatos = relationship("Candidato", back_populates="vaga")
@@ -26,11 +28,124 @@ class Candidato(Base):
     telefone = Column(String, nullable=False)
     email = Column(String, nullable=False)
     skill = Column(Text, nullable=False)
-    video = Column(Text, nullable=False)
+    video = Column(Text, nullable=False)  # legado: base64 na própria linha; vídeos novos vão para app/blobs.py
     transcricao = Column(Text, nullable=False)
     Perfil = Column(Text, nullable=False)
     video_url = Column(Text, nullable=False)
     vaga_id = Column(Integer, ForeignKey("vagas.id"), nullable=False)
+    # Vídeo no blob store (app/blobs.py): só o SHA-256, o tamanho e o Content-Type ficam na linha
+    video_digest = Column(String(64), nullable=True)
+    video_tamanho = Column(BigInteger, nullable=True)
+    video_tipo = Column(String, nullable=True)
+    # Pipeline de transcrição/perfil (app/processamento.py); NULL = criado com os textos completos
+    status_processamento = Column(String, nullable=True)
+    erro_processamento = Column(Text, nullable=True)
+    # Início (UTC) da reserva do worker que está processando; vencida, outro worker pode retomar o candidato
+    processamento_inicio = Column(DateTime, nullable=True)
+    # Vetor de termos usado no ranking (app/matching.py); NULL = recalcular na próxima consulta
+    vetor = deferred(Column(LargeBinary, nullable=True))
     
     # Relacionamento com vaga
-    vaga = relationship("Vaga", back_populates="candidatos")
\ No newline at end of file
+    vaga = relationship("Vaga", back_populates="candidatos")
+
+# ===== ÍNDICES DE CANDIDATO =====
+# Criados por create_all em bancos novos e pelo passo "candidato.índices" de app/migrations.py nos antigos
+
+# Listagem da vaga em ordem de inscrição (crud.get_candidatos_por_vaga): filtro, ordenação e cursor no mesmo índice
+Index("ix_candidato_vaga_criacao", Candidato.vaga_id, Candidato.created_at, Candidato.id)
+# Uma candidatura por e-mail em cada vaga, sem diferenciar maiúsculas (crud.criar_ou_obter_candidato)
+Index("ux_candidato_vaga_email", Candidato.vaga_id, func.lower(Candidato.email), unique=True)
+
+# ===== ÍNDICE DE BUSCA TEXTUAL (usado por app/search.py) =====
+# Mantido pelo próprio banco a cada INSERT/UPDATE/DELETE em candidato, então
+# vale para todas as escritas (crud, importação em lote) sem idas extras ao banco.
+
+# SQLite: tabela FTS5 de conteúdo externo sincronizada por triggers
+_FTS_COLUNAS = "skill, transcricao, Perfil"
+DDL_BUSCA_SQLITE = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS candidato_fts USING fts5(
+        {_FTS_COLUNAS}, content='candidato', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2')""",
+    f"""CREATE TRIGGER IF NOT EXISTS candidato_fts_ai AFTER INSERT ON candidato BEGIN
+        INSERT INTO candidato_fts(rowid, {_FTS_COLUNAS}) VALUES (new.id, new.skill, new.transcricao, new.Perfil);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS candidato_fts_ad AFTER DELETE ON candidato BEGIN
+        INSERT INTO candidato_fts(candidato_fts, rowid, {_FTS_COLUNAS})
+        VALUES ('delete', old.id, old.skill, old.transcricao, old.Perfil);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS candidato_fts_au AFTER UPDATE OF {_FTS_COLUNAS} ON candidato BEGIN
+        INSERT INTO candidato_fts(candidato_fts, rowid, {_FTS_COLUNAS})
+        VALUES ('delete', old.id, old.skill, old.transcricao, old.Perfil);
+        INSERT INTO candidato_fts(rowid, {_FTS_COLUNAS}) VALUES (new.id, new.skill, new.transcricao, new.Perfil);
+    END""",
+]
+
+# Postgres: coluna tsvector gerada (skill pesa mais que Perfil, que pesa mais que a transcrição) + GIN
+DDL_BUSCA_POSTGRES = [
+    """ALTER TABLE candidato ADD COLUMN IF NOT EXISTS busca tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', coalesce(skill, '')), 'A') ||
+        setweight(to_tsvector('portuguese', coalesce("Perfil", '')), 'B') ||
+        setweight(to_tsvector('portuguese', coalesce(transcricao, '')), 'C')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_candidato_busca ON candidato USING GIN (busca)",
+]
+
+for _ddl in DDL_BUSCA_SQLITE:
+    event.listen(Candidato.__table__, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+for _ddl in DDL_BUSCA_POSTGRES:
+    event.listen(Candidato.__table__, "after_create", DDL(_ddl).execute_if(dialect="postgresql"))
+
+# ===== CONTADOR DE CANDIDATOS POR VAGA (vagas.total_candidatos) =====
+# Atualizado pelo banco na mesma transação de cada INSERT/DELETE em candidato e
+# de cada troca de vaga_id, então vale também para a importação em lote e o pipeline.
+
+DDL_CONTADOR_SQLITE = [
+    """CREATE TRIGGER IF NOT EXISTS candidato_contador_ai AFTER INSERT ON candidato BEGIN
+        UPDATE vagas SET total_candidatos = total_candidatos + 1 WHERE id = new.vaga_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS candidato_contador_ad AFTER DELETE ON candidato BEGIN
+        UPDATE vagas SET total_candidatos = total_candidatos - 1 WHERE id = old.vaga_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS candidato_contador_au AFTER UPDATE OF vaga_id ON candidato
+        WHEN old.vaga_id IS NOT new.vaga_id BEGIN
+        UPDATE vagas SET total_candidatos = total_candidatos - 1 WHERE id = old.vaga_id;
+        UPDATE vagas SET total_candidatos = total_candidatos + 1 WHERE id = new.vaga_id;
+    END""",
+]
+
+# Postgres: triggers por statement com tabelas de transição, então um INSERT de
+# 500 linhas faz um UPDATE por vaga distinta em vez de 500
+DDL_CONTADOR_POSTGRES = [
+    """CREATE OR REPLACE FUNCTION candidato_contador() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE vagas v SET total_candidatos = v.total_candidatos + d.n
+            FROM (SELECT vaga_id, count(*) AS n FROM novos GROUP BY vaga_id) d WHERE v.id = d.vaga_id;
+        ELSIF TG_OP = 'DELETE' THEN
+            UPDATE vagas v SET total_candidatos = v.total_candidatos - d.n
+            FROM (SELECT vaga_id, count(*) AS n FROM antigos GROUP BY vaga_id) d WHERE v.id = d.vaga_id;
+        ELSE
+            UPDATE vagas v SET total_candidatos = v.total_candidatos + d.n
+            FROM (SELECT vaga_id, sum(n) AS n FROM (
+                SELECT nv.vaga_id, 1 AS n FROM novos nv JOIN antigos av USING (id) WHERE nv.vaga_id <> av.vaga_id
+                UNION ALL
+                SELECT av.vaga_id, -1 FROM novos nv JOIN antigos av USING (id) WHERE nv.vaga_id <> av.vaga_id
+            ) trocas GROUP BY vaga_id) d WHERE v.id = d.vaga_id;
+        END IF;
+        RETURN NULL;
+    END $$""",
+    "DROP TRIGGER IF EXISTS candidato_contador_ai ON candidato",
+    """CREATE TRIGGER candidato_contador_ai AFTER INSERT ON candidato
+        REFERENCING NEW TABLE AS novos FOR EACH STATEMENT EXECUTE FUNCTION candidato_contador()""",
+    "DROP TRIGGER IF EXISTS candidato_contador_ad ON candidato",
+    """CREATE TRIGGER candidato_contador_ad AFTER DELETE ON candidato
+        REFERENCING OLD TABLE AS antigos FOR EACH STATEMENT EXECUTE FUNCTION candidato_contador()""",
+    "DROP TRIGGER IF EXISTS candidato_contador_au ON candidato",
+    """CREATE TRIGGER candidato_contador_au AFTER UPDATE ON candidato
+        REFERENCING OLD TABLE AS antigos NEW TABLE AS novos FOR EACH STATEMENT EXECUTE FUNCTION candidato_contador()""",
+]
+
+for _ddl in DDL_CONTADOR_SQLITE:
+    event.listen(Candidato.__table__, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+for _ddl in DDL_CONTADOR_POSTGRES:
+    event.listen(Candidato.__table__, "after_create", DDL(_ddl).execute_if(dialect="postgresql"))
@@ -0,0 +1,76 @@
+import base64
+import binascii
+import json
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+
+# Paginação por cursor (keyset): em vez de OFFSET, a próxima página começa
+# depois do último id visto, então o banco usa o índice da chave primária
+# e o custo de uma página profunda é o mesmo da primeira.
+
+
+class CursorInvalido(ValueError):
+    """Cursor recebido do cliente não pôde ser decodificado"""
+
+
+def _codificar(dados: dict) -> str:
+    payload = json.dumps(dados, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def _decodificar(cursor: str) -> dict:
+    try:
+        dados = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise CursorInvalido(cursor)
+    if not isinstance(dados, dict) or not isinstance(dados.get("id"), int):
+        raise CursorInvalido(cursor)
+    return dados
+
+
+def codificar_cursor(ultimo_id: int) -> str:
+    """Gera o cursor opaco que aponta para depois de `ultimo_id`"""
+    return _codificar({"id": ultimo_id})
+
+
+def decodificar_cursor(cursor: str) -> Optional[int]:
+    """Devolve o último id visto; cursor vazio significa primeira página"""
+    if not cursor:
+        return None
+    return _decodificar(cursor)["id"]
+
+
+def codificar_cursor_ranking(score: float, ultimo_id: int) -> str:
+    """Cursor para listagens ordenadas por (score desc, id), como a busca textual"""
+    return _codificar({"score": score, "id": ultimo_id})
+
+
+def decodificar_cursor_ranking(cursor: str) -> Optional[Tuple[float, int]]:
+    """Devolve (score, id) do último item visto; cursor vazio significa primeira página"""
+    if not cursor:
+        return None
+    dados = _decodificar(cursor)
+    if not isinstance(dados.get("score"), (int, float)):
+        raise CursorInvalido(cursor)
+    return float(dados["score"]), dados["id"]
+
+
+def ler_cursor(cursor: str, decodificador=decodificar_cursor):
+    """Decodifica o cursor recebido na query string, respondendo 400 se inválido"""
+    try:
+        return decodificador(cursor)
+    except CursorInvalido:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+def fatiar_pagina(linhas: List, limit: int) -> Tuple[List, Optional[str]]:
+    """Separa a página do próximo cursor.
+
+    A consulta deve buscar `limit + 1` linhas: a linha extra só indica que
+    existe uma próxima página e não é devolvida ao cliente.
+    """
+    if limit <= 0 or len(linhas) <= limit:
+        return linhas[:max(limit, 0)], None
+    pagina = linhas[:limit]
+    return pagina, codificar_cursor(pagina[-1].id)
@@ -0,0 +1,98 @@
+"""Pool de conexões instrumentado
+
+Subclasses de QueuePool que contam checkouts, quanto tempo cada checkout
+levou, quantos precisaram esperar por uma conexão livre e quantos
+estouraram o `pool_timeout`. Os números aparecem em /diagnostico/pool e
+servem para dimensionar DB_POOL_SIZE e DB_MAX_OVERFLOW com dados.
+"""
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class EstatisticasPool:
+    """Contadores acumulados de um pool (seguros entre threads)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.zerar()
+
+    def zerar(self):
+        with self._lock:
+            self.checkouts = 0
+            self.esperas = 0
+            self.esgotamentos = 0
+            self.tempo_checkout_total = 0.0
+            self.tempo_checkout_max = 0.0
+
+    def registrar_checkout(self, duracao: float, esperou: bool):
+        with self._lock:
+            self.checkouts += 1
+            self.esperas += esperou
+            self.tempo_checkout_total += duracao
+            self.tempo_checkout_max = max(self.tempo_checkout_max, duracao)
+
+    def registrar_esgotamento(self, duracao: float):
+        with self._lock:
+            self.esgotamentos += 1
+            self.esperas += 1
+            self.tempo_checkout_total += duracao
+            self.tempo_checkout_max = max(self.tempo_checkout_max, duracao)
+
+    def como_dict(self) -> dict:
+        with self._lock:
+            tentativas = self.checkouts + self.esgotamentos
+            return {
+                "checkouts": self.checkouts,
+                "esperas": self.esperas,
+                "esgotamentos": self.esgotamentos,
+                "tempo_checkout_medio_ms": round(self.tempo_checkout_total / tentativas * 1000, 3) if tentativas else 0.0,
+                "tempo_checkout_max_ms": round(self.tempo_checkout_max * 1000, 3),
+            }
+
+
+class _Instrumentado:
+    """Mixin que mede o `_do_get` do QueuePool"""
+
+    estatisticas: EstatisticasPool
+
+    def _do_get(self):
+        # Mesmo critério do QueuePool: sem conexão ociosa e sem overflow disponível, o checkout espera
+        esperou = -1 < self._max_overflow <= self._overflow and self._pool.empty()
+        inicio = time.perf_counter()
+        try:
+            conexao = super()._do_get()
+        except exc.TimeoutError:
+            self.estatisticas.registrar_esgotamento(time.perf_counter() - inicio)
+            raise
+        self.estatisticas.registrar_checkout(time.perf_counter() - inicio, esperou)
+        return conexao
+
+
+# As estatísticas ficam na classe porque o SQLAlchemy recria o pool (dispose/recreate)
+# passando só os argumentos do QueuePool; assim os contadores sobrevivem à recriação.
+class PoolInstrumentado(_Instrumentado, QueuePool):
+    estatisticas = EstatisticasPool()
+
+
+class PoolAssincronoInstrumentado(_Instrumentado, AsyncAdaptedQueuePool):
+    estatisticas = EstatisticasPool()
+
+
+def resumo(pool) -> dict:
+    """Estado atual e contadores de um pool, para o endpoint de diagnóstico"""
+    dados = {"classe": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        dados.update({
+            "tamanho": pool.size(),
+            "em_uso": pool.checkedout(),
+            "ociosas": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+            "timeout_s": pool.timeout(),
+        })
+    if isinstance(pool, _Instrumentado):
+        dados.update(pool.estatisticas.como_dict())
+    return dados
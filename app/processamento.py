@@ -0,0 +1,246 @@
+"""Processamento em segundo plano da transcrição e do perfil dos candidatos
+
+Um POST /candidatos/ sem `transcricao` ou `Perfil` grava o candidato com
+status_processamento="pendente" e coloca o id em uma fila em memória,
+consumida por PIPELINE_WORKERS tarefas asyncio no mesmo event loop da
+aplicação. Para cada candidato:
+
+- a transcrição (I/O: chamada a um serviço externo) é aguardada no próprio loop;
+- o perfil (CPU) roda em um ProcessPoolExecutor com PIPELINE_PROCESSOS processos;
+- o resultado volta para o banco por crud.concluir_processamento, com o status
+  "concluido", sem desfazer um PUT feito enquanto o candidato era processado.
+
+Falhas são repetidas até PIPELINE_TENTATIVAS vezes, com espera exponencial
+(PIPELINE_ESPERA, 2x, 4x...); depois disso o status fica "erro". Com a fila
+no limite (PIPELINE_FILA_MAX candidatos aguardando) o POST responde 503 com
+Retry-After, antes de gravar qualquer coisa.
+
+Cada worker reserva o candidato com um UPDATE condicional (pendente ->
+processando) antes de processá-lo, então vários processos da aplicação podem
+enfileirar o mesmo id sem processá-lo duas vezes. Ao subir, voltam para a
+fila os pendentes e os que estão em "processando" há mais de
+PIPELINE_RESERVA_S segundos (o processo que os pegou parou); os que outro
+processo vivo está processando ficam com ele.
+
+O processador é plugável (`configurar_pipeline(Pipeline(processador=...))`);
+ProcessadorOffline não depende de nenhum serviço e é o usado nos testes.
+"""
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from . import crud, database, matching, schemas
+
+PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", "4"))          # Candidatos processados ao mesmo tempo
+PIPELINE_PROCESSOS = int(os.getenv("PIPELINE_PROCESSOS", "2"))      # Processos das etapas de CPU (0 = threadpool)
+PIPELINE_FILA_MAX = int(os.getenv("PIPELINE_FILA_MAX", "1000"))     # Acima disso POST /candidatos/ responde 503
+PIPELINE_TENTATIVAS = int(os.getenv("PIPELINE_TENTATIVAS", "3"))    # Tentativas antes do status "erro"
+PIPELINE_ESPERA = float(os.getenv("PIPELINE_ESPERA", "1"))          # Espera (s) antes da 2ª tentativa; dobra a cada falha
+PIPELINE_RESERVA_S = float(os.getenv("PIPELINE_RESERVA_S", "600"))  # Após isso em "processando", outro worker pode retomar
+
+PENDENTE, PROCESSANDO, CONCLUIDO, ERRO = "pendente", "processando", "concluido", "erro"
+
+logger = logging.getLogger("hireai.processamento")
+
+
+class FilaCheia(Exception):
+    """Fila no limite; vale tentar de novo depois de `retry_after` segundos"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+def pendente(candidato: schemas.CandidatoCreate) -> bool:
+    """O candidato depende do pipeline (veio sem transcrição ou sem perfil)?"""
+    return candidato.transcricao is None or candidato.Perfil is None
+
+
+# ===== PROCESSADORES =====
+
+class Processador:
+    """Interface das etapas de IA
+
+    `transcrever` é I/O e roda no event loop; `gerar_perfil` é CPU e roda em
+    outro processo, então o processador precisa ser picklável.
+    """
+
+    async def transcrever(self, candidato: dict) -> str:
+        raise NotImplementedError
+
+    def gerar_perfil(self, skill: str, transcricao: str) -> str:
+        raise NotImplementedError
+
+
+class ProcessadorOffline(Processador):
+    """Sem serviços externos: transcrição de marcação e perfil com os termos mais frequentes"""
+
+    async def transcrever(self, candidato: dict) -> str:
+        origem = candidato["video_digest"] or candidato["video_url"] or f"candidato {candidato['id']}"
+        return f"[transcrição offline de {origem}]"
+
+    def gerar_perfil(self, skill: str, transcricao: str) -> str:
+        termos = Counter(matching.tokens(f"{skill} {transcricao}"))
+        principais = ", ".join(termo for termo, _ in termos.most_common(8))
+        return f"Skills: {skill}. Termos frequentes: {principais or '-'}."
+
+
+# ===== PIPELINE =====
+
+class Pipeline:
+    """Fila limitada + workers asyncio + pool de processos, ligados ao loop em que forem usados"""
+
+    def __init__(self, processador: Optional[Processador] = None, sessoes: Optional[Callable[[], Session]] = None,
+                 workers: int = PIPELINE_WORKERS, processos: int = PIPELINE_PROCESSOS,
+                 fila_max: int = PIPELINE_FILA_MAX, tentativas: int = PIPELINE_TENTATIVAS,
+                 espera: float = PIPELINE_ESPERA, reserva_s: float = PIPELINE_RESERVA_S):
+        self.processador = processador or ProcessadorOffline()
+        self.sessoes = sessoes  # None = database.SessionLocal
+        self.workers = workers
+        self.processos = processos
+        self.fila_max = fila_max
+        self.tentativas = tentativas
+        self.espera = espera
+        self.reserva_s = reserva_s
+        self._reservas = {}          # candidato_id -> processamento_inicio da reserva deste worker
+        self.aguardando = 0          # na fila, esperando nova tentativa ou em processamento
+        self._duracao_media = 1.0    # média móvel (s) por candidato, para o Retry-After
+        self._loop = None
+        self._fila: Optional[asyncio.Queue] = None
+        self._tarefas = []
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _sessao(self) -> Session:
+        if self.sessoes is None:
+            database.get_engine()
+            return database.SessionLocal()
+        return self.sessoes()
+
+    def _garantir_iniciado(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._fila = asyncio.Queue()
+        self.aguardando = 0
+        self._tarefas = [loop.create_task(self._trabalhador()) for _ in range(self.workers)]
+
+    async def iniciar(self):
+        """Sobe os workers no loop atual e devolve à fila o que ficou pendente no banco"""
+        self._garantir_iniciado()
+        try:
+            ids = await run_in_threadpool(self._pendentes_no_banco)
+        except Exception:
+            logger.exception("não foi possível retomar os candidatos pendentes")
+            return
+        for candidato_id in ids:
+            self.enfileirar(candidato_id)
+
+    async def parar(self):
+        for tarefa in self._tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*self._tarefas, return_exceptions=True)
+        self._tarefas, self._loop = [], None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def admitir(self):
+        """Levanta FilaCheia se não couber mais um candidato (chamado antes de gravá-lo)
+
+        Admissão e enfileiramento são passos separados, então requisições
+        simultâneas podem passar do limite em no máximo o tamanho do threadpool.
+        """
+        if self.aguardando >= self.fila_max:
+            raise FilaCheia(max(1, math.ceil(self.aguardando * self._duracao_media / self.workers)))
+
+    def enfileirar(self, candidato_id: int):
+        """Coloca o candidato na fila; precisa ser chamado no event loop (de uma thread: anyio.from_thread)"""
+        self._garantir_iniciado()
+        self.aguardando += 1
+        self._fila.put_nowait((candidato_id, 1))
+
+    async def aguardar(self):
+        """Espera a fila esvaziar (testes e teste de carga)"""
+        while self.aguardando:
+            await asyncio.sleep(0.01)
+
+    async def _trabalhador(self):
+        while True:
+            candidato_id, tentativa = await self._fila.get()
+            inicio = time.perf_counter()
+            try:
+                await self._processar(candidato_id)
+            except Exception as exc:
+                if tentativa < self.tentativas:
+                    logger.warning("candidato %s: tentativa %s falhou (%s)", candidato_id, tentativa, exc)
+                    await self._registrar_falha(candidato_id, PENDENTE, exc, self._reservas.pop(candidato_id, None))
+                    self._loop.call_later(self.espera * 2 ** (tentativa - 1), self._fila.put_nowait,
+                                          (candidato_id, tentativa + 1))
+                    continue
+                logger.exception("candidato %s: processamento falhou após %s tentativas", candidato_id, tentativa)
+                await self._registrar_falha(candidato_id, ERRO, exc, self._reservas.pop(candidato_id, None))
+            self.aguardando -= 1
+            self._duracao_media = 0.9 * self._duracao_media + 0.1 * (time.perf_counter() - inicio)
+
+    async def _registrar_falha(self, candidato_id: int, status: str, exc: Exception, reserva):
+        try:
+            await run_in_threadpool(self._gravar_status, candidato_id, reserva, status, str(exc))
+        except Exception:
+            logger.exception("candidato %s: não foi possível gravar o status %s", candidato_id, status)
+
+    async def _processar(self, candidato_id: int):
+        lido = await run_in_threadpool(self._iniciar, candidato_id)
+        if lido is None:
+            return  # apagado enquanto esperava na fila, ou já reservado por outro worker
+        self._reservas[candidato_id] = lido.processamento_inicio
+        transcricao = lido.transcricao or await self.processador.transcrever(lido._asdict())
+        perfil = lido.Perfil or await self._em_processo(self.processador.gerar_perfil, lido.skill, transcricao)
+        if await run_in_threadpool(self._concluir, lido, transcricao, perfil) is None:
+            logger.warning("candidato %s: reserva vencida e retomada por outro worker; resultado descartado",
+                           candidato_id)
+        self._reservas.pop(candidato_id, None)
+
+    async def _em_processo(self, funcao, *args):
+        if self.processos <= 0:
+            return await run_in_threadpool(funcao, *args)
+        if self._executor is None:
+            # spawn: os processos não herdam threads, conexões nem o event loop do processo pai
+            self._executor = ProcessPoolExecutor(self.processos, mp_context=multiprocessing.get_context("spawn"))
+        return await self._loop.run_in_executor(self._executor, funcao, *args)
+
+    # ===== ACESSO AO BANCO (threadpool) =====
+
+    def _pendentes_no_banco(self):
+        with self._sessao() as db:
+            return crud.get_candidatos_pendentes(db, self.reserva_s)
+
+    def _iniciar(self, candidato_id: int):
+        with self._sessao() as db:
+            return crud.reservar_candidato(db, candidato_id, self.reserva_s)
+
+    def _concluir(self, lido, transcricao: str, perfil: str):
+        with self._sessao() as db:
+            return crud.concluir_processamento(db, lido, transcricao, perfil)
+
+    def _gravar_status(self, candidato_id: int, reserva, status: str, erro: Optional[str]):
+        with self._sessao() as db:
+            crud.set_status_processamento(db, candidato_id, reserva, status, erro[:500])
+
+
+pipeline = Pipeline()
+
+
+def configurar_pipeline(novo: Pipeline):
+    """Troca o pipeline em uso (ex.: sessões do banco de teste)"""
+    global pipeline
+    pipeline = novo
@@ -0,0 +1,178 @@
+"""Log de queries lentas com EXPLAIN automático (opcional)
+
+Com DB_SLOW_QUERY_MS definido, todo statement que passar do limite é
+registrado no logger `hireai.slow_query` com o SQL, os parâmetros (valores
+texto mascarados, pois carregam nome, e-mail, telefone e transcrição) e a
+rota de origem. Os statements são agrupados por impressão digital: o SQL
+sem literais, placeholders e listas de IN/VALUES. Na primeira vez que uma
+forma aparece, o plano é capturado (`EXPLAIN QUERY PLAN` no SQLite,
+`EXPLAIN` sem ANALYZE no PostgreSQL, então nada é reexecutado) por um
+cursor DBAPI separado, que não passa pelos eventos do engine.
+
+O agregado por forma fica em GET /diagnostico/queries-lentas.
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event
+
+from . import metrics
+
+logger = logging.getLogger("hireai.slow_query")
+
+# Limite em ms; sem a variável o profiler fica desligado ("0" registra todos os statements)
+_limite = os.getenv("DB_SLOW_QUERY_MS")
+DB_SLOW_QUERY_MS: Optional[float] = float(_limite) if _limite else None
+
+# Formas distintas guardadas; depois disso novas formas só vão para o log, sem plano
+MAX_FORMAS = 500
+
+_EXPLICAVEIS = ("select", "insert", "update", "delete", "with")
+
+_NORMALIZACOES = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),                            # literais de texto
+    (re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+"), "?"),                    # placeholders dos drivers
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),                          # literais numéricos
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?+)"),             # IN (...) e linhas de VALUES
+    (re.compile(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+"), "(?+), ..."),       # VALUES com várias linhas
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalizar(sql: str) -> str:
+    """Forma do statement: sem valores, com listas colapsadas e espaços únicos"""
+    for padrao, troca in _NORMALIZACOES:
+        sql = padrao.sub(troca, sql)
+    return sql.strip()
+
+
+def impressao_digital(sql: str) -> str:
+    return hashlib.blake2b(normalizar(sql).encode(), digest_size=8).hexdigest()
+
+
+def mascarar(parametros):
+    """Mantém números, datas e nulos; troca textos e binários pelo tamanho"""
+    if isinstance(parametros, dict):
+        return {chave: mascarar(valor) for chave, valor in parametros.items()}
+    if isinstance(parametros, (list, tuple)):
+        return [mascarar(valor) for valor in parametros]
+    if isinstance(parametros, (str, bytes, bytearray, memoryview)):
+        return f"<{len(parametros)} {'chars' if isinstance(parametros, str) else 'bytes'}>"
+    return parametros
+
+
+class _Forma:
+    __slots__ = ("sql", "ocorrencias", "tempo_total", "tempo_max", "plano", "rotas")
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.ocorrencias = 0
+        self.tempo_total = 0.0
+        self.tempo_max = 0.0
+        self.plano = None
+        self.rotas = set()
+
+
+class Profiler:
+    """Registra statements acima de `limite_ms` no engine em que for instalado"""
+
+    def __init__(self, limite_ms: float):
+        self.limite = limite_ms / 1000
+        self.formas: Dict[str, _Forma] = {}
+        self._lock = threading.Lock()
+
+    def instalar(self, engine):
+        engine = getattr(engine, "sync_engine", engine)
+        event.listen(engine, "before_cursor_execute", self._antes)
+        event.listen(engine, "after_cursor_execute", self._depois)
+        return engine
+
+    def _antes(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info["_profiler_inicio"] = time.perf_counter()
+
+    def _depois(self, conn, cursor, statement, parameters, context, executemany):
+        duracao = time.perf_counter() - conn.info["_profiler_inicio"]
+        if duracao >= self.limite:
+            self.registrar(conn, statement, parameters[0] if executemany and parameters else parameters, duracao)
+
+    def registrar(self, conn, statement: str, parametros, duracao: float):
+        chave = impressao_digital(statement)
+        rota = metrics.rota_atual() or "-"
+        with self._lock:
+            forma = self.formas.get(chave)
+            # Com o limite atingido a forma nova só vai para o log, sem EXPLAIN
+            nova = forma is None and len(self.formas) < MAX_FORMAS
+            if nova:
+                forma = self.formas[chave] = _Forma(normalizar(statement))
+            if forma is not None:
+                forma.ocorrencias += 1
+                forma.tempo_total += duracao
+                forma.tempo_max = max(forma.tempo_max, duracao)
+                forma.rotas.add(rota)
+        plano = explicar(conn, statement, parametros) if nova else None
+        if plano is not None:
+            forma.plano = plano
+        logger.warning(
+            "query lenta %.1f ms [%s] rota=%s sql=%s params=%s%s",
+            duracao * 1000, chave, rota, " ".join(statement.split()), mascarar(parametros),
+            f"\nplano:\n{plano}" if plano else "",
+        )
+
+    def relatorio(self) -> list:
+        """Formas registradas, da que mais consumiu tempo para a que menos consumiu"""
+        with self._lock:
+            formas = sorted(self.formas.items(), key=lambda item: item[1].tempo_total, reverse=True)
+            return [{
+                "fingerprint": chave,
+                "sql": forma.sql,
+                "ocorrencias": forma.ocorrencias,
+                "tempo_total_ms": round(forma.tempo_total * 1000, 3),
+                "tempo_max_ms": round(forma.tempo_max * 1000, 3),
+                "rotas": sorted(forma.rotas),
+                "plano": forma.plano,
+            } for chave, forma in formas]
+
+
+def explicar(conn, statement: str, parametros) -> Optional[str]:
+    """Plano do statement por um cursor DBAPI próprio; None se não der para explicar"""
+    if not statement.lstrip().lower().startswith(_EXPLICAVEIS):
+        return None
+    dialeto = conn.dialect.name
+    if dialeto == "sqlite":
+        prefixo = "EXPLAIN QUERY PLAN "
+    elif dialeto == "postgresql":
+        prefixo = "EXPLAIN "
+    else:
+        return None
+    # Tudo em um único try: nem o SAVEPOINT, nem o EXPLAIN, nem o ROLLBACK TO podem mudar
+    # o desfecho da requisição; qualquer erro só é logado e o plano fica de fora
+    try:
+        cursor = conn.connection.cursor()
+        try:
+            # No PostgreSQL um erro abortaria a transação da requisição; o savepoint isola o EXPLAIN
+            if dialeto == "postgresql":
+                cursor.execute("SAVEPOINT hireai_explain")
+            try:
+                cursor.execute(prefixo + statement, parametros or ())
+                linhas = cursor.fetchall()
+            finally:
+                if dialeto == "postgresql":
+                    cursor.execute("ROLLBACK TO SAVEPOINT hireai_explain")
+                    cursor.execute("RELEASE SAVEPOINT hireai_explain")
+        finally:
+            cursor.close()
+    except Exception:
+        logger.debug("EXPLAIN falhou para %s", statement, exc_info=True)
+        return None
+    if dialeto == "sqlite":
+        # (id, parent, notused, detail)
+        return "\n".join(linha[-1] for linha in linhas)
+    return "\n".join(linha[0] for linha in linhas)
+
+
+profiler: Optional[Profiler] = Profiler(DB_SLOW_QUERY_MS) if DB_SLOW_QUERY_MS is not None else None
@@ -0,0 +1,61 @@
+"""Projeções leves para as listagens de candidatos
+
+As listagens carregam só as colunas pedidas (`load_only`) e serializam só
+esses campos. Sem `fields=` é usado o resumo (schemas.CandidatoResumo); as
+colunas Text pesadas (video, transcricao, Perfil, skill) só são lidas
+quando pedidas explicitamente ou no detalhe GET /candidatos/{id}.
+"""
+from typing import Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.orm import load_only
+
+from . import models, schemas
+
+CAMPOS_CANDIDATO = tuple(schemas.CandidatoParcial.model_fields)
+CAMPOS_RESUMO = tuple(schemas.CandidatoResumo.model_fields)
+CAMPOS_VAGA = tuple(schemas.Vaga.model_fields)
+
+
+def ler_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """Converte `fields=a,b` na tupla de campos, sempre incluindo o id"""
+    if fields is None:
+        return CAMPOS_RESUMO
+    campos = [campo.strip() for campo in fields.split(",") if campo.strip()]
+    invalidos = sorted(set(campos) - set(CAMPOS_CANDIDATO))
+    if invalidos:
+        raise HTTPException(status_code=400, detail=f"Campos inválidos: {', '.join(invalidos)}")
+    return ("id",) + tuple(dict.fromkeys(c for c in campos if c != "id"))
+
+
+def opcao_load_only(campos: Iterable[str]):
+    """Opção de query que carrega apenas as colunas informadas"""
+    return load_only(*(getattr(models.Candidato, campo) for campo in campos))
+
+
+def projetar(candidatos, campos: Tuple[str, ...]) -> List[dict]:
+    """Monta dicionários só com os campos pedidos (sem disparar lazy load dos demais)"""
+    return [{campo: getattr(candidato, campo) for campo in campos} for candidato in candidatos]
+
+
+def vagas_resposta(vagas, candidatos_por_vaga: Optional[dict] = None) -> List[dict]:
+    """Dicionários de resposta das vagas, sem tocar no relacionamento `candidatos`
+
+    Com `candidatos_por_vaga` (de crud.get_candidatos_de_vagas) cada vaga
+    leva a sua lista de candidatos; sem ele a chave fica de fora e o campo
+    some da resposta (exclude_unset).
+    """
+    itens = [{campo: getattr(vaga, campo) for campo in CAMPOS_VAGA} for vaga in vagas]
+    if candidatos_por_vaga is not None:
+        for item in itens:
+            item["candidatos"] = candidatos_por_vaga.get(item["id"], [])
+    return itens
+
+
+def ler_include(include: Optional[str]) -> bool:
+    """Valida `include=`; devolve se os candidatos devem ser incluídos"""
+    if include is None:
+        return False
+    if include != "candidatos":
+        raise HTTPException(status_code=400, detail="include aceita apenas 'candidatos'")
+    return True
@@ -0,0 +1,198 @@
+"""Rotas `async def` usadas quando DATABASE_ASYNC=1
+
+Espelham as rotas de CRUD de main.py com AsyncSession. `instalar()` troca
+cada rota síncrona pela versão assíncrona de mesmo caminho e método, na
+mesma posição, de modo que a ordem de resolução das rotas não muda.
+"""
+from typing import List, Optional, Union
+
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import admissao, cache, carregador, crud_async, pagination, processamento, projection, schemas, serializacao
+from .database import get_async_db
+
+router = APIRouter()
+
+@router.post("/vagas/", response_model=schemas.Vaga, status_code=201)
+async def create_vaga(vaga: schemas.VagaCreate, db: AsyncSession = Depends(get_async_db)):
+    """Criar uma nova vaga"""
+    return await crud_async.create_vaga(db=db, vaga=vaga)
+
+@router.get("/vagas/", response_model=Union[List[schemas.VagaComCandidatos], schemas.PaginaVagas],
+            response_model_exclude_unset=True)
+async def read_vagas(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=100),
+                     cursor: Optional[str] = None, include: Optional[str] = None,
+                     candidatos_limit: int = Query(20, ge=1, le=100), ids: Optional[str] = None,
+                     db: AsyncSession = Depends(get_async_db)):
+    """Listar todas as vagas
+
+    Informando `cursor` (vazio na primeira página) a resposta passa a ser
+    `{items, next_cursor}` e a paginação é feita por keyset em vez de offset.
+    Com `include=candidatos` cada vaga traz até `candidatos_limit` candidatos,
+    carregados em uma única query extra para a página inteira.
+    `ids=1,2,3` traz só essas vagas (na ordem pedida) em uma única query.
+    """
+    incluir = projection.ler_include(include)
+    if ids is not None:
+        vagas, next_cursor = await crud_async.get_vagas_por_ids(db, carregador.ler_ids(ids)), None
+        cursor = None  # lista simples, como na paginação por offset
+    elif cursor is None:
+        vagas, next_cursor = await crud_async.get_vagas(db, skip=skip, limit=limit), None
+    else:
+        vagas = await crud_async.get_vagas(db, limit=limit + 1, apos_id=pagination.ler_cursor(cursor))
+        vagas, next_cursor = pagination.fatiar_pagina(vagas, limit)
+    candidatos = await crud_async.get_candidatos_de_vagas(db, [v.id for v in vagas], candidatos_limit) if incluir else None
+    items = projection.vagas_resposta(vagas, candidatos)
+    if cursor is None:
+        return serializacao.resposta_json(List[schemas.VagaComCandidatos], items, exclude_unset=True)
+    return serializacao.resposta_json(schemas.PaginaVagas, {"items": items, "next_cursor": next_cursor},
+                                      exclude_unset=True)
+
+@router.get("/vagas/publico/{slug}", response_model=schemas.Vaga, dependencies=[Depends(admissao.admitir_publico)])
+async def read_vaga_publica(slug: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Buscar uma vaga por SLUG (acesso público, com cache e ETag)"""
+    entrada = cache.ler_vaga_publica(slug)
+    if entrada is None:
+        geracao = cache.geracao_vaga(slug)
+        vaga = await crud_async.get_vaga_por_slug(db, slug=slug)
+        if not vaga:
+            raise HTTPException(status_code=404, detail="Vaga não encontrada")
+        entrada = cache.guardar_vaga_publica(vaga, geracao)
+    return cache.responder_vaga_publica(entrada, request)
+
+@router.get("/teste-conexao")
+async def teste_conexao(db: AsyncSession = Depends(get_async_db)):
+    try:
+        await db.execute(text("SELECT 1"))
+        return {"status": "Conexão com o banco funcionando"}
+    except Exception as e:
+        return {"erro": str(e)}
+
+@router.get("/vagas/{vaga_id}", response_model=schemas.VagaComCandidatos, response_model_exclude_unset=True)
+async def read_vaga(vaga_id: int, include: Optional[str] = None, candidatos_limit: int = Query(20, ge=1, le=100),
+                    db: AsyncSession = Depends(get_async_db)):
+    """Buscar uma vaga específica por ID (`include=candidatos` traz até `candidatos_limit` candidatos)"""
+    incluir = projection.ler_include(include)
+    db_vaga = await crud_async.get_vaga(db, vaga_id=vaga_id)
+    if db_vaga is None:
+        raise HTTPException(status_code=404, detail="Vaga não encontrada")
+    candidatos = await crud_async.get_candidatos_de_vagas(db, [vaga_id], candidatos_limit) if incluir else None
+    return serializacao.resposta_json(schemas.VagaComCandidatos, projection.vagas_resposta([db_vaga], candidatos)[0],
+                                      exclude_unset=True)
+
+@router.put("/vagas/{vaga_id}", response_model=schemas.Vaga)
+async def update_vaga(vaga_id: int, vaga: schemas.VagaUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Atualizar uma vaga existente"""
+    db_vaga = await crud_async.update_vaga(db, vaga_id=vaga_id, vaga=vaga)
+    if db_vaga is None:
+        raise HTTPException(status_code=404, detail="Vaga não encontrada")
+    return db_vaga
+
+@router.delete("/vagas/{vaga_id}")
+async def delete_vaga(vaga_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Deletar uma vaga"""
+    success = await crud_async.delete_vaga(db, vaga_id=vaga_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Vaga não encontrada")
+    return {"message": "Vaga deletada com sucesso"}
+
+# ===== ROTAS PARA CANDIDATOS =====
+
+@router.post("/candidatos/", response_model=schemas.Candidato, status_code=201)
+async def create_candidato(candidato: schemas.CandidatoCreate, response: Response,
+                           db: AsyncSession = Depends(get_async_db)):
+    """Criar um novo candidato (sem `transcricao` ou `Perfil`, processado em segundo plano; repetido: 200)"""
+    pendente = processamento.pendente(candidato)
+    if pendente:
+        processamento.pipeline.admitir()
+    db_candidato, criado = await crud_async.criar_ou_obter_candidato(db, candidato)
+    if not criado:
+        response.status_code = 200
+    elif pendente:
+        processamento.pipeline.enfileirar(db_candidato.id)
+    return db_candidato
+
+@router.get("/candidatos/", response_model=Union[List[schemas.CandidatoParcial], schemas.PaginaCandidatos],
+            response_model_exclude_unset=True)
+async def read_candidatos(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=100),
+                          cursor: Optional[str] = None, fields: Optional[str] = None,
+                          ids: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    """Listar todos os candidatos (resumo; aceita `cursor` e `fields`; `ids=` traz os registros completos)"""
+    if ids is not None:
+        campos = projection.ler_fields(fields) if fields is not None else projection.CAMPOS_CANDIDATO
+        candidatos = await crud_async.get_candidatos_por_ids(db, carregador.ler_ids(ids), campos)
+        return serializacao.resposta_json(List[schemas.CandidatoParcial], projection.projetar(candidatos, campos),
+                                          exclude_unset=True)
+    campos = projection.ler_fields(fields)
+    if cursor is None:
+        candidatos = await crud_async.get_candidatos(db, skip=skip, limit=limit, campos=campos)
+        return serializacao.resposta_json(List[schemas.CandidatoParcial], projection.projetar(candidatos, campos),
+                                          exclude_unset=True)
+    candidatos = await crud_async.get_candidatos(db, limit=limit + 1, apos_id=pagination.ler_cursor(cursor),
+                                                 campos=campos)
+    items, next_cursor = pagination.fatiar_pagina(candidatos, limit)
+    return serializacao.resposta_json(schemas.PaginaCandidatos,
+                                      {"items": projection.projetar(items, campos), "next_cursor": next_cursor},
+                                      exclude_unset=True)
+
+@router.get("/candidatos/{candidato_id}", response_model=schemas.Candidato)
+async def read_candidato(candidato_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Buscar um candidato específico por ID (buscas simultâneas viram uma query só)"""
+    db_candidato = await carregador.candidatos_async.carregar(db, candidato_id)
+    if db_candidato is None:
+        raise HTTPException(status_code=404, detail="Candidato não encontrado")
+    return db_candidato
+
+@router.put("/candidatos/{candidato_id}", response_model=schemas.Candidato)
+async def update_candidato(candidato_id: int, candidato: schemas.CandidatoUpdate,
+                           db: AsyncSession = Depends(get_async_db)):
+    """Atualizar um candidato existente"""
+    db_candidato = await crud_async.update_candidato(db, candidato_id=candidato_id, candidato=candidato)
+    if db_candidato is None:
+        raise HTTPException(status_code=404, detail="Candidato não encontrado")
+    return db_candidato
+
+@router.delete("/candidatos/{candidato_id}")
+async def delete_candidato(candidato_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Deletar um candidato"""
+    success = await crud_async.delete_candidato(db, candidato_id=candidato_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Candidato não encontrado")
+    return {"message": "Candidato deletado com sucesso"}
+
+@router.get("/vagas/{vaga_id}/candidatos/",
+            response_model=Union[List[schemas.CandidatoParcial], schemas.PaginaCandidatos],
+            response_model_exclude_unset=True)
+async def read_candidatos_por_vaga(vaga_id: int, skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=100),
+                                   cursor: Optional[str] = None, fields: Optional[str] = None,
+                                   db: AsyncSession = Depends(get_async_db)):
+    """Listar candidatos de uma vaga específica (resumo; aceita `cursor` e `fields`)"""
+    campos = projection.ler_fields(fields)
+    if cursor is None:
+        candidatos = await crud_async.get_candidatos_por_vaga(db, vaga_id=vaga_id, skip=skip, limit=limit,
+                                                              campos=campos)
+        return serializacao.resposta_json(List[schemas.CandidatoParcial], projection.projetar(candidatos, campos),
+                                          exclude_unset=True)
+    candidatos = await crud_async.get_candidatos_por_vaga(db, vaga_id=vaga_id, limit=limit + 1,
+                                                          apos_id=pagination.ler_cursor(cursor), campos=campos)
+    items, next_cursor = pagination.fatiar_pagina(candidatos, limit)
+    return serializacao.resposta_json(schemas.PaginaCandidatos,
+                                      {"items": projection.projetar(items, campos), "next_cursor": next_cursor},
+                                      exclude_unset=True)
+
+
+def instalar(app: FastAPI):
+    """Troca as rotas síncronas de `app` pelas assíncronas de mesmo caminho e método"""
+    # Reincluir o router com o app como provedor faz dependency_overrides valerem aqui também
+    rotas = APIRouter(dependency_overrides_provider=app, default_response_class=app.router.default_response_class)
+    rotas.include_router(router)
+    assincronas = {(rota.path, frozenset(rota.methods)): rota for rota in rotas.routes}
+    app.router.routes[:] = [
+        assincronas.pop((rota.path, frozenset(rota.methods)), rota) if isinstance(rota, APIRoute) else rota
+        for rota in app.router.routes
+    ]
+    app.router.routes.extend(assincronas.values())
+    app.openapi_schema = None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 from datetime import datetime
 from typing import Optional, List
 
@@ -13,8 +13,15 @@ class VagaBase(BaseModel):
     slug: str
 
 # Schema para criar vaga
+# Sem slug, o servidor gera um único a partir do nome (ex.: desenvolvedor-python--42)
 class VagaCreate(VagaBase):
-    pass
+    slug: Optional[str] = None
+
+def _sem_nulos(cls, valor):
+    """Campo omitido fica como está; null explícito é recusado (as colunas são NOT NULL)"""
+    if valor is None:
+        raise ValueError("não pode ser nulo")
+    return valor
 
 # Schema para atualizar vaga
 class VagaUpdate(BaseModel):
@@ -24,13 +31,24 @@ class VagaUpdate(BaseModel):
     modelo_cont: Optional[str] = None
     slug: Optional[str] = None
 
+    recusar_nulos = field_validator("*")(_sem_nulos)
+
 # Schema para resposta da vaga
 class Vaga(VagaBase):
     id: int
     created_at: datetime
+    total_candidatos: int = 0
     
     model_config = ConfigDict(from_attributes=True)
 
+# Resultado de GET /vagas/stats (lido dos contadores, sem percorrer candidatos)
+class EstatisticasVagas(BaseModel):
+    total_vagas: int
+    total_candidatos: int
+    media_candidatos_por_vaga: float
+    max_candidatos_por_vaga: int
+    vagas_sem_candidatos: int
+
 # ===== SCHEMAS PARA CANDIDATO =====
 
 # Schema base para candidato
@@ -39,15 +57,16 @@ class CandidatoBase(BaseModel):
     telefone: str
     email: str
     skill: str
-    video: str
+    video: str = ""  # legado; envie o arquivo em PUT /candidatos/{id}/video
     transcricao: str
     Perfil: str
     video_url: str
     vaga_id: int
 
-# Schema para criar candidato
+# Schema para criar candidato; sem `transcricao` ou `Perfil` o candidato vai para o pipeline (app/processamento.py)
 class CandidatoCreate(CandidatoBase):
-    pass
+    transcricao: Optional[str] = None
+    Perfil: Optional[str] = None
 
 # Schema para atualizar candidato
 class CandidatoUpdate(BaseModel):
@@ -61,13 +80,100 @@ class CandidatoUpdate(BaseModel):
     video_url: Optional[str] = None
     vaga_id: Optional[int] = None
 
+    recusar_nulos = field_validator("*")(_sem_nulos)
+
 # Schema para resposta do candidato
 class Candidato(CandidatoBase):
     id: int
     created_at: datetime
+    video_digest: Optional[str] = None
+    video_tamanho: Optional[int] = None
+    video_tipo: Optional[str] = None
+    status_processamento: Optional[str] = None
     
     model_config = ConfigDict(from_attributes=True)
 
+# Resumo do candidato usado nas listagens (sem as colunas Text pesadas)
+class CandidatoResumo(BaseModel):
+    id: int
+    created_at: datetime
+    nome_completo: str
+    email: str
+    telefone: str
+    vaga_id: int
+    status_processamento: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+# Candidato com apenas os campos pedidos em `fields=` (os demais ficam de fora da resposta)
+class CandidatoParcial(BaseModel):
+    id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    nome_completo: Optional[str] = None
+    telefone: Optional[str] = None
+    email: Optional[str] = None
+    skill: Optional[str] = None
+    video: Optional[str] = None
+    transcricao: Optional[str] = None
+    Perfil: Optional[str] = None
+    video_url: Optional[str] = None
+    vaga_id: Optional[int] = None
+    video_digest: Optional[str] = None
+    video_tamanho: Optional[int] = None
+    video_tipo: Optional[str] = None
+    status_processamento: Optional[str] = None
+
+# Candidato encontrado na busca textual, com a relevância calculada pelo banco
+class CandidatoBuscado(CandidatoResumo):
+    score: float
+
+# Página de resultados da busca textual
+class ResultadoBusca(BaseModel):
+    items: List[CandidatoBuscado]
+    next_cursor: Optional[str] = None
+
+# Candidato no ranking de uma vaga, com a aderência (cosseno) à descrição da vaga
+class CandidatoRanqueado(CandidatoResumo):
+    score: float
+
+# ===== SCHEMAS DE IMPORTAÇÃO EM LOTE =====
+
+# Candidato criado na importação, com a posição dele na entrada
+class ItemBulkCriado(BaseModel):
+    linha: int
+    id: Optional[int] = None
+
+# Linha rejeitada na importação e o motivo
+class ItemBulkErro(BaseModel):
+    linha: int
+    erros: List[str]
+
+# Resultado de POST /candidatos/bulk
+class ResultadoBulk(BaseModel):
+    total_inseridos: int = 0
+    criados: List[ItemBulkCriado] = []
+    erros: List[ItemBulkErro] = []
+
+# Resultado de PUT /candidatos/{id}/video
+class VideoArmazenado(BaseModel):
+    digest: str
+    tamanho: int
+    tipo: Optional[str] = None
+
+# Resultado de GET /candidatos/{id}/processamento
+class EstadoProcessamento(BaseModel):
+    id: int
+    status: Optional[str] = None
+    erro: Optional[str] = None
+
+# ===== SCHEMAS DE PAGINAÇÃO POR CURSOR =====
+
+
+# Página de candidatos com o cursor da próxima página (None na última)
+class PaginaCandidatos(BaseModel):
+    items: List[CandidatoParcial]
+    next_cursor: Optional[str] = None
+
 # ===== SCHEMAS COM RELACIONAMENTOS =====
 
 # Vaga com lista de candidatos
@@ -77,3 +183,8 @@ class VagaComCandidatos(Vaga):
 # Candidato com informações da vaga
 class CandidatoComVaga(Candidato):
     vaga: Vaga
+
+# Página de vagas com o cursor da próxima página (None na última); `candidatos` só com include=candidatos
+class PaginaVagas(BaseModel):
+    items: List[VagaComCandidatos]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,68 @@
+"""Busca textual em candidatos (GET /candidatos/search)
+
+Procura em skill, Perfil e transcricao usando o índice mantido pelo banco
+(ver o fim de app/models.py): FTS5 com bm25 no SQLite e tsvector + GIN com
+ts_rank no Postgres. Os resultados vêm ordenados por relevância (score
+maior primeiro, id como desempate) e paginados por keyset sobre esse par.
+"""
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .projection import CAMPOS_RESUMO
+
+_COLUNAS = ", ".join(f"c.{campo}" for campo in CAMPOS_RESUMO)
+
+_BUSCA_SQLITE = f"""
+    SELECT {_COLUNAS}, -bm25(candidato_fts) AS score
+    FROM candidato_fts JOIN candidato c ON c.id = candidato_fts.rowid
+    WHERE candidato_fts MATCH :consulta {{filtros}}
+    ORDER BY score DESC, c.id
+    LIMIT :limit
+"""
+
+_BUSCA_POSTGRES = f"""
+    SELECT {_COLUNAS}, ts_rank(c.busca, consulta) AS score
+    FROM candidato c, websearch_to_tsquery('portuguese', :consulta) consulta
+    WHERE c.busca @@ consulta {{filtros}}
+    ORDER BY score DESC, c.id
+    LIMIT :limit
+"""
+
+
+def consulta_fts5(q: str) -> str:
+    """Converte o texto livre em uma consulta FTS5 segura (termos entre aspas, todos obrigatórios)"""
+    return " ".join(f'"{termo}"' for termo in re.findall(r"\w+", q))
+
+
+def buscar(db: Session, q: str, vaga_id: Optional[int] = None, limit: int = 20,
+           apos: Optional[Tuple[float, int]] = None) -> List[dict]:
+    """Candidatos que casam com `q`, do mais relevante para o menos relevante"""
+    dialeto = db.get_bind().dialect.name
+    if dialeto == "sqlite":
+        sql, consulta, score = _BUSCA_SQLITE, consulta_fts5(q), "-bm25(candidato_fts)"
+    elif dialeto == "postgresql":
+        sql, consulta, score = _BUSCA_POSTGRES, q, "ts_rank(c.busca, consulta)"
+    else:
+        raise NotImplementedError(f"Busca textual não suportada no dialeto {dialeto}")
+    if not consulta.strip():
+        return []
+
+    filtros, parametros = [], {"consulta": consulta, "limit": limit}
+    if vaga_id is not None:
+        filtros.append("AND c.vaga_id = :vaga_id")
+        parametros["vaga_id"] = vaga_id
+    if apos is not None:
+        filtros.append(f"AND ({score} < :score OR ({score} = :score AND c.id > :apos_id))")
+        parametros["score"], parametros["apos_id"] = apos
+    linhas = db.execute(text(sql.format(filtros=" ".join(filtros))), parametros)
+    return [dict(linha._mapping) for linha in linhas]
+
+
+def reconstruir_indice(db: Session):
+    """Reindexa todos os candidatos (necessário só para dados anteriores ao índice)"""
+    if db.get_bind().dialect.name == "sqlite":
+        db.execute(text("INSERT INTO candidato_fts(candidato_fts) VALUES ('rebuild')"))
+        db.commit()
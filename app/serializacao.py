@@ -0,0 +1,40 @@
+"""Serialização rápida das respostas de listagem
+
+Nas rotas comuns o FastAPI valida o retorno contra o response_model,
+converte com jsonable_encoder e só então codifica com o json da
+biblioteca padrão. As listagens usam `resposta_json`: os dados são
+validados uma única vez por um TypeAdapter e codificados direto em bytes
+pelo pydantic-core, e a Response pronta dispensa a segunda validação.
+O response_model continua no decorator para documentar o OpenAPI.
+
+As demais rotas usam ORJSONResponse como classe padrão quando o orjson
+está instalado.
+"""
+from functools import lru_cache
+
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import TypeAdapter
+
+try:
+    import orjson  # Dependência opcional: sem ela as rotas comuns usam o json da biblioteca padrão
+except ImportError:  # pragma: no cover
+    orjson = None
+
+RespostaPadrao = ORJSONResponse if orjson is not None else JSONResponse
+
+
+@lru_cache(maxsize=None)
+def adaptador(tipo) -> TypeAdapter:
+    """TypeAdapter de `tipo`, construído uma vez por tipo"""
+    return TypeAdapter(tipo)
+
+
+def resposta_json(tipo, dados, exclude_unset: bool = False, status_code: int = 200) -> Response:
+    """Valida `dados` (dicts ou objetos ORM) contra `tipo` e devolve a Response JSON já codificada"""
+    tipo_adaptado = adaptador(tipo)
+    validado = tipo_adaptado.validate_python(dados, from_attributes=True)
+    return Response(
+        tipo_adaptado.dump_json(validado, exclude_unset=exclude_unset),
+        status_code=status_code,
+        media_type="application/json",
+    )
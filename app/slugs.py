@@ -0,0 +1,79 @@
+"""Alocação de slugs de vaga no servidor
+
+O slug é `<nome-normalizado>--<id>`, onde o id é o da própria vaga e é
+reservado no mesmo INSERT ... SELECT que grava a linha: nextval() da
+sequência no PostgreSQL e max(id) + 1 no SQLite, que serializa as
+escritas. Assim o slug é único mesmo com criações concorrentes, sem
+tentativa-e-erro contra o índice único e sem ida e volta extra ao banco.
+
+Para isso o sufixo `--<número>` é reservado aos slugs gerados: um slug do
+cliente nesse formato tomaria o slug de uma vaga futura. O nome normalizado
+nunca tem dois hífens seguidos, e `-<número>` (ex.: estagio-2025) continua
+livre para o cliente. Um PUT que reenvia o slug atual da vaga passa sempre,
+inclusive os de vagas antigas. Se ainda assim o slug calculado já existir
+(linha gravada antes da regra), a criação responde 409 em vez de 500.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import String, cast, func, insert, literal, select
+from sqlalchemy.exc import IntegrityError
+
+from . import models
+
+COLUNAS_VAGA = ("nome_vaga", "desc_vaga", "modelo_trab", "modelo_cont")
+
+_NAO_ALFANUMERICO = re.compile(r"[^a-z0-9]+")
+SEPARADOR_GERADO = "--"
+_SUFIXO_GERADO = re.compile(r"--\d+$")
+
+
+class SlugEmUso(ValueError):
+    """O slug escolhido pelo cliente já pertence a outra vaga"""
+
+
+class SlugReservado(ValueError):
+    """O slug do cliente termina em `--<número>`, formato reservado aos slugs gerados pelo servidor"""
+
+
+def validar_do_cliente(slug: str, atual: Optional[str] = None):
+    """Levanta SlugReservado se o slug cair no espaço dos gerados (`atual`: slug que a vaga já tem)"""
+    if slug != atual and _SUFIXO_GERADO.search(slug):
+        raise SlugReservado(slug)
+
+
+def conflito_de_slug(exc: IntegrityError) -> bool:
+    """A violação de integridade veio do índice único de slug (e não de outra constraint)?"""
+    mensagem = str(exc.orig).lower()
+    return "unique" in mensagem and "slug" in mensagem
+
+
+@lru_cache(maxsize=4096)
+def normalizar(nome: str) -> str:
+    """Parte legível do slug: sem acentos, minúsculas, palavras separadas por hífen
+
+    Os títulos se repetem muito ("Desenvolvedor Python"), então o resultado
+    fica em cache e a normalização unicode roda uma vez por título.
+    """
+    sem_acentos = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode()
+    return _NAO_ALFANUMERICO.sub("-", sem_acentos.lower()).strip("-") or "vaga"
+
+
+def _proximo_id(dialeto: str):
+    if dialeto == "postgresql":
+        return func.nextval(func.pg_get_serial_sequence(models.Vaga.__tablename__, "id"))
+    return func.coalesce(func.max(models.Vaga.id), 0) + 1
+
+
+def inserir_com_slug(dialeto: str, dados: dict):
+    """INSERT ... SELECT ... RETURNING que grava a vaga com o slug derivado do id"""
+    novo = select(_proximo_id(dialeto).label("id")).subquery("novo")
+    slug = literal(normalizar(dados["nome_vaga"]) + SEPARADOR_GERADO) + cast(novo.c.id, String)
+    valores = [literal(dados[coluna], models.Vaga.__table__.c[coluna].type) for coluna in COLUNAS_VAGA]
+    return (
+        insert(models.Vaga)
+        .from_select(["id", "slug", *COLUNAS_VAGA], select(novo.c.id, slug, *valores))
+        .returning(models.Vaga)
+    )
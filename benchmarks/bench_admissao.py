@@ -0,0 +1,104 @@
+"""Benchmark: latência das rotas autenticadas durante uma inundação da rota pública
+
+Uso:
+    python -m benchmarks.bench_admissao --publicas 200 --consulta-ms 50 --pool 4
+
+Um SQLite em arquivo com um pool de --pool conexões (metade reservada às
+rotas autenticadas) recebe --publicas requisições simultâneas em
+/vagas/publico/{slug}, cada uma segurando uma conexão por --consulta-ms
+(slugs distintos, sem cache). Enquanto isso, um recrutador faz GET
+/vagas/{id} em sequência. Compara a latência do recrutador e o desfecho das
+públicas sem controle de admissão e com app/admissao.py.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from collections import Counter
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import httpx
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app import admissao, crud, models
+from app.database import get_db, get_db_leitura
+from main import app
+
+async def inundar(vaga_id: int, publicas: int, recrutador: int):
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench", timeout=None) as cliente:
+        inicio_total = time.perf_counter()
+        tarefas = [asyncio.create_task(cliente.get(f"/vagas/publico/slug-{i}")) for i in range(publicas)]
+        await asyncio.sleep(0.01)
+        latencias = []
+        for _ in range(recrutador):
+            inicio = time.perf_counter()
+            await cliente.get(f"/vagas/{vaga_id}")
+            latencias.append(time.perf_counter() - inicio)
+        respostas = await asyncio.gather(*tarefas)
+        total = time.perf_counter() - inicio_total
+    return latencias, Counter(r.status_code for r in respostas), total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--publicas", type=int, default=200, help="requisições públicas simultâneas")
+    parser.add_argument("--recrutador", type=int, default=10, help="GET /vagas/{id} durante a inundação")
+    parser.add_argument("--consulta-ms", type=float, default=50, help="tempo de cada busca pública no banco")
+    parser.add_argument("--pool", type=int, default=4, help="conexões no pool (pool_size + max_overflow)")
+    args = parser.parse_args()
+
+    buscar_original = crud.get_vaga_por_slug
+
+    def busca_lenta(db, slug):
+        db.execute(text("SELECT 1"))
+        time.sleep(args.consulta_ms / 1000)
+        return buscar_original(db, slug)
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'admissao.db')}",
+                               connect_args={"check_same_thread": False},
+                               pool_size=args.pool // 2, max_overflow=args.pool - args.pool // 2, pool_timeout=300)
+        models.Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(insert(models.Vaga), [{"nome_vaga": "Vaga", "desc_vaga": "", "modelo_trab": "Remoto",
+                                                "modelo_cont": "CLT", "slug": "bench"}])
+        Sessao = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+        def override_get_db():
+            with Sessao() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = app.dependency_overrides[get_db_leitura] = override_get_db
+        crud.get_vaga_por_slug = busca_lenta
+        controle_anterior = admissao.controle
+        try:
+            for nome, controle in (
+                ("sem controle de admissão", admissao.Controle(taxa_ip=0, taxa_slug=0, concorrencia=0)),
+                ("com app/admissao.py", admissao.Controle(taxa_ip=0, taxa_slug=0,
+                                                          concorrencia=max(1, args.pool // 2))),
+            ):
+                admissao.configurar(controle)
+                resultados[nome] = asyncio.run(inundar(1, args.publicas, args.recrutador))
+        finally:
+            admissao.configurar(controle_anterior)
+            crud.get_vaga_por_slug = buscar_original
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_db_leitura, None)
+            engine.dispose()
+
+    print(f"{args.publicas} públicas de {args.consulta_ms:.0f} ms em um pool de {args.pool} conexões")
+    print(f"{'':<26} {'recrutador p50':>15} {'máx':>9} {'públicas':>22} {'duração':>9}")
+    for nome, (latencias, status, total) in resultados.items():
+        desfecho = " ".join(f"{codigo}:{quantidade}" for codigo, quantidade in sorted(status.items()))
+        print(f"{nome:<26} {statistics.median(latencias) * 1000:>12.1f} ms {max(latencias) * 1000:>6.1f} ms "
+              f"{desfecho:>22} {total:>7.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark: importação em lote x criação linha a linha
+
+Uso:
+    python -m benchmarks.bench_bulk --linhas 5000 --lote 500
+
+Compara linhas por segundo de crud.create_candidato (add/commit/refresh por
+linha) com crud.create_candidatos_bulk (um INSERT multi-linha por lote), em
+um SQLite em arquivo. Defina BENCH_DATABASE_URL para medir contra outro banco.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models, schemas
+
+
+def gerar_candidatos(vaga_id: int, total: int):
+    return [schemas.CandidatoCreate(
+        nome_completo=f"Candidato {i}", telefone="11999999999", email=f"c{i}@example.com",
+        skill="Python, SQL", video="", transcricao="texto " * 200, Perfil="perfil",
+        video_url="", vaga_id=vaga_id,
+    ) for i in range(total)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=5000)
+    parser.add_argument("--lote", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = os.getenv("BENCH_DATABASE_URL") or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(url)
+        models.Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        vaga = crud.create_vaga(db, schemas.VagaCreate(
+            nome_vaga="Vaga", desc_vaga="Descrição", modelo_trab="Remoto", modelo_cont="CLT", slug="bench-bulk"))
+        candidatos = gerar_candidatos(vaga.id, args.linhas)
+
+        inicio = time.perf_counter()
+        for candidato in candidatos:
+            crud.create_candidato(db, candidato)
+        t_unitario = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for i in range(0, len(candidatos), args.lote):
+            crud.create_candidatos_bulk(db, candidatos[i:i + args.lote])
+        t_lote = time.perf_counter() - inicio
+
+        print(f"linha a linha: {args.linhas / t_unitario:>10.0f} linhas/s")
+        print(f"em lote ({args.lote}): {args.linhas / t_lote:>10.0f} linhas/s")
+        print(f"ganho: {t_unitario / t_lote:.1f}x")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark: detalhes de candidatos abertos em paralelo, uma query por requisição vs agrupadas
+
+Uso:
+    python -m benchmarks.bench_carregador --candidatos 100000 --paralelas 50
+
+Simula o frontend que abre `--paralelas` detalhes ao mesmo tempo
+(GET /candidatos/{id} simultâneos via httpx + ASGITransport) em um SQLite em
+arquivo, e compara:
+
+- uma query por requisição (Carregador com lote_max=1, o comportamento antigo);
+- app/carregador.py agrupando as buscas de cada rodada do event loop;
+- uma única requisição GET /candidatos/?ids=... com os mesmos ids.
+
+Imprime o tempo por rodada e quantas queries chegaram ao banco.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import httpx
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app import carregador, crud, models
+from app.database import get_db, get_db_leitura
+from benchmarks.bench_contadores import _candidato
+from main import app
+
+
+async def rodada(cliente, ids, em_lote: bool):
+    if em_lote:
+        resposta = await cliente.get("/candidatos/", params={"ids": ",".join(map(str, ids))})
+        assert len(resposta.json()) == len(ids)
+        return
+    respostas = await asyncio.gather(*(cliente.get(f"/candidatos/{i}") for i in ids))
+    assert {r.status_code for r in respostas} == {200}
+
+
+async def medir(ids_por_rodada, em_lote: bool = False):
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        await rodada(cliente, ids_por_rodada[0], em_lote)  # aquecimento
+        tempos = []
+        for ids in ids_por_rodada:
+            inicio = time.perf_counter()
+            await rodada(cliente, ids, em_lote)
+            tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidatos", type=int, default=100000)
+    parser.add_argument("--paralelas", type=int, default=50, help="detalhes abertos ao mesmo tempo")
+    parser.add_argument("--rodadas", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'carregador.db')}",
+                               connect_args={"check_same_thread": False}, pool_size=40, max_overflow=40)
+        models.Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(insert(models.Vaga), [{"nome_vaga": "Vaga", "desc_vaga": "", "modelo_trab": "Remoto",
+                                                "modelo_cont": "CLT", "slug": "bench"}])
+            for inicio in range(0, args.candidatos, 20000):
+                conn.execute(insert(models.Candidato), [
+                    _candidato(i, 1) for i in range(inicio, min(inicio + 20000, args.candidatos))])
+
+        Sessao = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+        def override_get_db():
+            with Sessao() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = app.dependency_overrides[get_db_leitura] = override_get_db
+        queries = []
+        event.listen(engine, "before_cursor_execute", lambda *a: queries.append(1))
+
+        aleatorio = random.Random(42)
+        ids_por_rodada = [aleatorio.sample(range(1, args.candidatos + 1), args.paralelas) for _ in range(args.rodadas)]
+        original = carregador.candidatos
+        um_a_um = carregador.Carregador(lambda db, ids: run_in_threadpool(crud.get_candidatos_por_ids, db, ids),
+                                        lote_max=1)
+        resultados = {}
+        for nome, carregador_usado, em_lote in (
+            ("uma query por requisição", um_a_um, False),
+            ("carregador (mesma rodada)", original, False),
+            ("GET /candidatos/?ids=", original, True),
+        ):
+            carregador.candidatos = carregador_usado
+            queries.clear()
+            ms = asyncio.run(medir(ids_por_rodada, em_lote))
+            resultados[nome] = (ms, len(queries) / (args.rodadas + 1))
+        carregador.candidatos = original
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_db_leitura, None)
+        engine.dispose()
+
+    print(f"{args.paralelas} detalhes por rodada, mediana de {args.rodadas} rodadas")
+    print(f"{'':<28} {'ms/rodada':>10} {'queries/rodada':>15}")
+    for nome, (ms, por_rodada) in resultados.items():
+        print(f"{nome:<28} {ms:>10.1f} {por_rodada:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
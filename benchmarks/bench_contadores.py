@@ -0,0 +1,121 @@
+"""Benchmark: contadores mantidos (vagas.total_candidatos) vs COUNT(*) GROUP BY
+
+Uso:
+    python -m benchmarks.bench_contadores --vagas 10000 --candidatos 1000000
+
+Popula um SQLite em arquivo (ou BENCH_DATABASE_URL) com candidatos de
+textos curtos, distribuídos entre as vagas, e mede:
+
+- leitura: o COUNT(*) GROUP BY vaga_id que a listagem precisaria fazer (sem
+  e com índice em vaga_id) contra a leitura dos contadores e GET /vagas/stats;
+- escrita: o custo dos triggers em INSERTs em lote e de um em um;
+- a reconciliação completa (python -m app.contadores).
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from app import contadores, crud, migrations, models
+
+
+def _candidato(i: int, vaga_id: int) -> dict:
+    return {
+        "nome_completo": f"Candidato {i}", "telefone": "11999999999", "email": f"c{i}@bench.example.com",
+        "skill": "python sql", "video": "", "transcricao": "", "Perfil": "", "video_url": "", "vaga_id": vaga_id,
+    }
+
+
+def popular(engine, vagas: int, candidatos: int, lote: int = 20000):
+    migrations.migrar(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Vaga), [{
+            "nome_vaga": f"Vaga {i}", "desc_vaga": "", "modelo_trab": "Remoto", "modelo_cont": "CLT",
+            "slug": f"bench-{i}",
+        } for i in range(1, vagas + 1)])
+        for inicio in range(0, candidatos, lote):
+            conn.execute(insert(models.Candidato), [
+                _candidato(i, i % vagas + 1) for i in range(inicio, min(inicio + lote, candidatos))])
+
+
+def medir(funcao, repeticoes: int) -> float:
+    """Mediana em ms"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vagas", type=int, default=10000)
+    parser.add_argument("--candidatos", type=int, default=1000000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--escritas", type=int, default=20000, help="candidatos inseridos na medição de escrita")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = os.getenv("BENCH_DATABASE_URL") or f"sqlite:///{os.path.join(tmp, 'contadores.db')}"
+        engine = create_engine(url)
+        inicio = time.perf_counter()
+        popular(engine, args.vagas, args.candidatos)
+        print(f"banco populado em {time.perf_counter() - inicio:.1f} s\n")
+
+        c, v = models.Candidato, models.Vaga
+        group_by = select(c.vaga_id, func.count()).group_by(c.vaga_id)
+        with engine.connect() as conn:
+            def ler(stmt):
+                return lambda: conn.execute(stmt).all()
+
+            leituras = {"COUNT(*) GROUP BY vaga_id": medir(ler(group_by), args.repeticoes)}
+            conn.execute(text("CREATE INDEX ix_bench_vaga_id ON candidato (vaga_id)"))
+            conn.commit()
+            leituras["COUNT(*) GROUP BY (com índice)"] = medir(ler(group_by), args.repeticoes)
+            leituras["vagas.total_candidatos"] = medir(ler(select(v.id, v.total_candidatos)), args.repeticoes)
+            with Session(bind=engine) as db:
+                leituras["GET /vagas/stats (crud)"] = medir(lambda: crud.get_estatisticas_vagas(db), args.repeticoes)
+            conn.rollback()
+
+            def reconciliar():
+                with conn.begin():
+                    contadores.reconciliar(conn)
+
+            leituras["reconciliação completa"] = medir(reconciliar, args.repeticoes)
+
+        print(f"{'leitura':<34} {'mediana':>10}")
+        for nome, ms in leituras.items():
+            print(f"{nome:<34} {ms:>8.2f} ms")
+
+        # Escrita: mesmo volume com e sem os triggers de contador
+        linhas = [_candidato(args.candidatos + i, i % args.vagas + 1) for i in range(args.escritas)]
+        resultados = {}
+        for com_triggers in (True, False):
+            with engine.connect() as conn, conn.begin() as transacao:
+                if not com_triggers:
+                    for nome in ("candidato_contador_ai", "candidato_contador_ad", "candidato_contador_au"):
+                        conn.execute(text(f"DROP TRIGGER IF EXISTS {nome}"))
+                inicio = time.perf_counter()
+                conn.execute(insert(models.Candidato), linhas)
+                lote = time.perf_counter() - inicio
+                inicio = time.perf_counter()
+                for linha in linhas[:1000]:
+                    conn.execute(insert(models.Candidato), {**linha, "email": "um-a-um-" + linha["email"]})
+                um_a_um = time.perf_counter() - inicio
+                transacao.rollback()
+            resultados[com_triggers] = (lote / args.escritas * 1e6, um_a_um / 1000 * 1e6)
+        print(f"\n{'escrita':<34} {'em lote':>12} {'um a um':>12}")
+        for com_triggers, (lote, um) in resultados.items():
+            print(f"{'com triggers' if com_triggers else 'sem triggers':<34} {lote:>7.1f} µs/li {um:>7.1f} µs/li")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
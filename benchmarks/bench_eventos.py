@@ -0,0 +1,105 @@
+"""Benchmark: telas de recrutador acompanhando uma vaga, polling da listagem vs stream SSE
+
+Uso:
+    python -m benchmarks.bench_eventos --candidatos 200 --abas 20 --novos 50
+
+Uma vaga com --candidatos inscritos é acompanhada por --abas telas enquanto
+chegam --novos candidatos (POST /candidatos/ via httpx + ASGITransport, em
+um SQLite em arquivo):
+
+- polling: a cada candidato novo, cada aba refaz GET /vagas/{id}/candidatos/
+  (o melhor caso do polling, sem nenhuma requisição "vazia");
+- stream: cada aba fica em GET /vagas/{id}/candidatos/stream e recebe um
+  evento `criado` por candidato.
+
+Imprime o tempo total, as queries que chegaram ao banco e os bytes enviados
+às abas.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import httpx
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import eventos, models
+from app.database import get_db, get_db_leitura
+from benchmarks.bench_contadores import _candidato
+from main import app
+
+
+async def acompanhar(abas: int, novos: int, por_stream: bool, limite: int):
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench", timeout=None) as cliente:
+        enviados = 0
+        streams = []
+        if por_stream:
+            streams = [asyncio.create_task(cliente.get("/vagas/1/candidatos/stream")) for _ in range(abas)]
+            while eventos.barramento.estado()["assinantes"] < abas:
+                await asyncio.sleep(0.001)
+        inicio = time.perf_counter()
+        for i in range(novos):
+            await cliente.post("/candidatos/", json=_candidato(10 ** 7 + i, 1))
+            if not por_stream:
+                listagens = await asyncio.gather(*(cliente.get("/vagas/1/candidatos/", params={"limit": limite})
+                                                   for _ in range(abas)))
+                enviados += sum(len(r.content) for r in listagens)
+        if por_stream:
+            # Dá tempo de cada aba receber o último evento: encerrar descarta o que ainda está na fila
+            await asyncio.sleep(0.1)
+            eventos.barramento.encerrar_assinaturas()
+            enviados = sum(len(r.content) for r in await asyncio.gather(*streams))
+        return time.perf_counter() - inicio, enviados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidatos", type=int, default=200, help="inscritos na vaga antes de começar")
+    parser.add_argument("--abas", type=int, default=20, help="telas acompanhando a vaga")
+    parser.add_argument("--novos", type=int, default=50, help="candidatos que chegam durante a medição")
+    parser.add_argument("--limit", type=int, default=100, help="candidatos por página no polling")
+    args = parser.parse_args()
+
+    resultados = {}
+    for nome, por_stream in (("polling da listagem", False), ("stream SSE", True)):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'eventos.db')}",
+                                   connect_args={"check_same_thread": False}, pool_size=40, max_overflow=40)
+            models.Base.metadata.create_all(bind=engine)
+            with engine.begin() as conn:
+                conn.execute(insert(models.Vaga), [{"nome_vaga": "Vaga", "desc_vaga": "", "modelo_trab": "Remoto",
+                                                    "modelo_cont": "CLT", "slug": "bench"}])
+                conn.execute(insert(models.Candidato), [_candidato(i, 1) for i in range(args.candidatos)])
+            Sessao = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+            def override_get_db():
+                with Sessao() as db:
+                    yield db
+
+            app.dependency_overrides[get_db] = app.dependency_overrides[get_db_leitura] = override_get_db
+            anterior = eventos.barramento
+            eventos.configurar_barramento(eventos.Barramento(fila_max=args.novos + 1))
+            queries = []
+            event.listen(engine, "before_cursor_execute", lambda *a: queries.append(1))
+            try:
+                segundos, enviados = asyncio.run(acompanhar(args.abas, args.novos, por_stream, args.limit))
+            finally:
+                eventos.configurar_barramento(anterior)
+                app.dependency_overrides.pop(get_db, None)
+                app.dependency_overrides.pop(get_db_leitura, None)
+                engine.dispose()
+            resultados[nome] = (segundos, len(queries), enviados)
+
+    print(f"{args.abas} abas, {args.novos} candidatos novos em uma vaga com {args.candidatos}")
+    print(f"{'':<22} {'tempo':>9} {'queries':>9} {'KB enviados':>12}")
+    for nome, (segundos, queries, enviados) in resultados.items():
+        print(f"{nome:<22} {segundos:>7.2f} s {queries:>9} {enviados / 1024:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark: listagem de candidatos por vaga antes e depois de ix_candidato_vaga_criacao
+
+Uso:
+    python -m benchmarks.bench_indices --vagas 10000 --candidatos 1000000
+
+Popula um SQLite em arquivo (ou BENCH_DATABASE_URL) e mede a listagem de
+uma vaga (primeira página e página por cursor):
+
+- antes: sem o índice composto, com a consulta antiga (filtro em vaga_id,
+  ORDER BY id), que percorre a tabela pela chave primária;
+- depois: crud.get_candidatos_por_vaga com (vaga_id, created_at, id).
+
+Mede também POST /candidatos/ no crud: candidatura nova e repetida
+(ON CONFLICT DO NOTHING + busca pelo índice único).
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+from app import crud, models, projection, schemas
+from benchmarks.bench_contadores import _candidato, popular
+
+
+def listagem_antiga(db: Session, vaga_id: int, limit: int, apos_id=None):
+    """get_candidatos_por_vaga antes dos índices: filtro em vaga_id e ordem por id"""
+    c = models.Candidato
+    query = crud._query_candidatos(db, projection.CAMPOS_RESUMO).filter(c.vaga_id == vaga_id)
+    return crud._paginar(query, c.id, 0, limit, apos_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vagas", type=int, default=10000)
+    parser.add_argument("--candidatos", type=int, default=1000000)
+    parser.add_argument("--limit", type=int, default=20, help="candidatos por página")
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--escritas", type=int, default=1000, help="candidaturas criadas na medição de escrita")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = os.getenv("BENCH_DATABASE_URL") or f"sqlite:///{os.path.join(tmp, 'indices.db')}"
+        engine = create_engine(url)
+        inicio = time.perf_counter()
+        popular(engine, args.vagas, args.candidatos)
+        print(f"banco populado em {time.perf_counter() - inicio:.1f} s\n")
+
+        aleatorio = random.Random(42)
+        vagas = [aleatorio.randint(1, args.vagas) for _ in range(args.repeticoes)]
+        campos = projection.CAMPOS_RESUMO
+
+        def rodar(listar):
+            """Mediana da primeira página e da segunda (por cursor) em vagas sorteadas"""
+            primeiras, seguintes = [], []
+            for vaga_id in vagas:
+                inicio = time.perf_counter()
+                pagina = listar(vaga_id, None)
+                primeiras.append(time.perf_counter() - inicio)
+                inicio = time.perf_counter()
+                listar(vaga_id, pagina[-1].id)
+                seguintes.append(time.perf_counter() - inicio)
+            return statistics.median(primeiras) * 1000, statistics.median(seguintes) * 1000
+
+        indices = {i.name: i for i in models.Candidato.__table__.indexes}
+        resultados = {}
+        with Session(bind=engine) as db:
+            # Sem nenhum dos dois índices novos: (vaga_id, lower(email)) também serviria de índice em vaga_id
+            db.execute(text("DROP INDEX ix_candidato_vaga_criacao"))
+            db.execute(text("DROP INDEX ux_candidato_vaga_email"))
+            db.commit()
+            resultados["antes (sem índice, ORDER BY id)"] = rodar(
+                lambda vaga_id, apos: listagem_antiga(db, vaga_id, args.limit, apos))
+            resultados["(created_at, id) sem índice"] = rodar(
+                lambda vaga_id, apos: crud.get_candidatos_por_vaga(db, vaga_id, limit=args.limit, apos_id=apos,
+                                                                   campos=campos))
+            for nome in ("ix_candidato_vaga_criacao", "ux_candidato_vaga_email"):
+                indices[nome].create(db.connection())
+            db.commit()
+            resultados["depois (ix_candidato_vaga_criacao)"] = rodar(
+                lambda vaga_id, apos: crud.get_candidatos_por_vaga(db, vaga_id, limit=args.limit, apos_id=apos,
+                                                                   campos=campos))
+
+        print(f"{'listagem por vaga':<38} {'1ª página':>10} {'cursor':>10}")
+        for nome, (primeira, cursor) in resultados.items():
+            print(f"{nome:<38} {primeira:>7.2f} ms {cursor:>7.2f} ms")
+
+        # Escrita: candidatura nova (INSERT ... ON CONFLICT) e repetida (conflito + busca pelo índice único)
+        novas = [schemas.CandidatoCreate(**_candidato(args.candidatos + i, i % args.vagas + 1))
+                 for i in range(args.escritas)]
+        with Session(bind=engine, expire_on_commit=False) as db:
+            tempos = {}
+            for rotulo in ("nova", "repetida"):
+                inicio = time.perf_counter()
+                for candidato in novas:
+                    crud.criar_ou_obter_candidato(db, candidato)
+                tempos[rotulo] = (time.perf_counter() - inicio) / args.escritas * 1e6
+            total = db.scalar(select(models.Vaga.total_candidatos).where(models.Vaga.id == 1))
+        print(f"\n{'POST /candidatos/ (crud)':<38} {'µs/req':>10}")
+        for rotulo, us in tempos.items():
+            print(f"{'candidatura ' + rotulo:<38} {us:>10.1f}")
+        print(f"(vaga 1 com {total} candidatos: as repetidas não foram gravadas)")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
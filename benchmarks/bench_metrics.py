@@ -0,0 +1,143 @@
+"""Benchmark: custo do middleware de métricas e dos eventos do engine
+
+Uso:
+    python -m benchmarks.bench_metrics --requisicoes 5000
+
+Chama a pilha ASGI do app diretamente (sem servidor nem cliente HTTP,
+para o custo fixo não esconder a diferença) com GET /vagas/{vaga_id},
+uma query por requisição em um SQLite em memória. Compara as rotas sem nenhuma
+instrumentação com MetricasMiddleware + eventos before/after_cursor_execute.
+Mede também os dois custos isolados: o middleware em volta de um app ASGI
+vazio e os eventos em um `SELECT 1`.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.middleware import Middleware
+
+from app import metrics, models
+from app.database import get_db, get_db_leitura
+from main import app
+
+
+def _scope(caminho: str) -> dict:
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": caminho, "raw_path": caminho.encode(), "root_path": "",
+        "query_string": b"", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1),
+        "server": ("bench", 80), "app": app,
+    }
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def medir(asgi, total: int) -> float:
+    status = []
+
+    async def send(mensagem):
+        if mensagem["type"] == "http.response.start":
+            status.append(mensagem["status"])
+
+    inicio = time.perf_counter()
+    for _ in range(total):
+        await asgi(_scope("/vagas/1"), _receive, send)
+    decorrido = time.perf_counter() - inicio
+    assert set(status) == {200}, set(status)
+    return decorrido / total * 1e6
+
+
+async def _app_vazio(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _send_nulo(mensagem):
+    pass
+
+
+async def custo_middleware(total: int) -> float:
+    """µs acrescentados pelo middleware a uma requisição que não faz nada"""
+    instrumentado = metrics.MetricasMiddleware(_app_vazio)
+    resultados = []
+    for asgi in (_app_vazio, instrumentado):
+        inicio = time.perf_counter()
+        for _ in range(total):
+            await asgi(_scope("/"), _receive, _send_nulo)
+        resultados.append((time.perf_counter() - inicio) / total * 1e6)
+    return resultados[1] - resultados[0]
+
+
+def custo_eventos(engine, total: int) -> float:
+    """µs acrescentados pelos eventos do engine a cada statement"""
+    resultados = []
+    for instrumentar in (False, True):
+        if instrumentar:
+            metrics.instrumentar_engine(engine)
+        with engine.connect() as conn:
+            inicio = time.perf_counter()
+            for _ in range(total):
+                conn.execute(text("SELECT 1"))
+            resultados.append((time.perf_counter() - inicio) / total * 1e6)
+    engine.dispatch._clear()
+    return resultados[1] - resultados[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requisicoes", type=int, default=5000)
+    parser.add_argument("--rodadas", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Vaga), [{
+            "id": 1, "nome_vaga": "Vaga", "desc_vaga": "Descrição", "modelo_trab": "Remoto",
+            "modelo_cont": "CLT", "slug": "vaga-benchmark",
+        }])
+    SessaoBench = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        with SessaoBench() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = app.dependency_overrides[get_db_leitura] = override_get_db
+    # Mesma pilha de middlewares do app, com e sem o MetricasMiddleware
+    middlewares = app.user_middleware
+    app.user_middleware = [m for m in middlewares if m.cls is not metrics.MetricasMiddleware]
+    puro = app.build_middleware_stack()
+    app.user_middleware = [*app.user_middleware, Middleware(metrics.MetricasMiddleware)]
+    instrumentado = app.build_middleware_stack()
+    app.user_middleware = middlewares
+
+    async def rodar():
+        sem, com = [], []
+        await medir(puro, 200)
+        for _ in range(args.rodadas):
+            sem.append(await medir(puro, args.requisicoes))
+            metrics.instrumentar_engine(engine)
+            com.append(await medir(instrumentado, args.requisicoes))
+            engine.dispatch._clear()
+        return statistics.median(sem), statistics.median(com)
+
+    sem, com = asyncio.run(rodar())
+    print(f"{'sem métricas':<16} {sem:>8.1f} µs/req")
+    print(f"{'com métricas':<16} {com:>8.1f} µs/req   ({com - sem:+.1f} µs, {(com - sem) / sem:+.1%})")
+    print(f"{'middleware':<16} {asyncio.run(custo_middleware(args.requisicoes * 10)):>+8.1f} µs/req (isolado)")
+    print(f"{'eventos':<16} {custo_eventos(engine, args.requisicoes * 10):>+8.1f} µs/query (isolado)")
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_db_leitura, None)
+
+
+if __name__ == "__main__":
+    main()
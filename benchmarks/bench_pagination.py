@@ -0,0 +1,85 @@
+"""Benchmark: latência de páginas profundas, offset x cursor
+
+Uso:
+    python -m benchmarks.bench_pagination --tamanhos 10000 100000 300000
+
+Para cada tamanho de tabela, mede a última página de candidatos de uma vaga
+pelas duas estratégias. Com cursor a latência deve ficar estável enquanto a
+tabela cresce; com offset ela cresce junto com a profundidade da página.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models, pagination
+
+
+def semear(engine, total: int):
+    """Insere uma vaga e `total` candidatos"""
+    with engine.begin() as conn:
+        conn.execute(insert(models.Vaga), [{
+            "id": 1, "nome_vaga": "Vaga", "desc_vaga": "Descrição", "modelo_trab": "Remoto",
+            "modelo_cont": "CLT", "slug": "vaga-benchmark",
+        }])
+        lote = []
+        for i in range(total):
+            lote.append({
+                "nome_completo": f"Candidato {i}", "telefone": "11999999999",
+                "email": f"c{i}@example.com", "skill": "Python", "video": "",
+                "transcricao": "texto " * 20, "Perfil": "perfil", "video_url": "", "vaga_id": 1,
+            })
+            if len(lote) == 10_000:
+                conn.execute(insert(models.Candidato), lote)
+                lote = []
+        if lote:
+            conn.execute(insert(models.Candidato), lote)
+
+
+def medir(fn, repeticoes: int) -> float:
+    """Mediana do tempo de `fn` em milissegundos"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        fn()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10_000, 50_000, 200_000])
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'linhas':>10} {'offset (ms)':>12} {'cursor (ms)':>12}")
+    for total in args.tamanhos:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            models.Base.metadata.create_all(bind=engine)
+            semear(engine, total)
+            db = sessionmaker(bind=engine)()
+
+            skip = total - args.limit
+            # O cursor da última página aponta para o id anterior ao primeiro item dela
+            ultimo_id = crud.get_candidatos_por_vaga(db, 1, skip=skip - 1, limit=1)[0].id
+            cursor = pagination.codificar_cursor(ultimo_id)
+
+            t_offset = medir(lambda: crud.get_candidatos_por_vaga(db, 1, skip=skip, limit=args.limit),
+                             args.repeticoes)
+            t_cursor = medir(lambda: crud.get_candidatos_por_vaga(
+                db, 1, limit=args.limit, apos_id=pagination.decodificar_cursor(cursor)), args.repeticoes)
+            print(f"{total:>10} {t_offset:>12.2f} {t_cursor:>12.2f}")
+            db.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
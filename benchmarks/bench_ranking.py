@@ -0,0 +1,80 @@
+"""Benchmark: ranking de candidatos de uma vaga
+
+Uso:
+    python -m benchmarks.bench_ranking --candidatos 10000
+
+Semeia uma vaga com N candidatos (vetores calculados na importação em lote)
+e mede crud.get_ranking_vaga de ponta a ponta e só a parte NumPy
+(matching.ranquear). Roda inteiramente offline.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, matching, models, schemas
+
+VOCABULARIO = (
+    "python java sql spark airflow kubernetes docker aws azure react node fastapi django pandas numpy "
+    "liderança comunicação equipe projeto cliente dados análise nuvem segurança testes arquitetura "
+    "backend frontend mobile produto agilidade scrum vendas marketing financeiro logística"
+).split()
+
+
+def texto(rng: random.Random, palavras: int) -> str:
+    return " ".join(rng.choice(VOCABULARIO) for _ in range(palavras))
+
+
+def medir(fn, repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        fn()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidatos", type=int, default=10_000)
+    parser.add_argument("--palavras", type=int, default=300, help="palavras por transcrição")
+    parser.add_argument("--repeticoes", type=int, default=10)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        models.Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine, expire_on_commit=False)()
+        vaga = crud.create_vaga(db, schemas.VagaCreate(
+            nome_vaga="Engenheiro de Dados", desc_vaga="Pipelines de dados com python spark airflow e sql na aws",
+            modelo_trab="Remoto", modelo_cont="CLT", slug="bench-ranking"))
+
+        inicio = time.perf_counter()
+        for i in range(0, args.candidatos, 1000):
+            crud.create_candidatos_bulk(db, [schemas.CandidatoCreate(
+                nome_completo=f"Candidato {j}", telefone="11999999999", email=f"c{j}@example.com",
+                skill=texto(rng, 8), video="", transcricao=texto(rng, args.palavras), Perfil="perfil",
+                video_url="", vaga_id=vaga.id,
+            ) for j in range(i, min(i + 1000, args.candidatos))])
+        print(f"importação + vetorização: {time.perf_counter() - inicio:.1f}s para {args.candidatos} candidatos")
+
+        vetores = [v for (v,) in db.query(models.Candidato.vetor).filter(models.Candidato.vaga_id == vaga.id)]
+        matriz = matching.matriz_de_bytes(vetores)
+        t_numpy = medir(lambda: matching.ranquear(vaga.desc_vaga, matriz, 20), args.repeticoes)
+        t_total = medir(lambda: crud.get_ranking_vaga(db, vaga.id, limit=20), args.repeticoes)
+        print(f"matching.ranquear (NumPy):      {t_numpy:8.2f} ms")
+        print(f"crud.get_ranking_vaga (total):  {t_total:8.2f} ms")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark: serialização de GET /candidatos/, caminho antigo x resposta_json
+
+Uso:
+    python -m benchmarks.bench_serializacao --candidatos 100 --tamanho-transcricao 20000
+
+Pede a mesma página (todos os campos, transcrições grandes) por duas rotas
+idênticas exceto na serialização: a antiga, que devolve dicionários para o
+FastAPI validar contra o response_model e codificar com json, e a atual
+(`serializacao.resposta_json`). Mede também só a etapa de serialização,
+fora do ciclo HTTP, e confere que os corpos são equivalentes.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import List, Optional, Union
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi import Depends
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import crud, models, projection, schemas, serializacao
+from app.database import get_db, get_db_leitura
+from main import app
+
+_TIPO_ANTIGO = Union[List[schemas.CandidatoParcial], schemas.PaginaCandidatos]
+
+
+@app.get("/bench/candidatos-antigo", response_model=_TIPO_ANTIGO, response_model_exclude_unset=True,
+         response_class=JSONResponse, include_in_schema=False)
+def read_candidatos_antigo(limit: int = 100, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    """/candidatos/ como era antes: dicionários validados e codificados pelo FastAPI"""
+    campos = projection.ler_fields(fields)
+    return projection.projetar(crud.get_candidatos(db, limit=limit, campos=campos), campos)
+
+
+def semear(engine, total: int, tamanho: int):
+    with engine.begin() as conn:
+        conn.execute(insert(models.Vaga), [{
+            "id": 1, "nome_vaga": "Vaga", "desc_vaga": "Descrição", "modelo_trab": "Remoto",
+            "modelo_cont": "CLT", "slug": "vaga-benchmark",
+        }])
+        conn.execute(insert(models.Candidato), [{
+            "nome_completo": f"Candidato {i}", "telefone": "11999999999", "email": f"c{i}@example.com",
+            "skill": "Python, SQL", "video": "", "transcricao": ("fala do candidato " * tamanho)[:tamanho],
+            "Perfil": "perfil", "video_url": "", "vaga_id": 1,
+        } for i in range(total)])
+
+
+def cronometrar(funcao, repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidatos", type=int, default=100, help="candidatos na página (máx. 100)")
+    parser.add_argument("--tamanho-transcricao", type=int, default=20000)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    semear(engine, args.candidatos, args.tamanho_transcricao)
+    SessaoBench = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        with SessaoBench() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = app.dependency_overrides[get_db_leitura] = override_get_db
+    client = TestClient(app)
+    fields = ",".join(projection.CAMPOS_CANDIDATO)
+    params = {"limit": args.candidatos, "fields": fields}
+    antigo = client.get("/bench/candidatos-antigo", params=params)
+    atual = client.get("/candidatos/", params=params)
+    assert antigo.json() == atual.json()
+    print(f"{args.candidatos} candidatos, {len(atual.content) / 1024:.0f} KiB por resposta")
+
+    t_antigo = cronometrar(lambda: client.get("/bench/candidatos-antigo", params=params), args.repeticoes)
+    t_atual = cronometrar(lambda: client.get("/candidatos/", params=params), args.repeticoes)
+    print(f"{'HTTP antigo':<24} {t_antigo:>8.2f} ms")
+    print(f"{'HTTP resposta_json':<24} {t_atual:>8.2f} ms   ({t_antigo / t_atual:.1f}x)")
+
+    with SessaoBench() as db:
+        campos = projection.ler_fields(fields)
+        itens = projection.projetar(crud.get_candidatos(db, limit=args.candidatos, campos=campos), campos)
+    adaptador = serializacao.adaptador(List[schemas.CandidatoParcial])
+
+    def serializar_antigo():
+        validado = adaptador.validate_python(itens)
+        json.dumps(jsonable_encoder(adaptador.dump_python(validado, mode="json", exclude_unset=True)))
+
+    s_antigo = cronometrar(serializar_antigo, args.repeticoes)
+    s_atual = cronometrar(lambda: serializacao.resposta_json(List[schemas.CandidatoParcial], itens, exclude_unset=True),
+                          args.repeticoes)
+    print(f"{'só serialização antiga':<24} {s_antigo:>8.2f} ms")
+    print(f"{'só resposta_json':<24} {s_atual:>8.2f} ms   ({s_antigo / s_atual:.1f}x)")
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_db_leitura, None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark: tempo de `import main` com e sem criação de schema
+
+Uso:
+    python -m benchmarks.bench_startup --repeticoes 10
+
+Cada medição roda em um processo Python novo (como um worker do uvicorn)
+e cronometra só a importação. "import main" é o que cada worker paga
+hoje; "import main + migrar" reproduz o antigo create_all na importação,
+contra um SQLite em arquivo. Defina BENCH_DATABASE_URL para medir contra
+outro banco.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+_MEDIR = """
+import time
+inicio = time.perf_counter()
+import main
+{extra}
+print(time.perf_counter() - inicio)
+"""
+
+CENARIOS = {
+    "import main": "",
+    "import main + migrar": "from app import migrations; migrations.migrar()",
+}
+
+
+def medir(extra: str, env: dict, repeticoes: int):
+    codigo = _MEDIR.format(extra=extra)
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return [
+        float(subprocess.run([sys.executable, "-c", codigo], env=env, cwd=raiz,
+                             check=True, capture_output=True, text=True).stdout)
+        for _ in range(repeticoes)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env["DATABASE_URL"] = os.getenv("BENCH_DATABASE_URL") or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        for nome, extra in CENARIOS.items():
+            tempos = medir(extra, env, args.repeticoes)
+            print(f"{nome:<22} mediana {statistics.median(tempos) * 1000:>7.1f} ms"
+                  f"   mín {min(tempos) * 1000:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""Teste de carga reprodutível de todas as rotas de main.py
+
+Uso:
+    python -m benchmarks.loadtest --vagas 1000 --candidatos 50000 --requisicoes 200 --concorrencia 16
+    python -m benchmarks.loadtest --vagas 10000 --candidatos 1000000 --banco /tmp/carga.db
+    python -m benchmarks.loadtest --salvar-baseline benchmarks/baseline.json
+    python -m benchmarks.loadtest --baseline benchmarks/baseline.json --tolerancia 0.3
+
+Popula um SQLite em arquivo (ou BENCH_DATABASE_URL) com dados
+determinísticos: vagas, candidatos distribuídos entre elas e transcrições
+com tamanho em torno de --transcricao caracteres. Um banco já populado
+com os mesmos volumes é reaproveitado (use --banco para mantê-lo entre
+execuções). Depois dispara --requisicoes em cada rota, com --concorrencia
+requisições simultâneas, por um cliente ASGI (httpx) sobre a aplicação
+real, com middlewares, e imprime p50/p95/p99 e requisições por segundo.
+
+Com --baseline, a execução termina com código 1 se alguma rota ficar
+mais lenta (p95) ou com menos vazão que a baseline além da --tolerancia.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import httpx
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app import admissao, blobs, eventos, migrations, models, processamento
+from app.database import get_db, get_db_leitura
+from main import app
+
+VOCABULARIO = (
+    "python fastapi django flask sql postgres kubernetes docker aws azure react typescript java spring "
+    "dados pipeline airflow spark pandas testes integração contínua microsserviços filas kafka redis "
+    "liderança comunicação projeto cliente equipe experiência anos trabalhei desenvolvi implementei "
+    "melhorei performance arquitetura escalabilidade segurança observabilidade métricas produto"
+).split()
+
+
+# ===== DADOS =====
+
+def _texto(rng: random.Random, tamanho: int) -> str:
+    palavras = []
+    total = 0
+    while total < tamanho:
+        palavra = rng.choice(VOCABULARIO)
+        palavras.append(palavra)
+        total += len(palavra) + 1
+    return " ".join(palavras)
+
+
+def _vaga(i: int, rng: random.Random, prefixo: str = "carga") -> dict:
+    return {
+        "nome_vaga": f"Desenvolvedor {rng.choice(VOCABULARIO).title()} {i}",
+        "desc_vaga": _texto(rng, 600),
+        "modelo_trab": rng.choice(("Remoto", "Híbrido", "Presencial")),
+        "modelo_cont": rng.choice(("CLT", "PJ")),
+        "slug": f"{prefixo}-{i}",
+    }
+
+
+def _candidato(i: int, vaga_id: int, transcricao: str, rng: random.Random, prefixo: str = "c") -> dict:
+    return {
+        "nome_completo": f"Candidato {i}",
+        "telefone": f"11{rng.randrange(10 ** 8, 10 ** 9)}",
+        "email": f"{prefixo}{i}@carga.example.com",
+        "skill": ", ".join(rng.sample(VOCABULARIO, 4)),
+        "video": "",
+        "transcricao": transcricao,
+        "Perfil": _texto(rng, 200),
+        "video_url": f"https://videos.example.com/{i}",
+        "vaga_id": vaga_id,
+    }
+
+
+def popular(engine, vagas: int, candidatos: int, transcricao: int, semente: int, lote: int = 5000):
+    """Cria o schema e insere os volumes pedidos; reaproveita um banco já populado igual"""
+    migrations.migrar(engine)
+    with engine.connect() as conn:
+        existentes = (conn.scalar(select(func.count()).select_from(models.Vaga)),
+                      conn.scalar(select(func.count()).select_from(models.Candidato)))
+    if existentes == (vagas, candidatos):
+        return False
+    if existentes != (0, 0):
+        raise SystemExit(f"Banco já tem {existentes[0]} vagas e {existentes[1]} candidatos; use outro --banco")
+
+    rng = random.Random(semente)
+    # Transcrições sorteadas de um conjunto fixo: tamanhos realistas sem gerar gigabytes de texto aleatório
+    transcricoes = [_texto(rng, max(200, int(rng.gauss(transcricao, transcricao / 3)))) for _ in range(512)]
+    with engine.begin() as conn:
+        for inicio in range(0, vagas, lote):
+            conn.execute(insert(models.Vaga), [_vaga(i, rng) for i in range(inicio + 1, min(inicio + lote, vagas) + 1)])
+        for inicio in range(0, candidatos, lote):
+            conn.execute(insert(models.Candidato), [
+                _candidato(i, (i - 1) % vagas + 1, rng.choice(transcricoes), rng)
+                for i in range(inicio + 1, min(inicio + lote, candidatos) + 1)
+            ])
+    return True
+
+
+# ===== CENÁRIOS =====
+
+@dataclass
+class Contexto:
+    """Estado compartilhado pelos cenários: volumes e ids descartáveis para os DELETEs"""
+    vagas: int
+    candidatos: int
+    rng: random.Random
+    vagas_descartaveis: List[int] = field(default_factory=list)
+    candidatos_descartaveis: List[int] = field(default_factory=list)
+    candidatos_com_video: List[int] = field(default_factory=list)
+    sequencia: itertools.count = field(default_factory=itertools.count)
+
+    def vaga(self) -> int:
+        return self.rng.randint(1, self.vagas)
+
+    def candidato(self) -> int:
+        return self.rng.randint(1, self.candidatos)
+
+
+@dataclass
+class Cenario:
+    metodo: str
+    rota: str  # template, igual ao de main.py
+    requisicao: Callable[[Contexto], Tuple[str, dict]]
+    nome: Optional[str] = None
+
+    @property
+    def rotulo(self) -> str:
+        return self.nome or f"{self.metodo} {self.rota}"
+
+
+def _ndjson(ctx: Contexto, total: int = 50) -> bytes:
+    n = next(ctx.sequencia)
+    linhas = [_candidato(n * total + i, ctx.vaga(), _texto(ctx.rng, 500), ctx.rng, prefixo="bulk") for i in range(total)]
+    return "\n".join(json.dumps(linha) for linha in linhas).encode()
+
+
+def _ids(sortear: Callable[[], int], total: int) -> str:
+    return ",".join(str(sortear()) for _ in range(total))
+
+
+def _enviar_video(ctx: Contexto, tamanho: int = 256 * 1024) -> Tuple[str, dict]:
+    candidato_id = ctx.candidato()
+    ctx.candidatos_com_video.append(candidato_id)
+    return f"/candidatos/{candidato_id}/video", {
+        "content": ctx.rng.randbytes(tamanho), "headers": {"content-type": "video/mp4"}}
+
+
+def _retomar_stream(ctx: Contexto) -> Tuple[str, dict]:
+    """Reconexão ao feed com o Last-Event-ID do evento mais recente (escritas dos cenários anteriores)"""
+    ultimo = eventos.barramento.ultimo_id()
+    return f"/vagas/{ctx.vaga()}/candidatos/stream", {"headers": {"Last-Event-ID": ultimo} if ultimo else {}}
+
+
+CENARIOS = [
+    Cenario("GET", "/", lambda ctx: ("/", {})),
+    Cenario("POST", "/vagas/", lambda ctx: ("/vagas/", {"json": {**_vaga(0, ctx.rng), "slug": None}})),
+    Cenario("GET", "/vagas/", lambda ctx: ("/vagas/", {"params": {"skip": ctx.rng.randrange(ctx.vagas), "limit": 50}})),
+    Cenario("GET", "/vagas/", lambda ctx: ("/vagas/", {"params": {"ids": _ids(ctx.vaga, 20)}}), nome="GET /vagas/ (ids)"),
+    Cenario("GET", "/vagas/", lambda ctx: ("/vagas/", {"params": {"cursor": "", "limit": 20, "include": "candidatos"}}),
+            nome="GET /vagas/?include=candidatos"),
+    Cenario("GET", "/vagas/publico/{slug}", lambda ctx: (f"/vagas/publico/carga-{ctx.vaga()}", {})),
+    Cenario("GET", "/vagas/stats", lambda ctx: ("/vagas/stats", {})),
+    Cenario("GET", "/teste-conexao", lambda ctx: ("/teste-conexao", {})),
+    Cenario("GET", "/diagnostico/pool", lambda ctx: ("/diagnostico/pool", {})),
+    Cenario("GET", "/diagnostico/admissao", lambda ctx: ("/diagnostico/admissao", {})),
+    Cenario("GET", "/diagnostico/queries-lentas", lambda ctx: ("/diagnostico/queries-lentas", {})),
+    Cenario("GET", "/metrics", lambda ctx: ("/metrics", {})),
+    Cenario("GET", "/vagas/{vaga_id}", lambda ctx: (f"/vagas/{ctx.vaga()}", {})),
+    Cenario("PUT", "/vagas/{vaga_id}", lambda ctx: (f"/vagas/{ctx.vaga()}", {"json": {"modelo_cont": "PJ"}})),
+    Cenario("DELETE", "/vagas/{vaga_id}", lambda ctx: (f"/vagas/{ctx.vagas_descartaveis.pop()}", {})),
+    Cenario("POST", "/candidatos/", lambda ctx: ("/candidatos/", {"json": _candidato(
+        next(ctx.sequencia), ctx.vaga(), _texto(ctx.rng, 3000), ctx.rng, prefixo="novo")})),
+    Cenario("POST", "/candidatos/", lambda ctx: ("/candidatos/", {"json": {
+        **_candidato(next(ctx.sequencia), ctx.vaga(), "", ctx.rng, prefixo="pendente"), "transcricao": None,
+        "Perfil": None}}), nome="POST /candidatos/ (pipeline)"),
+    Cenario("POST", "/candidatos/bulk", lambda ctx: ("/candidatos/bulk", {
+        "content": _ndjson(ctx), "headers": {"content-type": "application/x-ndjson"}})),
+    Cenario("GET", "/candidatos/", lambda ctx: ("/candidatos/", {"params": {"cursor": "", "limit": 100}})),
+    Cenario("GET", "/candidatos/", lambda ctx: ("/candidatos/", {"params": {"ids": _ids(ctx.candidato, 20)}}),
+            nome="GET /candidatos/ (ids)"),
+    Cenario("GET", "/candidatos/search", lambda ctx: ("/candidatos/search", {
+        "params": {"q": " ".join(ctx.rng.sample(VOCABULARIO, 2)), "limit": 20}})),
+    Cenario("GET", "/candidatos/{candidato_id}", lambda ctx: (f"/candidatos/{ctx.candidato()}", {})),
+    Cenario("PUT", "/candidatos/{candidato_id}", lambda ctx: (f"/candidatos/{ctx.candidato()}", {
+        "json": {"telefone": "11900000000"}})),
+    Cenario("DELETE", "/candidatos/{candidato_id}", lambda ctx: (f"/candidatos/{ctx.candidatos_descartaveis.pop()}", {})),
+    Cenario("GET", "/candidatos/{candidato_id}/processamento", lambda ctx: (
+        f"/candidatos/{ctx.candidato()}/processamento", {})),
+    Cenario("PUT", "/candidatos/{candidato_id}/video", _enviar_video),
+    Cenario("GET", "/candidatos/{candidato_id}/video", lambda ctx: (
+        f"/candidatos/{ctx.rng.choice(ctx.candidatos_com_video)}/video", {})),
+    Cenario("GET", "/vagas/{vaga_id}/candidatos/", lambda ctx: (f"/vagas/{ctx.vaga()}/candidatos/", {
+        "params": {"cursor": "", "limit": 50}})),
+    Cenario("GET", "/vagas/{vaga_id}/candidatos/stream", _retomar_stream),
+    Cenario("GET", "/vagas/{vaga_id}/candidatos/export", lambda ctx: (f"/vagas/{ctx.vaga()}/candidatos/export", {
+        "params": {"format": "ndjson"}})),
+    Cenario("GET", "/vagas/{vaga_id}/ranking", lambda ctx: (f"/vagas/{ctx.vaga()}/ranking", {})),
+]
+
+
+def rotas_sem_cenario(aplicacao=app) -> set:
+    """Rotas da API (método, caminho) que nenhum cenário exercita"""
+    rotas = {(metodo, rota.path) for rota in aplicacao.routes if getattr(rota, "include_in_schema", False)
+             for metodo in rota.methods}
+    return rotas - {(c.metodo, c.rota) for c in CENARIOS}
+
+
+def preparar_descartaveis(engine, ctx: Contexto, total: int):
+    """Vagas e candidatos extras, que só existem para serem apagados pelos cenários de DELETE"""
+    with engine.begin() as conn:
+        ctx.vagas_descartaveis = list(conn.scalars(
+            insert(models.Vaga).returning(models.Vaga.id),
+            [_vaga(i, ctx.rng, prefixo="descartavel") for i in range(total)]))
+        ctx.candidatos_descartaveis = list(conn.scalars(
+            insert(models.Candidato).returning(models.Candidato.id),
+            [_candidato(i, ctx.vaga(), "", ctx.rng, prefixo="descartavel") for i in range(total)]))
+
+
+# ===== EXECUÇÃO =====
+
+def _percentil(ordenados: List[float], p: float) -> float:
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+async def rodar_cenario(cliente: httpx.AsyncClient, cenario: Cenario, ctx: Contexto,
+                        requisicoes: int, concorrencia: int) -> dict:
+    latencias: List[float] = []
+    erros: Dict[int, int] = {}
+    restantes = iter(range(requisicoes))
+
+    async def trabalhador():
+        for _ in restantes:
+            url, kwargs = cenario.requisicao(ctx)
+            inicio = time.perf_counter()
+            resposta = await cliente.request(cenario.metodo, url, **kwargs)
+            latencias.append(time.perf_counter() - inicio)
+            if resposta.status_code >= 400:
+                erros[resposta.status_code] = erros.get(resposta.status_code, 0) + 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabalhador() for _ in range(concorrencia)))
+    decorrido = time.perf_counter() - inicio
+    ordenadas = sorted(latencias)
+    return {
+        "p50_ms": _percentil(ordenadas, 50) * 1000,
+        "p95_ms": _percentil(ordenadas, 95) * 1000,
+        "p99_ms": _percentil(ordenadas, 99) * 1000,
+        "media_ms": statistics.fmean(ordenadas) * 1000,
+        "rps": len(ordenadas) / decorrido,
+        "erros": sum(erros.values()),
+        "status_erros": {str(status): total for status, total in erros.items()},
+    }
+
+
+async def executar(engine, ctx: Contexto, requisicoes: int, concorrencia: int, cenarios=CENARIOS) -> dict:
+    """Roda cada cenário em sequência (para os números de uma rota não contaminarem os de outra)"""
+    Sessao = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        with Sessao() as db:
+            yield db
+
+    dependencias = (get_db, get_db_leitura)
+    anteriores = {dependencia: app.dependency_overrides.get(dependencia) for dependencia in dependencias}
+    app.dependency_overrides.update(dict.fromkeys(dependencias, override_get_db))
+    store_anterior = blobs.store
+    pasta_blobs = tempfile.TemporaryDirectory()
+    blobs.configurar_store(blobs.LocalBlobStore(pasta_blobs.name))
+    pipeline_anterior = processamento.pipeline
+    processamento.configurar_pipeline(processamento.Pipeline(sessoes=Sessao))
+    # Todas as requisições saem do mesmo "IP": sem limites, a rota pública mede o custo dela, não os 429
+    controle_anterior = admissao.controle
+    admissao.configurar(admissao.Controle(taxa_ip=0, taxa_slug=0, concorrencia=0))
+    # O stream SSE entrega o que está no histórico e fecha: mede a assinatura, não o tempo conectado
+    duracao_stream = eventos.EVENTOS_DURACAO_MAX_S
+    eventos.EVENTOS_DURACAO_MAX_S = 0
+    preparar_descartaveis(engine, ctx, requisicoes + concorrencia)
+    resultados = {}
+    try:
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://carga", timeout=None) as cliente:
+            for cenario in cenarios:
+                await rodar_cenario(cliente, cenario, ctx, min(requisicoes, 5), 1)  # aquecimento
+                resultados[cenario.rotulo] = await rodar_cenario(cliente, cenario, ctx, requisicoes, concorrencia)
+        await processamento.pipeline.aguardar()
+    finally:
+        await processamento.pipeline.parar()
+        processamento.configurar_pipeline(pipeline_anterior)
+        admissao.configurar(controle_anterior)
+        eventos.EVENTOS_DURACAO_MAX_S = duracao_stream
+        blobs.configurar_store(store_anterior)
+        pasta_blobs.cleanup()
+        for dependencia, anterior in anteriores.items():
+            if anterior is None:
+                app.dependency_overrides.pop(dependencia, None)
+            else:
+                app.dependency_overrides[dependencia] = anterior
+    return resultados
+
+
+def comparar(baseline: dict, atual: dict, tolerancia: float) -> List[str]:
+    """Regressões de `atual` em relação à baseline (p95 maior ou vazão menor além da tolerância)"""
+    regressoes = []
+    for rota, base in baseline.items():
+        medido = atual.get(rota)
+        if medido is None:
+            continue
+        if medido["p95_ms"] > base["p95_ms"] * (1 + tolerancia):
+            regressoes.append(f"{rota}: p95 {base['p95_ms']:.1f} -> {medido['p95_ms']:.1f} ms")
+        if medido["rps"] < base["rps"] / (1 + tolerancia):
+            regressoes.append(f"{rota}: vazão {base['rps']:.0f} -> {medido['rps']:.0f} req/s")
+        if medido["erros"] > base.get("erros", 0):
+            regressoes.append(f"{rota}: erros {base.get('erros', 0)} -> {medido['erros']}")
+    return regressoes
+
+
+def imprimir(resultados: dict, baseline: Optional[dict] = None):
+    print(f"{'rota':<42} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>9} {'erros':>6}")
+    for rota, r in resultados.items():
+        delta = ""
+        if baseline and rota in baseline:
+            delta = f"   p95 {r['p95_ms'] / baseline[rota]['p95_ms'] - 1:+.0%}"
+        print(f"{rota:<42} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+              f"{r['rps']:>9.0f} {r['erros']:>6}{delta}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vagas", type=int, default=1000)
+    parser.add_argument("--candidatos", type=int, default=50000)
+    parser.add_argument("--transcricao", type=int, default=3000, help="tamanho médio da transcrição (caracteres)")
+    parser.add_argument("--requisicoes", type=int, default=200, help="requisições por rota")
+    parser.add_argument("--concorrencia", type=int, default=16)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--banco", help="arquivo SQLite a criar/reaproveitar (padrão: temporário)")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.25)
+    parser.add_argument("--salvar-baseline", help="grava os resultados desta execução neste JSON")
+    args = parser.parse_args(argv)
+
+    faltando = rotas_sem_cenario()
+    if faltando:
+        print(f"aviso: rotas sem cenário: {sorted(faltando)}", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = os.getenv("BENCH_DATABASE_URL") or f"sqlite:///{args.banco or os.path.join(tmp, 'carga.db')}"
+        engine = create_engine(url, connect_args={"timeout": 30} if url.startswith("sqlite") else {})
+        inicio = time.perf_counter()
+        if popular(engine, args.vagas, args.candidatos, args.transcricao, args.semente):
+            print(f"banco populado em {time.perf_counter() - inicio:.1f} s")
+        ctx = Contexto(vagas=args.vagas, candidatos=args.candidatos, rng=random.Random(args.semente))
+        resultados = asyncio.run(executar(engine, ctx, args.requisicoes, args.concorrencia))
+        engine.dispose()
+
+    parametros = {k: getattr(args, k) for k in ("vagas", "candidatos", "transcricao", "requisicoes", "concorrencia")}
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as arquivo:
+            salvo = json.load(arquivo)
+        if salvo["parametros"] != parametros:
+            print(f"aviso: baseline gerada com {salvo['parametros']}", file=sys.stderr)
+        baseline = salvo["rotas"]
+    imprimir(resultados, baseline)
+
+    if args.salvar_baseline:
+        with open(args.salvar_baseline, "w") as arquivo:
+            json.dump({"parametros": parametros, "rotas": resultados}, arquivo, indent=2, sort_keys=True)
+    if baseline is not None:
+        regressoes = comparar(baseline, resultados, args.tolerancia)
+        for regressao in regressoes:
+            print(f"REGRESSÃO {regressao}", file=sys.stderr)
+        return 1 if regressoes else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,82 @@
-from fastapi import FastAPI, Depends, HTTPException
+import os
+from contextlib import asynccontextmanager
+
+from anyio import from_thread
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional, Union
+
+from app import (
+    admissao, blobs, bulk, cache, carregador, crud, eventos, export, metrics, migrations, pagination, processamento,
+    profiler, projection, routes_async, schemas, search, serializacao, slugs,
+)
+from app.database import DATABASE_ASYNC, estado_pool, get_db, get_db_leitura
 
-from app import crud, models, schemas
-from app.database import engine, get_db
+# Criar/atualizar as tabelas ao subir a aplicação (não na importação).
+# Em produção, com vários workers, use DB_CREATE_SCHEMA=0 e rode `python -m app.migrations` no deploy.
+DB_CREATE_SCHEMA = os.getenv("DB_CREATE_SCHEMA", "1").lower() in ("1", "true", "sim")
 
-# Criar tabelas no banco de dados
-models.Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if DB_CREATE_SCHEMA:
+        await run_in_threadpool(migrations.migrar)
+    pipeline = processamento.pipeline
+    await pipeline.iniciar()
+    barramento = eventos.barramento
+    barramento.iniciar()
+    yield
+    # Fecha os streams SSE abertos, senão o servidor espera por eles para desligar
+    await run_in_threadpool(barramento.parar)
+    await pipeline.parar()
 
 # Criar aplicação FastAPI
 app = FastAPI(
     title="API CRUD de Vagas",
     description="API para gerenciar vagas de candidato com FastAPI e SQLAlchemy",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=serializacao.RespostaPadrao,
 )
 
+# 📈 Latência, status e custo de banco por rota, expostos em /metrics (METRICAS_ATIVAS=0 desliga)
+if metrics.METRICAS_ATIVAS:
+    app.add_middleware(metrics.MetricasMiddleware)
+
+@app.exception_handler(slugs.SlugEmUso)
+async def slug_em_uso(request: Request, exc: slugs.SlugEmUso):
+    """Slug informado pelo cliente já pertence a outra vaga"""
+    return JSONResponse(status_code=409, content={"detail": "Slug já está em uso"})
+
+@app.exception_handler(slugs.SlugReservado)
+async def slug_reservado(request: Request, exc: slugs.SlugReservado):
+    """Slug do cliente no formato `<texto>--<número>`, reservado aos gerados pelo servidor"""
+    return JSONResponse(status_code=422, content={"detail": "Slugs terminados em --<número> são gerados pelo servidor"})
+
+@app.exception_handler(crud.CandidaturaDuplicada)
+async def candidatura_duplicada(request: Request, exc: crud.CandidaturaDuplicada):
+    """Update levaria o candidato para um e-mail que já se inscreveu na vaga"""
+    return JSONResponse(status_code=409, content={"detail": "E-mail já inscrito nesta vaga"})
+
+@app.exception_handler(crud.VagaComCandidatos)
+async def vaga_com_candidatos(request: Request, exc: crud.VagaComCandidatos):
+    """DELETE de uma vaga que ainda tem candidatos"""
+    return JSONResponse(status_code=409, content={"detail": "A vaga ainda tem candidatos"})
+
+@app.exception_handler(processamento.FilaCheia)
+async def fila_cheia(request: Request, exc: processamento.FilaCheia):
+    """Pipeline de processamento no limite: o candidato não foi criado"""
+    return JSONResponse(status_code=503, content={"detail": "Fila de processamento cheia"},
+                        headers={"Retry-After": str(exc.retry_after)})
+
+@app.exception_handler(admissao.Rejeitada)
+async def publica_rejeitada(request: Request, exc: admissao.Rejeitada):
+    """Rota pública acima da taxa (429) ou sem vaga na concorrência (503)"""
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.motivo},
+                        headers={"Retry-After": str(exc.retry_after)})
+
 @app.get("/")
 def read_root():
     """Rota inicial para verificar se a aplicação está online"""
@@ -31,37 +93,102 @@ def create_vaga(vaga: schemas.VagaCreate, db: Session = Depends(get_db)):
     """Criar uma nova vaga"""
     return crud.create_vaga(db=db, vaga=vaga)
 
-@app.get("/vagas/", response_model=List[schemas.Vaga])
-def read_vagas(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Listar todas as vagas"""
-    vagas = crud.get_vagas(db, skip=skip, limit=limit)
-    return vagas
-
-@app.get("/vagas/publico/{slug}", response_model=schemas.Vaga)
-def read_vaga_publica(slug: str, db: Session = Depends(get_db)):
-    """Buscar uma vaga por SLUG (acesso público)"""
-    vaga = db.query(models.Vaga).filter(models.Vaga.slug == slug).first()
-    if not vaga:
-        raise HTTPException(status_code=404, detail="Vaga não encontrada")
-    return vaga
+@app.get("/vagas/", response_model=Union[List[schemas.VagaComCandidatos], schemas.PaginaVagas],
+         response_model_exclude_unset=True)
+def read_vagas(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=100),
+               cursor: Optional[str] = None, include: Optional[str] = None,
+               candidatos_limit: int = Query(20, ge=1, le=100), ids: Optional[str] = None,
+               db: Session = Depends(get_db_leitura)):
+    """Listar todas as vagas
+
+    Informando `cursor` (vazio na primeira página) a resposta passa a ser
+    `{items, next_cursor}` e a paginação é feita por keyset em vez de offset.
+    Com `include=candidatos` cada vaga traz até `candidatos_limit` candidatos,
+    carregados em uma única query extra para a página inteira.
+    `ids=1,2,3` traz só essas vagas (na ordem pedida) em uma única query.
+    """
+    incluir = projection.ler_include(include)
+    if ids is not None:
+        vagas, next_cursor = crud.get_vagas_por_ids(db, carregador.ler_ids(ids)), None
+        cursor = None  # lista simples, como na paginação por offset
+    elif cursor is None:
+        vagas, next_cursor = crud.get_vagas(db, skip=skip, limit=limit), None
+    else:
+        vagas = crud.get_vagas(db, limit=limit + 1, apos_id=pagination.ler_cursor(cursor))
+        vagas, next_cursor = pagination.fatiar_pagina(vagas, limit)
+    candidatos = crud.get_candidatos_de_vagas(db, [v.id for v in vagas], candidatos_limit) if incluir else None
+    items = projection.vagas_resposta(vagas, candidatos)
+    if cursor is None:
+        return serializacao.resposta_json(List[schemas.VagaComCandidatos], items, exclude_unset=True)
+    return serializacao.resposta_json(schemas.PaginaVagas, {"items": items, "next_cursor": next_cursor},
+                                      exclude_unset=True)
+
+@app.get("/vagas/publico/{slug}", response_model=schemas.Vaga, dependencies=[Depends(admissao.admitir_publico)])
+def read_vaga_publica(slug: str, request: Request, db: Session = Depends(get_db)):
+    """Buscar uma vaga por SLUG (acesso público)
+
+    Servida do cache (TTL de VAGA_CACHE_TTL segundos) com ETag e
+    Cache-Control; um If-None-Match com o ETag atual recebe 304.
+    Limitada por IP e por slug (429) e em concorrência (503), ver app/admissao.py.
+    Na falta do cache lê do primário, e não de uma réplica atrasada: o que é
+    lido aqui fica em cache por todo o TTL (a sessão só conecta se houver falta).
+    """
+    entrada = cache.ler_vaga_publica(slug)
+    if entrada is None:
+        geracao = cache.geracao_vaga(slug)
+        vaga = crud.get_vaga_por_slug(db, slug=slug)
+        if not vaga:
+            raise HTTPException(status_code=404, detail="Vaga não encontrada")
+        entrada = cache.guardar_vaga_publica(vaga, geracao)
+    return cache.responder_vaga_publica(entrada, request)
+
+@app.get("/vagas/stats", response_model=schemas.EstatisticasVagas)
+def read_estatisticas_vagas(db: Session = Depends(get_db_leitura)):
+    """Totais de vagas e candidatos, lidos dos contadores mantidos a cada escrita"""
+    return crud.get_estatisticas_vagas(db)
 
 @app.get("/teste-conexao")#teste de conexão com o banco de dados
 def teste_conexao(db: Session = Depends(get_db)):
     try:
         # Apenas tenta realizar uma operação simples no banco
-        db.execute("SELECT 1")
+        db.execute(text("SELECT 1"))
         return {"status": "Conexão com o banco funcionando"}
     except Exception as e:
         return {"erro": str(e)}
 
+@app.get("/diagnostico/pool")
+def diagnostico_pool():
+    """Estado do pool de conexões: tamanho, uso atual, esperas e esgotamentos"""
+    return estado_pool()
+
+@app.get("/diagnostico/admissao")
+def diagnostico_admissao():
+    """Decisões do controle de admissão da rota pública: admitidas, limitadas (429) e descartadas (503)"""
+    return admissao.controle.estado()
+
+@app.get("/diagnostico/queries-lentas")
+def diagnostico_queries_lentas():
+    """Statements acima de DB_SLOW_QUERY_MS agrupados por forma, com o plano de execução"""
+    if profiler.profiler is None:
+        return {"ativo": False, "limite_ms": None, "formas": []}
+    return {"ativo": True, "limite_ms": profiler.DB_SLOW_QUERY_MS, "formas": profiler.profiler.relatorio()}
 
-@app.get("/vagas/{vaga_id}", response_model=schemas.Vaga)
-def read_vaga(vaga_id: int, db: Session = Depends(get_db)):
-    """Buscar uma vaga específica por ID"""
+@app.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    """Métricas por rota e de banco no formato texto do Prometheus"""
+    return PlainTextResponse(metrics.registro.exportar(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/vagas/{vaga_id}", response_model=schemas.VagaComCandidatos, response_model_exclude_unset=True)
+def read_vaga(vaga_id: int, include: Optional[str] = None, candidatos_limit: int = Query(20, ge=1, le=100),
+              db: Session = Depends(get_db_leitura)):
+    """Buscar uma vaga específica por ID (`include=candidatos` traz até `candidatos_limit` candidatos)"""
+    incluir = projection.ler_include(include)
     db_vaga = crud.get_vaga(db, vaga_id=vaga_id)
     if db_vaga is None:
         raise HTTPException(status_code=404, detail="Vaga não encontrada")
-    return db_vaga
+    candidatos = crud.get_candidatos_de_vagas(db, [vaga_id], candidatos_limit) if incluir else None
+    return serializacao.resposta_json(schemas.VagaComCandidatos, projection.vagas_resposta([db_vaga], candidatos)[0],
+                                      exclude_unset=True)
 
 @app.put("/vagas/{vaga_id}", response_model=schemas.Vaga)
 def update_vaga(vaga_id: int, vaga: schemas.VagaUpdate, db: Session = Depends(get_db)):
@@ -82,20 +209,85 @@ def delete_vaga(vaga_id: int, db: Session = Depends(get_db)):
 # ===== ROTAS PARA CANDIDATOS =====
 
 @app.post("/candidatos/", response_model=schemas.Candidato, status_code=201)
-def create_candidato(candidato: schemas.CandidatoCreate, db: Session = Depends(get_db)):
-    """Criar um novo candidato"""
-    return crud.create_candidato(db=db, candidato=candidato)
+def create_candidato(candidato: schemas.CandidatoCreate, response: Response, db: Session = Depends(get_db)):
+    """Criar um novo candidato
+
+    Sem `transcricao` ou `Perfil`, o candidato é criado com
+    status_processamento="pendente" e os textos são gerados em segundo plano
+    (acompanhe em /candidatos/{id}/processamento). Fila cheia: 503 com Retry-After.
+    Se o e-mail já se inscreveu na vaga, devolve a candidatura existente com 200.
+    """
+    pendente = processamento.pendente(candidato)
+    if pendente:
+        processamento.pipeline.admitir()
+    db_candidato, criado = crud.criar_ou_obter_candidato(db, candidato)
+    if not criado:
+        response.status_code = 200
+    elif pendente:
+        from_thread.run_sync(processamento.pipeline.enfileirar, db_candidato.id)
+    return db_candidato
+
+@app.post("/candidatos/bulk", response_model=schemas.ResultadoBulk)
+async def create_candidatos_bulk(request: Request, db: Session = Depends(get_db)):
+    """Importar candidatos em lote
 
-@app.get("/candidatos/", response_model=List[schemas.Candidato])
-def read_candidatos(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Listar todos os candidatos"""
-    candidatos = crud.get_candidatos(db, skip=skip, limit=limit)
-    return candidatos
+    Aceita um array JSON (`application/json`) ou NDJSON (`application/x-ndjson`,
+    um candidato por linha). Erros de validação são reportados por linha e não
+    impedem a gravação das demais.
+    """
+    return await bulk.importar(request, db)
+
+@app.get("/candidatos/", response_model=Union[List[schemas.CandidatoParcial], schemas.PaginaCandidatos],
+         response_model_exclude_unset=True)
+def read_candidatos(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=100),
+                    cursor: Optional[str] = None, fields: Optional[str] = None,
+                    ids: Optional[str] = None, db: Session = Depends(get_db_leitura)):
+    """Listar todos os candidatos (aceita `cursor`, como em /vagas/)
+
+    Devolve o resumo de cada candidato; `fields=nome_completo,email,...`
+    escolhe outras colunas. O registro completo fica em /candidatos/{id}.
+    `ids=1,2,3` traz os registros completos desses candidatos (ou só `fields`),
+    na ordem pedida, em uma única query.
+    """
+    if ids is not None:
+        campos = projection.ler_fields(fields) if fields is not None else projection.CAMPOS_CANDIDATO
+        candidatos = crud.get_candidatos_por_ids(db, carregador.ler_ids(ids), campos)
+        return serializacao.resposta_json(List[schemas.CandidatoParcial], projection.projetar(candidatos, campos),
+                                          exclude_unset=True)
+    campos = projection.ler_fields(fields)
+    if cursor is None:
+        candidatos = crud.get_candidatos(db, skip=skip, limit=limit, campos=campos)
+        return serializacao.resposta_json(List[schemas.CandidatoParcial], projection.projetar(candidatos, campos),
+                                          exclude_unset=True)
+    candidatos = crud.get_candidatos(db, limit=limit + 1, apos_id=pagination.ler_cursor(cursor), campos=campos)
+    items, next_cursor = pagination.fatiar_pagina(candidatos, limit)
+    return serializacao.resposta_json(schemas.PaginaCandidatos,
+                                      {"items": projection.projetar(items, campos), "next_cursor": next_cursor},
+                                      exclude_unset=True)
+
+@app.get("/candidatos/search", response_model=schemas.ResultadoBusca)
+def search_candidatos(q: str, vaga_id: Optional[int] = None, limit: int = Query(20, ge=1, le=100), cursor: str = "",
+                      db: Session = Depends(get_db_leitura)):
+    """Buscar candidatos por texto em skill, Perfil e transcrição
+
+    Resultados ordenados por relevância; use `next_cursor` em `cursor` para a próxima página.
+    """
+    apos = pagination.ler_cursor(cursor, pagination.decodificar_cursor_ranking)
+    resultados = search.buscar(db, q, vaga_id=vaga_id, limit=limit + 1, apos=apos)
+    items = resultados[:limit]
+    next_cursor = None
+    if len(resultados) > limit and items:
+        next_cursor = pagination.codificar_cursor_ranking(items[-1]["score"], items[-1]["id"])
+    return {"items": items, "next_cursor": next_cursor}
 
 @app.get("/candidatos/{candidato_id}", response_model=schemas.Candidato)
-def read_candidato(candidato_id: int, db: Session = Depends(get_db)):
-    """Buscar um candidato específico por ID"""
-    db_candidato = crud.get_candidato(db, candidato_id=candidato_id)
+async def read_candidato(candidato_id: int, db: Session = Depends(get_db_leitura)):
+    """Buscar um candidato específico por ID
+
+    Buscas simultâneas (ex.: várias abas de detalhe) são agrupadas em uma
+    única query por app/carregador.py.
+    """
+    db_candidato = await carregador.candidatos.carregar(db, candidato_id)
     if db_candidato is None:
         raise HTTPException(status_code=404, detail="Candidato não encontrado")
     return db_candidato
@@ -116,11 +308,103 @@ def delete_candidato(candidato_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Candidato não encontrado")
     return {"message": "Candidato deletado com sucesso"}
 
-@app.get("/vagas/{vaga_id}/candidatos/", response_model=List[schemas.Candidato])
-def read_candidatos_por_vaga(vaga_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Listar candidatos de uma vaga específica"""
-    candidatos = crud.get_candidatos_por_vaga(db, vaga_id=vaga_id, skip=skip, limit=limit)
-    return candidatos
+@app.get("/candidatos/{candidato_id}/processamento", response_model=schemas.EstadoProcessamento)
+def read_processamento_candidato(candidato_id: int, db: Session = Depends(get_db_leitura)):
+    """Status do pipeline de transcrição/perfil (pendente, processando, concluido ou erro)"""
+    estado = crud.get_processamento_candidato(db, candidato_id)
+    if estado is None:
+        raise HTTPException(status_code=404, detail="Candidato não encontrado")
+    return {"id": candidato_id, "status": estado.status_processamento, "erro": estado.erro_processamento}
+
+@app.put("/candidatos/{candidato_id}/video", response_model=schemas.VideoArmazenado)
+async def upload_video_candidato(candidato_id: int, request: Request, db: Session = Depends(get_db)):
+    """Enviar o vídeo do candidato
+
+    O corpo é o próprio arquivo (não base64), lido em streaming direto para o
+    blob store; a linha do candidato guarda só o digest, o tamanho e o
+    Content-Type. Vídeos idênticos são armazenados uma vez só.
+    """
+    if await run_in_threadpool(crud.get_video_candidato, db, candidato_id) is None:
+        raise HTTPException(status_code=404, detail="Candidato não encontrado")
+    try:
+        digest, tamanho = await blobs.store.gravar(request.stream())
+    except blobs.BlobGrandeDemais:
+        raise HTTPException(status_code=413, detail="Vídeo maior que o permitido")
+    if tamanho == 0:
+        raise HTTPException(status_code=400, detail="Corpo da requisição vazio")
+    tipo = request.headers.get("content-type")
+    if await run_in_threadpool(crud.set_video_candidato, db, candidato_id, digest, tamanho, tipo) is None:
+        raise HTTPException(status_code=404, detail="Candidato não encontrado")
+    return {"digest": digest, "tamanho": tamanho, "tipo": tipo}
+
+@app.get("/candidatos/{candidato_id}/video", response_class=Response)
+def read_video_candidato(candidato_id: int, request: Request, db: Session = Depends(get_db_leitura)):
+    """Baixar o vídeo do candidato (aceita `Range`, `If-None-Match` e `If-Range`)"""
+    video = crud.get_video_candidato(db, candidato_id)
+    if video is None:
+        raise HTTPException(status_code=404, detail="Candidato não encontrado")
+    if video.video_digest is None or not blobs.store.existe(video.video_digest):
+        raise HTTPException(status_code=404, detail="Candidato sem vídeo")
+    return blobs.responder_blob(video.video_digest, video.video_tamanho, video.video_tipo, request)
+
+@app.get("/vagas/{vaga_id}/candidatos/",
+         response_model=Union[List[schemas.CandidatoParcial], schemas.PaginaCandidatos],
+         response_model_exclude_unset=True)
+def read_candidatos_por_vaga(vaga_id: int, skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=100),
+                             cursor: Optional[str] = None, fields: Optional[str] = None,
+                             db: Session = Depends(get_db_leitura)):
+    """Listar candidatos de uma vaga específica (aceita `cursor` e `fields`, como em /candidatos/)"""
+    campos = projection.ler_fields(fields)
+    if cursor is None:
+        candidatos = crud.get_candidatos_por_vaga(db, vaga_id=vaga_id, skip=skip, limit=limit, campos=campos)
+        return serializacao.resposta_json(List[schemas.CandidatoParcial], projection.projetar(candidatos, campos),
+                                          exclude_unset=True)
+    candidatos = crud.get_candidatos_por_vaga(db, vaga_id=vaga_id, limit=limit + 1,
+                                              apos_id=pagination.ler_cursor(cursor), campos=campos)
+    items, next_cursor = pagination.fatiar_pagina(candidatos, limit)
+    return serializacao.resposta_json(schemas.PaginaCandidatos,
+                                      {"items": projection.projetar(items, campos), "next_cursor": next_cursor},
+                                      exclude_unset=True)
+
+@app.get("/vagas/{vaga_id}/candidatos/stream")
+async def stream_candidatos_vaga(vaga_id: int, request: Request, db: Session = Depends(get_db_leitura)):
+    """Candidatos da vaga criados, atualizados e removidos, ao vivo (Server-Sent Events)
+
+    `criado` e `atualizado` trazem o resumo do candidato; `removido`, só o id.
+    Reconectando com Last-Event-ID o cliente recebe o que perdeu, e `reset`
+    avisa que é preciso recarregar a listagem (ver app/eventos.py).
+    """
+    existe = await run_in_threadpool(crud.get_vagas_existentes, db, [vaga_id])
+    # O stream fica aberto por minutos: a conexão volta para o pool antes de ele começar
+    await run_in_threadpool(db.close)
+    if not existe:
+        raise HTTPException(status_code=404, detail="Vaga não encontrada")
+    return eventos.resposta_stream(vaga_id, request.headers.get("last-event-id"))
+
+@app.get("/vagas/{vaga_id}/candidatos/export")
+def export_candidatos_por_vaga(vaga_id: int, format: Literal["csv", "ndjson"] = "csv",
+                               db: Session = Depends(get_db_leitura)):
+    """Exportar todos os candidatos da vaga em CSV ou NDJSON, em streaming"""
+    if crud.get_vaga(db, vaga_id=vaga_id) is None:
+        raise HTTPException(status_code=404, detail="Vaga não encontrada")
+    # A sessão de get_db_leitura só é fechada depois que a resposta termina de ser enviada
+    return StreamingResponse(
+        export.GERADORES[format](db, vaga_id),
+        media_type=export.FORMATOS[format],
+        headers={"Content-Disposition": f'attachment; filename="vaga-{vaga_id}-candidatos.{format}"'},
+    )
+
+@app.get("/vagas/{vaga_id}/ranking", response_model=List[schemas.CandidatoRanqueado])
+def read_ranking_vaga(vaga_id: int, limit: int = Query(20, ge=1, le=100), db: Session = Depends(get_db_leitura)):
+    """Candidatos da vaga ordenados por aderência (skill e transcrição) à descrição da vaga"""
+    ranking = crud.get_ranking_vaga(db, vaga_id=vaga_id, limit=limit)
+    if ranking is None:
+        raise HTTPException(status_code=404, detail="Vaga não encontrada")
+    return ranking
+
+# ⚡ Modo assíncrono: troca as rotas de CRUD acima pelas versões async de app/routes_async.py
+if DATABASE_ASYNC:
+    routes_async.instalar(app)
 
 if __name__ == "__main__":
     import uvicorn
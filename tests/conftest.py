@@ -0,0 +1,131 @@
+import os
+
+# Os testes usam bancos próprios; o engine padrão (criado sob demanda) só é
+# usado por /diagnostico/pool
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from main import app
+from app import admissao, cache
+from app.database import get_db, get_db_leitura
+from app.models import Base
+
+
+@pytest.fixture(autouse=True)
+def cache_limpo():
+    """Cada teste começa com o cache da página pública vazio"""
+    anterior = cache.backend
+    cache.configurar_backend(cache.MemoryCache())
+    yield cache.backend
+    cache.configurar_backend(anterior)
+
+
+@pytest.fixture(autouse=True)
+def admissao_limpa():
+    """Cada teste começa com os baldes da rota pública cheios e nenhuma requisição em andamento"""
+    anterior = admissao.controle
+    admissao.configurar(admissao.Controle())
+    yield admissao.controle
+    admissao.configurar(anterior)
+
+
+@pytest.fixture
+def engine():
+    """Banco SQLite em memória isolado para cada teste"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(engine):
+    """Sessão ligada ao banco de teste"""
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def client(engine):
+    """TestClient com get_db (e get_db_leitura) apontando para o banco de teste do próprio teste"""
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    dependencias = (get_db, get_db_leitura)
+    anteriores = {dependencia: app.dependency_overrides.get(dependencia) for dependencia in dependencias}
+    app.dependency_overrides.update(dict.fromkeys(dependencias, override_get_db))
+    yield TestClient(app)
+    for dependencia, anterior in anteriores.items():
+        if anterior is None:
+            app.dependency_overrides.pop(dependencia, None)
+        else:
+            app.dependency_overrides[dependencia] = anterior
+
+
+class ContadorQueries:
+    """Context manager que registra os statements SQL enviados por um engine"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _registrar(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._registrar)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._registrar)
+
+    @property
+    def total(self):
+        return len(self.statements)
+
+
+def vaga_payload(**extra):
+    dados = {
+        "nome_vaga": "Desenvolvedor Python",
+        "desc_vaga": "Vaga para desenvolvedor Python com experiência em FastAPI",
+        "modelo_trab": "Remoto",
+        "modelo_cont": "CLT",
+        "slug": "desenvolvedor-python",
+    }
+    dados.update(extra)
+    return dados
+
+
+def candidato_payload(vaga_id, **extra):
+    dados = {
+        "nome_completo": "Maria da Silva",
+        "telefone": "11999999999",
+        "email": "maria@example.com",
+        "skill": "Python, FastAPI, SQL",
+        "video": "",
+        "transcricao": "Trabalho com Python há cinco anos",
+        "Perfil": "Desenvolvedora backend",
+        "video_url": "https://example.com/video.mp4",
+        "vaga_id": vaga_id,
+    }
+    dados.update(extra)
+    return dados
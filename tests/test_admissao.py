@@ -0,0 +1,113 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app import admissao, crud, models
+from app.database import get_db, get_db_leitura
+from main import app
+from tests.conftest import vaga_payload
+
+
+class TestBaldes:
+    """Balde de tokens por chave"""
+
+    def test_rajada_taxa_e_espera(self):
+        baldes = admissao.Baldes(taxa=2, rajada=3)
+        assert [baldes.retirar("ip", agora=0) for _ in range(3)] == [0, 0, 0]
+        assert baldes.retirar("ip", agora=0) == pytest.approx(0.5)
+        assert baldes.retirar("outro", agora=0) == 0
+        # Meio segundo depois entrou um token
+        assert baldes.retirar("ip", agora=0.5) == 0
+        assert baldes.retirar("ip", agora=0.5) > 0
+        baldes.devolver("ip")
+        assert baldes.retirar("ip", agora=0.5) == 0
+
+    def test_lru_limita_os_baldes(self):
+        baldes = admissao.Baldes(taxa=1, rajada=1, max_chaves=2)
+        for ip in ("a", "b", "c"):
+            baldes.retirar(ip, agora=0)
+        assert len(baldes) == 2
+        assert admissao.Baldes(taxa=0, rajada=1).retirar("x") == 0  # taxa 0 desliga
+
+
+class TestRotaPublica:
+    """Limites da rota /vagas/publico/{slug}"""
+
+    def test_limite_por_ip_responde_429(self, client):
+        admissao.configurar(admissao.Controle(taxa_ip=1, rajada_ip=2))
+        client.post("/vagas/", json=vaga_payload())
+        respostas = [client.get("/vagas/publico/desenvolvedor-python") for _ in range(3)]
+        assert [r.status_code for r in respostas] == [200, 200, 429]
+        assert int(respostas[-1].headers["retry-after"]) >= 1
+        # Rotas autenticadas não passam pelos baldes
+        assert client.get("/vagas/").status_code == 200
+
+        estado = client.get("/diagnostico/admissao").json()
+        assert (estado["admitidas"], estado["limitadas_ip"], estado["em_andamento"]) == (2, 1, 0)
+
+    def test_slugs_inexistentes_gastam_a_cota_do_ip(self, client):
+        """Só as primeiras devoluções por minuto voltam: varrer slugs ao acaso esbarra no limite por IP"""
+        admissao.configurar(admissao.Controle(taxa_ip=1, rajada_ip=4, taxa_slug=0, devolucoes_ip=2))
+        client.post("/vagas/", json=vaga_payload())
+        respostas = [client.get(f"/vagas/publico/nao-existe-{i}").status_code for i in range(7)]
+        assert respostas == [404] * 6 + [429]
+        assert admissao.controle.estado()["devolvidas_ip"] == 2
+
+    def test_limite_por_slug(self, client):
+        admissao.configurar(admissao.Controle(taxa_ip=0, taxa_slug=1, rajada_slug=1))
+        assert client.get("/vagas/publico/a").status_code == 404
+        assert client.get("/vagas/publico/a").status_code == 429
+        assert client.get("/vagas/publico/b").status_code == 404
+        assert admissao.controle.estado()["limitadas_slug"] == 1
+
+    def test_inundacao_nao_atrasa_as_rotas_autenticadas(self, tmp_path, monkeypatch):
+        """Com o pool tomado por requisições públicas lentas, GET /vagas/{id} continua rápido"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'admissao.db'}", connect_args={"check_same_thread": False},
+                               pool_size=2, max_overflow=2, pool_timeout=10)
+        models.Base.metadata.create_all(bind=engine)
+        Sessao = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+        def override_get_db():
+            with Sessao() as db:
+                yield db
+
+        buscar_original = crud.get_vaga_por_slug
+
+        def busca_lenta(db, slug):
+            db.execute(text("SELECT 1"))  # segura uma conexão do pool
+            time.sleep(0.2)
+            return buscar_original(db, slug)
+
+        monkeypatch.setattr(crud, "get_vaga_por_slug", busca_lenta)
+        monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+        monkeypatch.setitem(app.dependency_overrides, get_db_leitura, override_get_db)
+        # Pool de 4 conexões com metade reservada: 2 públicas por vez
+        admissao.configurar(admissao.Controle(taxa_ip=0, taxa_slug=0, concorrencia=2))
+
+        async def inundar():
+            transporte = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transporte, base_url="http://teste") as cliente:
+                vaga_id = (await cliente.post("/vagas/", json=vaga_payload())).json()["id"]
+                publicas = [asyncio.create_task(cliente.get(f"/vagas/publico/slug-{i}")) for i in range(60)]
+                await asyncio.sleep(0.05)
+                latencias = []
+                for _ in range(5):
+                    inicio = time.perf_counter()
+                    assert (await cliente.get(f"/vagas/{vaga_id}")).status_code == 200
+                    latencias.append(time.perf_counter() - inicio)
+                return latencias, await asyncio.gather(*publicas)
+
+        try:
+            latencias, publicas = asyncio.run(inundar())
+        finally:
+            engine.dispose()
+        # Sem o limite, 60 buscas de 0,2 s em 4 conexões fariam o recrutador esperar segundos
+        assert max(latencias) < 0.5
+        status = [r.status_code for r in publicas]
+        assert status.count(503) > 0 and set(status) <= {404, 503}
+        assert all(r.headers["retry-after"] == "1" for r in publicas if r.status_code == 503)
+        assert admissao.controle.estado()["pico"] <= 2
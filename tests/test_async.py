@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from main import app
+from app import processamento, routes_async
+from app.database import get_async_db, url_assincrona
+from app.models import Base
+from tests.conftest import candidato_payload, vaga_payload
+
+
+@pytest.fixture
+def async_client(tmp_path):
+    """App com as rotas assíncronas instaladas sobre um SQLite via aiosqlite"""
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    sync_engine.dispose()
+
+    async_engine = create_async_engine(url_assincrona(url))
+    AsyncTestingSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    rotas_originais = list(app.router.routes)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    routes_async.instalar(app)
+    yield TestClient(app)
+    app.router.routes[:] = rotas_originais
+    app.openapi_schema = None
+    app.dependency_overrides.pop(get_async_db, None)
+    asyncio.run(async_engine.dispose())
+
+
+class TestAsyncMode:
+    """Testes do modo assíncrono (DATABASE_ASYNC=1)"""
+
+    def test_url_assincrona(self):
+        assert url_assincrona("sqlite:///./vagas.db") == "sqlite+aiosqlite:///./vagas.db"
+        assert url_assincrona("postgresql://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
+
+    def test_rotas_sao_substituidas_na_mesma_posicao(self, async_client):
+        caminhos = [(r.path, r.endpoint) for r in app.router.routes if hasattr(r, "endpoint")]
+        endpoint = dict(caminhos)["/vagas/{vaga_id}/candidatos/"]
+        assert asyncio.iscoroutinefunction(endpoint)
+        ordem = [c for c, _ in caminhos]
+        assert ordem.index("/vagas/publico/{slug}") < ordem.index("/vagas/{vaga_id}")
+
+    def test_crud_completo(self, async_client):
+        vaga = async_client.post("/vagas/", json=vaga_payload()).json()
+        assert async_client.get(f"/vagas/publico/{vaga['slug']}").json()["id"] == vaga["id"]
+
+        response = async_client.post("/candidatos/", json=candidato_payload(vaga["id"]))
+        assert response.status_code == 201
+        candidato_id = response.json()["id"]
+
+        response = async_client.put(f"/candidatos/{candidato_id}", json={"telefone": "11888888888"})
+        assert response.json()["telefone"] == "11888888888"
+
+        pagina = async_client.get(f"/vagas/{vaga['id']}/candidatos/", params={"cursor": ""}).json()
+        assert [c["id"] for c in pagina["items"]] == [candidato_id]
+        com_candidatos = async_client.get(f"/vagas/{vaga['id']}", params={"include": "candidatos"}).json()
+        assert [c["id"] for c in com_candidatos["candidatos"]] == [candidato_id]
+
+        assert async_client.delete(f"/candidatos/{candidato_id}").status_code == 200
+        assert async_client.get(f"/candidatos/{candidato_id}").status_code == 404
+        assert async_client.delete(f"/vagas/{vaga['id']}").status_code == 200
+
+    def test_teste_conexao(self, async_client):
+        assert async_client.get("/teste-conexao").json() == {"status": "Conexão com o banco funcionando"}
+
+    def test_fila_do_pipeline_cheia(self, async_client, monkeypatch):
+        monkeypatch.setattr(processamento, "pipeline", processamento.Pipeline(fila_max=0))
+        vaga = async_client.post("/vagas/", json=vaga_payload()).json()
+        dados = candidato_payload(vaga["id"])
+        del dados["Perfil"]
+        response = async_client.post("/candidatos/", json=dados)
+        assert response.status_code == 503
+        assert "retry-after" in response.headers
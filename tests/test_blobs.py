@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import os
+
+import pytest
+
+from app import blobs, models
+from tests.conftest import candidato_payload, vaga_payload
+
+VIDEO = bytes(range(256)) * 40
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path):
+    """Blob store em diretório temporário"""
+    anterior = blobs.store
+    blobs.configurar_store(blobs.LocalBlobStore(str(tmp_path / "blobs")))
+    yield blobs.store
+    blobs.configurar_store(anterior)
+
+
+def _candidato(client, email="maria@example.com"):
+    vaga_id = client.post("/vagas/", json=vaga_payload(slug=None)).json()["id"]
+    return client.post("/candidatos/", json=candidato_payload(vaga_id, email=email)).json()["id"]
+
+
+def _arquivos(raiz):
+    return [nome for _, _, nomes in os.walk(raiz) for nome in nomes]
+
+
+class TestBlobs:
+    """Vídeos no blob store: upload em streaming, deduplicação e Range"""
+
+    def test_upload_guarda_so_o_digest_na_linha(self, client, db_session, store):
+        candidato_id = _candidato(client)
+        resposta = client.put(f"/candidatos/{candidato_id}/video", content=VIDEO,
+                              headers={"content-type": "video/mp4"})
+        assert resposta.status_code == 200
+        digest = hashlib.sha256(VIDEO).hexdigest()
+        assert resposta.json() == {"digest": digest, "tamanho": len(VIDEO), "tipo": "video/mp4"}
+
+        linha = db_session.get(models.Candidato, candidato_id)
+        assert (linha.video, linha.video_digest, linha.video_tamanho) == ("", digest, len(VIDEO))
+        assert client.get(f"/candidatos/{candidato_id}").json()["video_digest"] == digest
+
+    def test_conteudo_repetido_e_gravado_uma_vez(self, client, store):
+        for email in ("a@example.com", "b@example.com"):
+            candidato_id = _candidato(client, email=email)
+            assert client.put(f"/candidatos/{candidato_id}/video", content=VIDEO).status_code == 200
+        assert _arquivos(store.raiz) == [hashlib.sha256(VIDEO).hexdigest()]
+
+    def test_download_inteiro_e_etag(self, client):
+        candidato_id = _candidato(client)
+        client.put(f"/candidatos/{candidato_id}/video", content=VIDEO, headers={"content-type": "video/mp4"})
+
+        resposta = client.get(f"/candidatos/{candidato_id}/video")
+        assert resposta.status_code == 200
+        assert resposta.content == VIDEO
+        assert resposta.headers["content-type"] == "video/mp4"
+        assert resposta.headers["accept-ranges"] == "bytes"
+
+        etag = resposta.headers["etag"]
+        assert client.get(f"/candidatos/{candidato_id}/video", headers={"if-none-match": etag}).status_code == 304
+
+    @pytest.mark.parametrize("cabecalho, inicio, fim", [
+        ("bytes=10-19", 10, 19),
+        ("bytes=10000-", 10000, len(VIDEO) - 1),
+        ("bytes=-5", len(VIDEO) - 5, len(VIDEO) - 1),
+        ("bytes=0-999999", 0, len(VIDEO) - 1),
+    ])
+    def test_range(self, client, cabecalho, inicio, fim):
+        candidato_id = _candidato(client)
+        client.put(f"/candidatos/{candidato_id}/video", content=VIDEO)
+
+        resposta = client.get(f"/candidatos/{candidato_id}/video", headers={"range": cabecalho})
+        assert resposta.status_code == 206
+        assert resposta.content == VIDEO[inicio:fim + 1]
+        assert resposta.headers["content-range"] == f"bytes {inicio}-{fim}/{len(VIDEO)}"
+        assert resposta.headers["content-length"] == str(fim - inicio + 1)
+
+    def test_range_impossivel_e_if_range_desatualizado(self, client):
+        candidato_id = _candidato(client)
+        client.put(f"/candidatos/{candidato_id}/video", content=VIDEO)
+        url = f"/candidatos/{candidato_id}/video"
+
+        resposta = client.get(url, headers={"range": f"bytes={len(VIDEO)}-"})
+        assert resposta.status_code == 416
+        assert resposta.headers["content-range"] == f"bytes */{len(VIDEO)}"
+
+        resposta = client.get(url, headers={"range": "bytes=0-9", "if-range": '"outro"'})
+        assert resposta.status_code == 200
+        assert resposta.content == VIDEO
+
+    def test_erros(self, client, monkeypatch):
+        assert client.put("/candidatos/999/video", content=VIDEO).status_code == 404
+        assert client.get("/candidatos/999/video").status_code == 404
+
+        candidato_id = _candidato(client)
+        assert client.get(f"/candidatos/{candidato_id}/video").json()["detail"] == "Candidato sem vídeo"
+        assert client.put(f"/candidatos/{candidato_id}/video", content=b"").status_code == 400
+
+        monkeypatch.setattr(blobs, "BLOB_MAX_BYTES", 100)
+        assert client.put(f"/candidatos/{candidato_id}/video", content=VIDEO).status_code == 413
+
+    def test_zerocopysend_quando_o_servidor_oferece(self, store):
+        async def pedacos():
+            yield VIDEO
+
+        digest, _ = asyncio.run(store.gravar(pedacos()))
+        mensagens = []
+
+        async def send(mensagem):
+            mensagens.append(mensagem)
+
+        scope = {"type": "http", "method": "GET", "extensions": {"http.response.zerocopysend": {}}}
+        resposta = blobs.RespostaBlob(store.caminho(digest), 100, 199, 206, {}, "video/mp4")
+        asyncio.run(resposta(scope, None, send))
+        assert mensagens[1]["type"] == "http.response.zerocopysend"
+        assert (mensagens[1]["offset"], mensagens[1]["count"]) == (100, 100)
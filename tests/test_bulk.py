@@ -0,0 +1,81 @@
+import json
+
+from app import crud, schemas
+from tests.conftest import candidato_payload, vaga_payload
+
+
+class TestBulk:
+    """Testes da importação de candidatos em lote"""
+
+    def test_array_json_com_erros_por_linha(self, client):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        linhas = [
+            candidato_payload(vaga_id, email="a@example.com"),
+            {"nome_completo": "Sem os outros campos"},
+            candidato_payload(vaga_id + 100, email="b@example.com"),
+            candidato_payload(vaga_id, email="c@example.com"),
+        ]
+        response = client.post("/candidatos/bulk", json=linhas)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_inseridos"] == 2
+        assert [c["linha"] for c in data["criados"]] == [1, 4]
+        assert {e["linha"] for e in data["erros"]} == {2, 3}
+        assert data["erros"][-1]["erros"] == ["vaga_id: Vaga não encontrada"]
+
+        for item, email in zip(data["criados"], ["a@example.com", "c@example.com"]):
+            assert client.get(f"/candidatos/{item['id']}").json()["email"] == email
+
+    def test_ndjson_em_varios_lotes(self, client, db_session):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        corpo = "\n".join(
+            json.dumps(candidato_payload(vaga_id, email=f"c{i}@example.com")) for i in range(1200)
+        ) + "\n{quebrado\n\n"
+        response = client.post("/candidatos/bulk", content=corpo.encode(),
+                               headers={"Content-Type": "application/x-ndjson"})
+        data = response.json()
+        assert data["total_inseridos"] == 1200
+        assert data["erros"][0]["linha"] == 1201
+        assert len(crud.get_candidatos_por_vaga(db_session, vaga_id, limit=2000)) == 1200
+
+    def test_candidaturas_repetidas(self, client):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        existente = client.post("/candidatos/", json=candidato_payload(vaga_id, email="a@example.com")).json()["id"]
+        linhas = [
+            candidato_payload(vaga_id, email="A@example.com"),
+            candidato_payload(vaga_id, email="b@example.com"),
+            candidato_payload(vaga_id, email="B@Example.com"),
+        ]
+        data = client.post("/candidatos/bulk", json=linhas).json()
+        assert [c["linha"] for c in data["criados"]] == [2]
+        assert [e["erros"] for e in data["erros"]] == [
+            [f"email: já inscrito nesta vaga (id {existente})"], ["email: já inscrito nesta vaga (linha 2)"]]
+
+    def test_content_type_nao_suportado(self, client):
+        response = client.post("/candidatos/bulk", content=b"a,b", headers={"Content-Type": "text/csv"})
+        assert response.status_code == 415
+
+    def test_crud_bulk_devolve_ids_na_ordem(self, db_session):
+        vaga = crud.create_vaga(db_session, schemas.VagaCreate(**vaga_payload()))
+        candidatos = [schemas.CandidatoCreate(**candidato_payload(vaga.id, email=f"{i}@x.com")) for i in range(5)]
+        ids, repetidas = crud.create_candidatos_bulk(db_session, candidatos)
+        assert [crud.get_candidato(db_session, i).email for i in ids] == [f"{i}@x.com" for i in range(5)]
+        assert repetidas == []
+
+        # Candidatura gravada por outra requisição depois da checagem: pulada, sem IntegrityError
+        novo = schemas.CandidatoCreate(**candidato_payload(vaga.id, email="novo@x.com"))
+        ids, repetidas = crud.create_candidatos_bulk(db_session, [candidatos[1], novo])
+        assert repetidas == [0] and ids[0] is None
+        assert crud.get_candidato(db_session, ids[1]).email == "novo@x.com"
+
+    def test_candidatura_concorrente_vira_erro_da_linha(self, client, monkeypatch):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        client.post("/candidatos/", json=candidato_payload(vaga_id, email="a@example.com"))
+        # Simula a inscrição acontecendo entre a checagem do lote e o INSERT
+        monkeypatch.setattr(crud, "get_candidaturas_existentes", lambda db, pares: {})
+        linhas = [candidato_payload(vaga_id, email="a@example.com"), candidato_payload(vaga_id, email="b@example.com")]
+        response = client.post("/candidatos/bulk", json=linhas)
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["total_inseridos"], [c["linha"] for c in data["criados"]]) == (1, [2])
+        assert data["erros"] == [{"linha": 1, "erros": ["email: já inscrito nesta vaga"]}]
@@ -0,0 +1,118 @@
+import time
+
+from app import cache, crud
+from tests.conftest import ContadorQueries, vaga_payload
+
+
+class FakeRedis:
+    """Cliente mínimo com a API do redis-py usada pelo RedisCache"""
+
+    def __init__(self):
+        self.dados = {}
+
+    def get(self, chave):
+        valor = self.dados.get(chave)
+        if valor is None or valor[0] <= time.monotonic():
+            return None
+        return valor[1]
+
+    def set(self, chave, valor, px):
+        self.dados[chave] = (time.monotonic() + px / 1000, valor)
+
+    def delete(self, *chaves):
+        for chave in chaves:
+            self.dados.pop(chave, None)
+
+
+class TestMemoryCache:
+    """Testes do LRU em memória"""
+
+    def test_lru_respeita_limite(self):
+        lru = cache.MemoryCache(max_itens=2)
+        lru.set("a", b"1", 60)
+        lru.set("b", b"2", 60)
+        lru.get("a")
+        lru.set("c", b"3", 60)
+        assert lru.get("b") is None
+        assert lru.get("a") == b"1" and lru.get("c") == b"3"
+        assert len(lru) == 2
+
+    def test_ttl_expira(self):
+        lru = cache.MemoryCache()
+        lru.set("a", b"1", 0)
+        assert lru.get("a") is None
+
+
+class TestVagaPublicaCache:
+    """Testes do cache da rota /vagas/publico/{slug}"""
+
+    def test_segunda_leitura_nao_consulta_o_banco(self, client, engine):
+        client.post("/vagas/", json=vaga_payload())
+        primeira = client.get("/vagas/publico/desenvolvedor-python")
+        assert primeira.status_code == 200
+        assert primeira.headers["cache-control"] == f"public, max-age={cache.VAGA_CACHE_TTL}"
+
+        with ContadorQueries(engine) as contador:
+            segunda = client.get("/vagas/publico/desenvolvedor-python")
+        assert contador.total == 0
+        assert segunda.json() == primeira.json()
+        assert segunda.headers["etag"] == primeira.headers["etag"]
+
+    def test_get_condicional_responde_304(self, client):
+        client.post("/vagas/", json=vaga_payload())
+        etag = client.get("/vagas/publico/desenvolvedor-python").headers["etag"]
+        response = client.get("/vagas/publico/desenvolvedor-python", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_update_e_delete_invalidam(self, client):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        etag = client.get("/vagas/publico/desenvolvedor-python").headers["etag"]
+
+        client.put(f"/vagas/{vaga_id}", json={"nome_vaga": "Dev Sênior"})
+        response = client.get("/vagas/publico/desenvolvedor-python", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["nome_vaga"] == "Dev Sênior"
+
+        client.put(f"/vagas/{vaga_id}", json={"slug": "dev-senior"})
+        assert client.get("/vagas/publico/desenvolvedor-python").status_code == 404
+
+        client.delete(f"/vagas/{vaga_id}")
+        assert client.get("/vagas/publico/dev-senior").status_code == 404
+
+    def test_invalidacao_com_o_lru_cheio(self, client):
+        """A página mais lida continua no LRU e é invalidada pelo slug, não por outra entrada já descartada"""
+        cache.configurar_backend(cache.MemoryCache(max_itens=4))
+        ids = {slug: client.post("/vagas/", json=vaga_payload(slug=slug)).json()["id"] for slug in ("a", "b", "c")}
+        for slug in ("a", "b", "a", "c"):
+            client.get(f"/vagas/publico/{slug}")
+
+        client.put(f"/vagas/{ids['a']}", json={"nome_vaga": "Dev Sênior"})
+        assert client.get("/vagas/publico/a").json()["nome_vaga"] == "Dev Sênior"
+        client.delete(f"/vagas/{ids['a']}")
+        assert client.get("/vagas/publico/a").status_code == 404
+
+    def test_backend_redis_plugavel(self, client):
+        redis = FakeRedis()
+        cache.configurar_backend(cache.RedisCache(redis))
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        client.get("/vagas/publico/desenvolvedor-python")
+        assert "hireai:vaga:slug:desenvolvedor-python" in redis.dados
+
+        client.delete(f"/vagas/{vaga_id}")
+        assert "hireai:vaga:slug:desenvolvedor-python" not in redis.dados
+
+    def test_leitura_anterior_a_invalidacao_nao_volta_ao_cache(self, client, monkeypatch):
+        """Um GET que leu a vaga antes de um PUT terminar não guarda a versão antiga"""
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        buscar_original = crud.get_vaga_por_slug
+
+        def busca_durante_o_put(db, slug):
+            vaga = buscar_original(db, slug)
+            monkeypatch.setattr(crud, "get_vaga_por_slug", buscar_original)
+            assert client.put(f"/vagas/{vaga_id}", json={"nome_vaga": "Dev Sênior"}).status_code == 200
+            return vaga
+
+        monkeypatch.setattr(crud, "get_vaga_por_slug", busca_durante_o_put)
+        assert client.get("/vagas/publico/desenvolvedor-python").json()["nome_vaga"] == "Desenvolvedor Python"
+        assert client.get("/vagas/publico/desenvolvedor-python").json()["nome_vaga"] == "Dev Sênior"
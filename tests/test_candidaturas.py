@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app import crud, schemas
+from tests.conftest import candidato_payload, vaga_payload
+
+
+class TestCandidaturas:
+    """Uma candidatura por e-mail em cada vaga"""
+
+    def test_repetida_devolve_a_existente(self, client):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        primeira = client.post("/candidatos/", json=candidato_payload(vaga_id))
+        assert primeira.status_code == 201
+
+        repetida = client.post("/candidatos/", json=candidato_payload(vaga_id, email="MARIA@example.com",
+                                                                      nome_completo="Outra"))
+        assert repetida.status_code == 200
+        assert repetida.json() == primeira.json()
+        assert client.get(f"/vagas/{vaga_id}").json()["total_candidatos"] == 1
+
+        # Outra vaga aceita o mesmo e-mail
+        outra = client.post("/vagas/", json=vaga_payload(slug="outra")).json()["id"]
+        assert client.post("/candidatos/", json=candidato_payload(outra)).status_code == 201
+
+    def test_crud_informa_se_criou(self, db_session, client):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        candidato = schemas.CandidatoCreate(**candidato_payload(vaga_id))
+        criado, novo = crud.criar_ou_obter_candidato(db_session, candidato)
+        existente, repetido = crud.criar_ou_obter_candidato(db_session, candidato)
+        assert (novo, repetido) == (True, False)
+        assert existente.id == criado.id
+        assert crud.get_candidatura(db_session, vaga_id, "Maria@Example.com").id == criado.id
+
+    def test_update_para_email_ja_inscrito(self, client):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        client.post("/candidatos/", json=candidato_payload(vaga_id))
+        outro = client.post("/candidatos/", json=candidato_payload(vaga_id, email="joao@example.com")).json()
+        response = client.put(f"/candidatos/{outro['id']}", json={"email": "maria@example.com"})
+        assert response.status_code == 409
+        assert client.get(f"/candidatos/{outro['id']}").json()["email"] == "joao@example.com"
+
+    def test_null_explicito_responde_422(self, client):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        candidato = client.post("/candidatos/", json=candidato_payload(vaga_id)).json()
+        assert client.put(f"/candidatos/{candidato['id']}", json={"nome_completo": None}).status_code == 422
+        assert client.put(f"/vagas/{vaga_id}", json={"slug": None}).status_code == 422
+        assert client.get(f"/candidatos/{candidato['id']}").json()["nome_completo"] == candidato["nome_completo"]
+
+    def test_outra_violacao_de_integridade_nao_vira_409(self, db_session, client):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        candidato_id = client.post("/candidatos/", json=candidato_payload(vaga_id)).json()["id"]
+        with pytest.raises(IntegrityError):
+            crud.update_candidato(db_session, candidato_id, schemas.CandidatoUpdate(), {"nome_completo": None})
@@ -0,0 +1,129 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import inspect
+
+from app import carregador, crud, schemas
+from main import app
+from tests.conftest import ContadorQueries, candidato_payload, vaga_payload
+
+
+class SessaoFalsa:
+    def __init__(self, bind="primario"):
+        self.bind = bind
+
+    def get_bind(self):
+        return self.bind
+
+
+def _carregador(chamadas, **opcoes):
+    async def buscar(bind, ids):
+        chamadas.append((bind, sorted(ids)))
+        if "erro" in bind:
+            raise RuntimeError("banco fora do ar")
+        return [SimpleNamespace(id=i) for i in ids if i < 100]
+    return carregador.Carregador(buscar, **opcoes)
+
+
+class TestCarregador:
+    """Agrupamento das buscas por id (estilo DataLoader)"""
+
+    def test_buscas_da_mesma_rodada_viram_uma_query(self):
+        chamadas = []
+        lote = _carregador(chamadas)
+
+        async def rodar():
+            db = SessaoFalsa()
+            return await asyncio.gather(*(lote.carregar(db, i) for i in (3, 1, 3, 200, 2)))
+
+        resultados = asyncio.run(rodar())
+        assert chamadas == [("primario", [1, 2, 3, 200])]
+        assert [r and r.id for r in resultados] == [3, 1, 3, None, 2]
+
+    def test_binds_diferentes_e_erros(self):
+        chamadas = []
+        lote = _carregador(chamadas)
+
+        async def rodar():
+            return await asyncio.gather(lote.carregar(SessaoFalsa("replica"), 1),
+                                        lote.carregar(SessaoFalsa("erro"), 2), return_exceptions=True)
+
+        replica, erro = asyncio.run(rodar())
+        assert sorted(chamadas) == [("erro", [2]), ("replica", [1])]
+        assert replica.id == 1 and isinstance(erro, RuntimeError)
+
+    def test_lote_max_e_rodadas_seguintes(self):
+        chamadas = []
+        lote = _carregador(chamadas, lote_max=2)
+
+        async def rodar():
+            db = SessaoFalsa()
+            await asyncio.gather(*(lote.carregar(db, i) for i in range(5)))
+            await lote.carregar(db, 7)
+
+        asyncio.run(rodar())
+        assert [ids for _, ids in chamadas] == [[0, 1], [2, 3], [4], [7]]
+
+    def test_lote_em_sessao_propria(self, db_session):
+        vaga = crud.create_vaga(db_session, schemas.VagaCreate(**vaga_payload()))
+        criado = crud.create_candidato(db_session, schemas.CandidatoCreate(**candidato_payload(vaga.id)))
+
+        candidato = asyncio.run(carregador.candidatos.carregar(db_session, criado.id))
+        assert candidato.email == criado.email
+        # O lote rodou em uma sessão própria, já fechada: nada fica preso à sessão da requisição
+        assert candidato not in db_session and inspect(candidato).detached
+
+    def test_ler_ids(self):
+        assert carregador.ler_ids("3, 1,3,,2") == [3, 1, 2]
+        with pytest.raises(HTTPException) as erro:
+            carregador.ler_ids("1,a")
+        assert erro.value.status_code == 400
+        with pytest.raises(HTTPException):
+            carregador.ler_ids(",".join(str(i) for i in range(carregador.IDS_MAX + 1)))
+
+
+class TestBuscaPorIds:
+    """GET /candidatos/?ids= e GET /vagas/?ids="""
+
+    def test_candidatos_por_ids(self, client, engine):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        ids = [client.post("/candidatos/", json=candidato_payload(vaga_id, email=f"c{i}@example.com")).json()["id"]
+               for i in range(3)]
+
+        with ContadorQueries(engine) as contador:
+            response = client.get("/candidatos/", params={"ids": f"{ids[2]},999,{ids[0]}"})
+        assert contador.total == 1
+        assert [c["id"] for c in response.json()] == [ids[2], ids[0]]
+        assert response.json()[0] == client.get(f"/candidatos/{ids[2]}").json()
+
+        resumo = client.get("/candidatos/", params={"ids": str(ids[1]), "fields": "email"}).json()
+        assert resumo == [{"id": ids[1], "email": "c1@example.com"}]
+        assert client.get("/candidatos/", params={"ids": "x"}).status_code == 400
+
+    def test_vagas_por_ids(self, client, db_session):
+        ids = [client.post("/vagas/", json=vaga_payload(slug=f"vaga-{i}")).json()["id"] for i in range(3)]
+        crud.create_candidato(db_session, schemas.CandidatoCreate(**candidato_payload(ids[1])))
+
+        vagas = client.get("/vagas/", params={"ids": f"{ids[1]},{ids[0]}", "include": "candidatos"}).json()
+        assert [v["id"] for v in vagas] == [ids[1], ids[0]]
+        assert [len(v["candidatos"]) for v in vagas] == [1, 0]
+
+    def test_detalhes_simultaneos_agrupados(self, client):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        ids = [client.post("/candidatos/", json=candidato_payload(vaga_id, email=f"c{i}@example.com")).json()["id"]
+               for i in range(10)]
+        lotes_antes = carregador.candidatos.lotes
+
+        async def abrir_detalhes():
+            transporte = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transporte, base_url="http://teste") as cliente:
+                return await asyncio.gather(*(cliente.get(f"/candidatos/{i}") for i in [*ids, 999]))
+
+        respostas = asyncio.run(abrir_detalhes())
+        assert [r.json()["id"] for r in respostas[:-1]] == ids
+        assert respostas[-1].status_code == 404
+        # Cada requisição abre a sessão no threadpool, então nem todas caem na mesma rodada
+        assert carregador.candidatos.lotes - lotes_antes < len(respostas)
@@ -0,0 +1,57 @@
+from sqlalchemy import update
+
+from app import contadores, models
+from tests.conftest import candidato_payload, vaga_payload
+
+
+def _total(client, vaga_id):
+    return client.get(f"/vagas/{vaga_id}").json()["total_candidatos"]
+
+
+class TestContadores:
+    """vagas.total_candidatos mantido pelo banco e reconciliado sob demanda"""
+
+    def test_contador_acompanha_as_escritas(self, client):
+        a = client.post("/vagas/", json=vaga_payload(slug=None)).json()["id"]
+        b = client.post("/vagas/", json=vaga_payload(slug=None)).json()["id"]
+        ids = [client.post("/candidatos/", json=candidato_payload(a, email=f"{i}@x.com")).json()["id"]
+               for i in range(3)]
+        lote = [candidato_payload(b, email=f"lote{i}@x.com") for i in range(4)]
+        assert client.post("/candidatos/bulk", json=lote).json()["total_inseridos"] == 4
+        assert (_total(client, a), _total(client, b)) == (3, 4)
+
+        client.put(f"/candidatos/{ids[0]}", json={"vaga_id": b})
+        client.put(f"/candidatos/{ids[1]}", json={"telefone": "11000000000"})
+        client.delete(f"/candidatos/{ids[2]}")
+        assert (_total(client, a), _total(client, b)) == (1, 5)
+        assert [v["total_candidatos"] for v in client.get("/vagas/").json()] == [1, 5]
+
+    def test_stats(self, client):
+        assert client.get("/vagas/stats").json() == {
+            "total_vagas": 0, "total_candidatos": 0, "media_candidatos_por_vaga": 0.0,
+            "max_candidatos_por_vaga": 0, "vagas_sem_candidatos": 0,
+        }
+        a = client.post("/vagas/", json=vaga_payload(slug=None)).json()["id"]
+        client.post("/vagas/", json=vaga_payload(slug=None))
+        for i in range(3):
+            client.post("/candidatos/", json=candidato_payload(a, email=f"{i}@x.com"))
+        assert client.get("/vagas/stats").json() == {
+            "total_vagas": 2, "total_candidatos": 3, "media_candidatos_por_vaga": 1.5,
+            "max_candidatos_por_vaga": 3, "vagas_sem_candidatos": 1,
+        }
+
+    def test_reconciliacao_corrige_so_os_desvios(self, client, engine):
+        a = client.post("/vagas/", json=vaga_payload(slug=None)).json()["id"]
+        b = client.post("/vagas/", json=vaga_payload(slug=None)).json()["id"]
+        c = client.post("/vagas/", json=vaga_payload(slug=None)).json()["id"]
+        client.post("/candidatos/", json=candidato_payload(a))
+        client.post("/candidatos/", json=candidato_payload(c))
+        with engine.begin() as conexao:
+            conexao.execute(update(models.Vaga).where(models.Vaga.id == a).values(total_candidatos=7))
+            conexao.execute(update(models.Vaga).where(models.Vaga.id == b).values(total_candidatos=2))
+
+        with engine.begin() as conexao:
+            assert sorted(contadores.reconciliar(conexao)) == [a, b]
+        assert [_total(client, v) for v in (a, b, c)] == [1, 0, 1]
+        with engine.begin() as conexao:
+            assert contadores.reconciliar(conexao) == []
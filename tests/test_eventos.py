@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from sqlalchemy import text
+
+from app import eventos
+from main import app
+from tests.conftest import candidato_payload, vaga_payload
+
+
+@pytest.fixture
+def barramento():
+    """Barramento próprio do teste, com histórico e filas pequenos"""
+    anterior = eventos.barramento
+    eventos.configurar_barramento(eventos.Barramento(historico=5, fila_max=3))
+    yield eventos.barramento
+    eventos.configurar_barramento(anterior)
+
+
+def _ler_sse(corpo: str) -> list:
+    """Eventos de um corpo text/event-stream (sem os comentários e o `retry:`)"""
+    lidos = []
+    for bloco in corpo.split("\n\n"):
+        campos = dict(linha.split(": ", 1) for linha in bloco.splitlines() if not linha.startswith(":"))
+        if "event" in campos:
+            lidos.append({"id": campos.get("id"), "event": campos["event"], "data": json.loads(campos["data"])})
+    return lidos
+
+
+class TestBarramento:
+    """Pub/sub em memória, histórico e filas limitadas"""
+
+    def test_retomada_e_fila_cheia(self, barramento):
+        async def rodar():
+            barramento.publicar(None, "criado", 1, {"id": 10})
+            primeiro = barramento.ultimo_id()
+            barramento.publicar(None, "criado", 2, {"id": 20})
+            barramento.publicar(None, "criado", 1, {"id": 11})
+
+            assinatura, perdidos = barramento.assinar(1, primeiro)
+            assert [e.dados["id"] for e in perdidos] == [11]
+            assert barramento.assinar(1, "outro-processo-1")[1] is None
+
+            # fila_max=3: o 4º evento sem leitura encerra as duas assinaturas da vaga
+            for i in range(4):
+                barramento.publicar(None, "atualizado", 1, {"id": i})
+            await asyncio.sleep(0)
+            assert assinatura.fila.qsize() == 1 and await assinatura.fila.get() is None
+
+        asyncio.run(rodar())
+        assert barramento.estado()["desconectados"] == 2
+        assert barramento.estado()["historico"] == 5
+
+    def test_publicado_so_depois_do_commit(self, barramento, db_session):
+        """O evento fica na transação da escrita: o rollback o descarta, o commit o distribui"""
+        db_session.execute(text("SELECT 1"))
+        barramento.publicar(db_session, "criado", 1, {"id": 10})
+        assert barramento.estado()["historico"] == 0
+        db_session.rollback()
+        db_session.execute(text("SELECT 1"))
+        barramento.publicar(db_session, "criado", 1, {"id": 11})
+        db_session.commit()
+        assert barramento.estado()["historico"] == 1
+        assert [e.dados for e in barramento._historico] == [{"id": 11}]
+
+    def test_evento_em_json(self):
+        evento = eventos.Evento("abc-1", "removido", 3, {"id": 7})
+        assert eventos.Evento.de_json(evento.json()) == evento
+        assert evento.sse() == 'id: abc-1\nevent: removido\ndata: {"id":7}\n\n'
+
+
+class TestStream:
+    """GET /vagas/{vaga_id}/candidatos/stream"""
+
+    def test_recebe_criado_atualizado_e_removido(self, client, barramento, monkeypatch):
+        monkeypatch.setattr(eventos, "EVENTOS_DURACAO_MAX_S", 1.0)
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        outra_id = client.post("/vagas/", json=vaga_payload(slug="outra")).json()["id"]
+
+        async def acompanhar():
+            transporte = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transporte, base_url="http://teste") as cliente:
+                stream = asyncio.create_task(cliente.get(f"/vagas/{vaga_id}/candidatos/stream"))
+                while barramento.estado()["assinantes"] == 0:
+                    await asyncio.sleep(0.01)
+                criado = (await cliente.post("/candidatos/", json=candidato_payload(vaga_id))).json()
+                await cliente.post("/candidatos/", json=candidato_payload(outra_id))
+                await cliente.put(f"/candidatos/{criado['id']}", json={"telefone": "11000000000"})
+                await cliente.delete(f"/candidatos/{criado['id']}")
+                return criado, await stream
+
+        criado, resposta = asyncio.run(acompanhar())
+        assert resposta.headers["content-type"].startswith("text/event-stream")
+        lidos = _ler_sse(resposta.text)
+        assert [e["event"] for e in lidos] == ["criado", "atualizado", "removido"]
+        assert lidos[0]["data"] == {campo: criado[campo] for campo in lidos[0]["data"]}
+        assert lidos[1]["data"]["telefone"] == "11000000000"
+        assert lidos[2]["data"] == {"id": criado["id"]}
+        assert barramento.estado()["assinantes"] == 0
+
+    def test_last_event_id_reset_e_404(self, client, barramento, monkeypatch):
+        monkeypatch.setattr(eventos, "EVENTOS_DURACAO_MAX_S", 0)
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        client.post("/candidatos/", json=candidato_payload(vaga_id, email="c0@example.com"))
+        primeiro = barramento.ultimo_id()
+        linhas = [candidato_payload(vaga_id, email=f"c{i}@example.com") for i in (1, 2)]
+        ids = [c["id"] for c in client.post("/candidatos/bulk", json=linhas).json()["criados"]]
+
+        retomada = client.get(f"/vagas/{vaga_id}/candidatos/stream", headers={"Last-Event-ID": primeiro})
+        assert [(e["event"], e["data"]["id"]) for e in _ler_sse(retomada.text)] == [("criado", i) for i in ids]
+
+        reset = _ler_sse(client.get(f"/vagas/{vaga_id}/candidatos/stream",
+                                    headers={"Last-Event-ID": "antigo-1"}).text)
+        assert reset == [{"id": barramento.ultimo_id(), "event": "reset", "data": {}}]
+        assert client.get("/vagas/999/candidatos/stream").status_code == 404
@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+import tracemalloc
+
+from sqlalchemy import insert
+
+from app import crud, export, models, schemas
+from tests.conftest import candidato_payload, vaga_payload
+
+
+def _semear(db_session, vaga_id, total):
+    linhas = [
+        dict(candidato_payload(vaga_id, email=f"c{i}@example.com", transcricao="t" * 2000), vetor=None)
+        for i in range(total)
+    ]
+    db_session.execute(insert(models.Candidato), linhas)
+    db_session.commit()
+
+
+def _pico_de_memoria(gerador) -> int:
+    tracemalloc.start()
+    try:
+        for _ in gerador:
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class TestExport:
+    """Testes da exportação em streaming"""
+
+    def test_csv(self, client, db_session):
+        vaga = crud.create_vaga(db_session, schemas.VagaCreate(**vaga_payload()))
+        _semear(db_session, vaga.id, 3)
+        response = client.get(f"/vagas/{vaga.id}/candidatos/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "attachment" in response.headers["content-disposition"]
+        linhas = list(csv.DictReader(io.StringIO(response.text)))
+        assert [l["email"] for l in linhas] == ["c0@example.com", "c1@example.com", "c2@example.com"]
+        assert "video" not in linhas[0]
+
+    def test_ndjson(self, client, db_session):
+        vaga = crud.create_vaga(db_session, schemas.VagaCreate(**vaga_payload()))
+        _semear(db_session, vaga.id, 2)
+        response = client.get(f"/vagas/{vaga.id}/candidatos/export", params={"format": "ndjson"})
+        registros = [json.loads(linha) for linha in response.text.splitlines()]
+        assert [r["email"] for r in registros] == ["c0@example.com", "c1@example.com"]
+        assert set(registros[0]) == set(export.CAMPOS_EXPORTACAO)
+
+    def test_vaga_inexistente_e_formato_invalido(self, client, db_session):
+        assert client.get("/vagas/999/candidatos/export").status_code == 404
+        vaga = crud.create_vaga(db_session, schemas.VagaCreate(**vaga_payload()))
+        assert client.get(f"/vagas/{vaga.id}/candidatos/export", params={"format": "xml"}).status_code == 422
+
+    def test_memoria_nao_cresce_com_o_numero_de_linhas(self, db_session):
+        pequena = crud.create_vaga(db_session, schemas.VagaCreate(**vaga_payload(slug="pequena")))
+        grande = crud.create_vaga(db_session, schemas.VagaCreate(**vaga_payload(slug="grande")))
+        _semear(db_session, pequena.id, 1000)
+        _semear(db_session, grande.id, 8000)
+
+        for gerar in (export.gerar_csv, export.gerar_ndjson):
+            pico_pequena = _pico_de_memoria(gerar(db_session, pequena.id, lote=200))
+            pico_grande = _pico_de_memoria(gerar(db_session, grande.id, lote=200))
+            # 8x mais linhas (~16 MB de transcrições) sem aumentar o pico de memória
+            assert pico_grande < pico_pequena * 1.5
+            assert pico_grande < 4 * 1024 * 1024
@@ -0,0 +1,61 @@
+import itertools
+
+from tests.conftest import ContadorQueries, candidato_payload, vaga_payload
+
+
+_sequencia = itertools.count()
+
+
+def _criar_vagas(client, quantidade, candidatos_por_vaga):
+    ids = []
+    for _ in range(quantidade):
+        i = next(_sequencia)
+        vaga_id = client.post("/vagas/", json=vaga_payload(slug=f"vaga-{i}")).json()["id"]
+        for j in range(candidatos_por_vaga):
+            client.post("/candidatos/", json=candidato_payload(vaga_id, email=f"c{i}-{j}@x.com"))
+        ids.append(vaga_id)
+    return ids
+
+
+class TestIncludeCandidatos:
+    def test_sem_include_nao_traz_candidatos(self, client):
+        vaga_id = _criar_vagas(client, 1, 2)[0]
+        assert "candidatos" not in client.get(f"/vagas/{vaga_id}").json()
+        assert all("candidatos" not in v for v in client.get("/vagas/").json())
+        assert all("candidatos" not in v for v in client.get("/vagas/?cursor=").json()["items"])
+
+    def test_vaga_com_candidatos_respeita_limite(self, client):
+        vaga_id = _criar_vagas(client, 1, 5)[0]
+        response = client.get(f"/vagas/{vaga_id}?include=candidatos&candidatos_limit=3")
+        assert response.status_code == 200
+        candidatos = response.json()["candidatos"]
+        assert [c["email"].split("-")[1] for c in candidatos] == ["0@x.com", "1@x.com", "2@x.com"]
+        assert all(c["vaga_id"] == vaga_id for c in candidatos)
+
+    def test_lista_agrupa_por_vaga(self, client):
+        ids = _criar_vagas(client, 3, 2)
+        vagas = client.get("/vagas/?cursor=&limit=2&include=candidatos&candidatos_limit=1").json()
+        assert [v["id"] for v in vagas["items"]] == ids[:2]
+        for vaga in vagas["items"]:
+            assert [c["vaga_id"] for c in vaga["candidatos"]] == [vaga["id"]]
+        assert vagas["next_cursor"]
+
+    def test_vaga_sem_candidatos_vem_com_lista_vazia(self, client):
+        vaga_id = _criar_vagas(client, 1, 0)[0]
+        assert client.get(f"/vagas/{vaga_id}?include=candidatos").json()["candidatos"] == []
+
+    def test_include_invalido(self, client):
+        vaga_id = _criar_vagas(client, 1, 0)[0]
+        assert client.get(f"/vagas/{vaga_id}?include=vaga").status_code == 400
+        assert client.get("/vagas/?include=candidatos&candidatos_limit=0").status_code == 422
+
+    def test_numero_de_queries_nao_cresce_com_as_vagas(self, client, engine):
+        _criar_vagas(client, 2, 3)
+        with ContadorQueries(engine) as poucas:
+            assert len(client.get("/vagas/?include=candidatos").json()) == 2
+
+        _criar_vagas(client, 8, 3)
+        with ContadorQueries(engine) as muitas:
+            vagas = client.get("/vagas/?include=candidatos").json()
+        assert len(vagas) == 10 and all(len(v["candidatos"]) == 3 for v in vagas)
+        assert poucas.total == muitas.total == 2, muitas.statements
@@ -0,0 +1,31 @@
+import asyncio
+import random
+
+from sqlalchemy import create_engine
+
+from benchmarks import loadtest
+
+
+class TestLoadtest:
+    """O teste de carga cobre todas as rotas e detecta regressões"""
+
+    def test_todas_as_rotas_tem_cenario(self):
+        assert loadtest.rotas_sem_cenario() == set()
+
+    def test_comparar_baseline(self):
+        base = {"GET /": {"p95_ms": 10.0, "rps": 100.0, "erros": 0}}
+        assert loadtest.comparar(base, {"GET /": {"p95_ms": 12.0, "rps": 90.0, "erros": 0}}, 0.25) == []
+        regressoes = loadtest.comparar(base, {"GET /": {"p95_ms": 13.0, "rps": 70.0, "erros": 1}}, 0.25)
+        assert len(regressoes) == 3
+
+    def test_execucao_pequena_sem_erros(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'carga.db'}")
+        assert loadtest.popular(engine, vagas=3, candidatos=30, transcricao=300, semente=1)
+        assert not loadtest.popular(engine, vagas=3, candidatos=30, transcricao=300, semente=1)
+
+        ctx = loadtest.Contexto(vagas=3, candidatos=30, rng=random.Random(1))
+        resultados = asyncio.run(loadtest.executar(engine, ctx, requisicoes=2, concorrencia=2))
+        engine.dispose()
+
+        assert set(resultados) == {cenario.rotulo for cenario in loadtest.CENARIOS}
+        assert {rota: r["status_erros"] for rota, r in resultados.items() if r["erros"]} == {}
@@ -0,0 +1,64 @@
+import numpy as np
+from sqlalchemy import update
+
+from app import crud, matching, models, schemas
+from tests.conftest import ContadorQueries, candidato_payload, vaga_payload
+
+
+class TestMatching:
+    """Testes do ranking de candidatos por vaga"""
+
+    def test_vetores_normalizados_e_estaveis(self):
+        matriz = matching.vetorizar_lote([("Python", "Django e FastAPI"), ("", "")])
+        assert matriz.shape == (2, matching.DIMENSOES)
+        assert np.isclose(np.linalg.norm(matriz[0]), 1.0)
+        assert not matriz[1].any()
+        assert matching.vetorizar("Python", "Django e FastAPI") == matching.vetor_para_bytes(matriz[0])
+
+    def test_ranking_ordena_por_aderencia(self, client, db_session):
+        vaga = crud.create_vaga(db_session, schemas.VagaCreate(**vaga_payload(
+            nome_vaga="Engenheiro de Dados",
+            desc_vaga="Pipelines com Spark, Airflow e SQL em nuvem")))
+        perfis = [
+            ("Cozinha", "Trabalho como chef de cozinha italiana"),
+            ("Spark, Airflow, SQL", "Construo pipelines de dados em nuvem com Spark e Airflow"),
+            ("SQL", "Analista de dados, uso SQL todos os dias"),
+        ]
+        ids = [crud.create_candidato(db_session, schemas.CandidatoCreate(
+            **candidato_payload(vaga.id, email=f"{i}@x.com", skill=skill, transcricao=texto))).id
+            for i, (skill, texto) in enumerate(perfis)]
+
+        ranking = client.get(f"/vagas/{vaga.id}/ranking").json()
+        assert [c["id"] for c in ranking] == [ids[1], ids[2], ids[0]]
+        assert ranking[0]["score"] > ranking[1]["score"] > ranking[2]["score"]
+        assert "transcricao" not in ranking[0]
+        assert len(client.get(f"/vagas/{vaga.id}/ranking", params={"limit": 1}).json()) == 1
+        for limite in (-5, 0, 101):
+            assert client.get(f"/vagas/{vaga.id}/ranking", params={"limit": limite}).status_code == 422
+
+    def test_vetor_gravado_no_insert_e_recalculado_apos_update(self, client, db_session, engine):
+        vaga = crud.create_vaga(db_session, schemas.VagaCreate(**vaga_payload(desc_vaga="Vaga para Rust")))
+        with ContadorQueries(engine) as contador:
+            candidato = crud.create_candidato(db_session, schemas.CandidatoCreate(**candidato_payload(vaga.id)))
+        assert contador.total == 1
+
+        # Só a skill: o UPDATE anula o vetor e um segundo grava o calculado com a transcrição do RETURNING
+        with ContadorQueries(engine) as contador:
+            client.put(f"/candidatos/{candidato.id}", json={"skill": "Rust"})
+        assert contador.total == 2
+        db_session.expire_all()
+        vetor = matching.vetorizar("Rust", candidato.transcricao)
+        assert db_session.get(models.Candidato, candidato.id).vetor == vetor
+
+        # Vetor ausente (linha antiga): o ranking calcula em memória e não grava nada
+        db_session.execute(update(models.Candidato).values(vetor=None))
+        db_session.commit()
+        with ContadorQueries(engine) as contador:
+            ranking = client.get(f"/vagas/{vaga.id}/ranking").json()
+        assert ranking[0]["score"] > 0
+        assert not any(sql.lstrip().upper().startswith("UPDATE") for sql in contador.statements)
+        db_session.expire_all()
+        assert db_session.get(models.Candidato, candidato.id).vetor is None
+
+    def test_vaga_inexistente(self, client):
+        assert client.get("/vagas/999/ranking").status_code == 404
@@ -0,0 +1,56 @@
+import pytest
+
+from app import metrics
+from tests.conftest import vaga_payload
+
+
+@pytest.fixture
+def registro(engine):
+    """Registro zerado e engine de teste instrumentado"""
+    metrics.instrumentar_engine(engine)
+    metrics.registro.zerar()
+    yield metrics.registro
+    metrics.registro.zerar()
+
+
+def _amostra(texto: str, prefixo: str) -> float:
+    linhas = [linha for linha in texto.splitlines() if linha.startswith(prefixo)]
+    assert len(linhas) == 1, linhas
+    return float(linhas[0].rsplit(" ", 1)[1])
+
+
+class TestMetrics:
+    """Testes do middleware de métricas e do endpoint /metrics"""
+
+    def test_latencia_status_e_queries_por_rota(self, client, registro):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        client.get(f"/vagas/{vaga_id}")
+        client.get(f"/vagas/{vaga_id + 1}")
+        client.get(f"/vagas/{vaga_id}", params={"include": "candidatos"})
+
+        texto = client.get("/metrics").text
+        rota = 'method="GET",route="/vagas/{vaga_id}"'
+        assert _amostra(texto, f"hireai_http_request_duration_seconds_count{{{rota}}}") == 3
+        assert _amostra(texto, f'hireai_http_request_duration_seconds_bucket{{{rota},le="+Inf"}}') == 3
+        assert _amostra(texto, f'hireai_http_requests_total{{{rota},status="200"}}') == 2
+        assert _amostra(texto, f'hireai_http_requests_total{{{rota},status="404"}}') == 1
+        assert _amostra(texto, f"hireai_db_queries_total{{{rota}}}") == 4
+        assert _amostra(texto, 'hireai_db_queries_total{method="POST",route="/vagas/"}') == 1
+        assert _amostra(texto, f"hireai_db_seconds_total{{{rota}}}") > 0
+
+    def test_rota_inexistente_nao_explode_cardinalidade(self, client, registro):
+        client.get("/nao-existe/1")
+        client.get("/nao-existe/2")
+        texto = client.get("/metrics").text
+        assert _amostra(texto, f'hireai_http_requests_total{{method="GET",route="{metrics.SEM_ROTA}",status="404"}}') == 2
+
+    def test_buckets_acumulados(self):
+        registro = metrics.Registro()
+        for duracao in (0.001, 0.005, 0.3, 20):
+            registro.registrar("GET", "/x", 200, duracao, metrics._Requisicao())
+        texto = registro.exportar()
+        rota = 'method="GET",route="/x"'
+        assert _amostra(texto, f'hireai_http_request_duration_seconds_bucket{{{rota},le="0.005"}}') == 2
+        assert _amostra(texto, f'hireai_http_request_duration_seconds_bucket{{{rota},le="0.5"}}') == 3
+        assert _amostra(texto, f'hireai_http_request_duration_seconds_bucket{{{rota},le="10.0"}}') == 3
+        assert _amostra(texto, f'hireai_http_request_duration_seconds_bucket{{{rota},le="+Inf"}}') == 4
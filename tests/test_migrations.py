@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import main
+from app import migrations, search
+
+# Schema de antes do ranking, da busca textual e do blob store: sem candidato.vetor, video_* e índice FTS
+_SCHEMA_ANTIGO = [
+    """CREATE TABLE vagas (id INTEGER PRIMARY KEY, created_at DATETIME, nome_vaga VARCHAR NOT NULL,
+        desc_vaga TEXT NOT NULL, modelo_trab VARCHAR NOT NULL, modelo_cont VARCHAR NOT NULL,
+        slug VARCHAR NOT NULL UNIQUE)""",
+    """CREATE TABLE candidato (id INTEGER PRIMARY KEY, created_at DATETIME, nome_completo VARCHAR NOT NULL,
+        telefone VARCHAR NOT NULL, email VARCHAR NOT NULL, skill TEXT NOT NULL, video TEXT NOT NULL,
+        transcricao TEXT NOT NULL, "Perfil" TEXT NOT NULL, video_url TEXT NOT NULL,
+        vaga_id INTEGER NOT NULL REFERENCES vagas (id))""",
+    "INSERT INTO vagas VALUES (1, NULL, 'Dev', 'Python', 'Remoto', 'CLT', 'dev')",
+    "INSERT INTO candidato VALUES (1, NULL, 'Ana', '1', 'ana@x.com', 'Kubernetes', '', '', '', '', 1)",
+]
+
+
+@pytest.fixture
+def arquivo_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migracao.db'}")
+    yield engine
+    engine.dispose()
+
+
+class TestMigrations:
+    """Testes da criação de schema fora da importação da aplicação"""
+
+    def test_importar_main_nao_cria_engine(self):
+        env = {k: v for k, v in os.environ.items() if k != "DATABASE_URL"}
+        codigo = "import main, app.database as d; assert d._engine is None and d._async_engine is None"
+        subprocess.run([sys.executable, "-c", codigo], check=True, env=env, cwd=os.path.dirname(main.__file__))
+
+    def test_migrar_banco_novo_e_idempotente(self, arquivo_engine):
+        assert [nome for nome, _ in migrations.migrar(arquivo_engine)] == [nome for nome, _ in migrations.PASSOS]
+        migrations.migrar(arquivo_engine)
+        assert {"vagas", "candidato", "candidato_fts"} <= set(inspect(arquivo_engine).get_table_names())
+
+    def test_migrar_banco_antigo(self, arquivo_engine):
+        with arquivo_engine.begin() as conexao:
+            for ddl in _SCHEMA_ANTIGO:
+                conexao.execute(text(ddl))
+
+        migrations.migrar(arquivo_engine)
+
+        colunas = {coluna["name"] for coluna in inspect(arquivo_engine).get_columns("candidato")}
+        assert {"vetor", "video_digest", "video_tamanho", "video_tipo"} <= colunas
+        with arquivo_engine.connect() as conexao:
+            assert conexao.scalar(text("SELECT total_candidatos FROM vagas WHERE id = 1")) == 1
+        with Session(arquivo_engine) as db:
+            assert [linha["id"] for linha in search.buscar(db, "kubernetes")] == [1]
+        with arquivo_engine.connect() as conexao:
+            indices = migrations._nomes_de_indices(conexao, "candidato")
+        assert {"ix_candidato_vaga_criacao", "ux_candidato_vaga_email"} <= indices
+
+    def test_candidaturas_repetidas_bloqueiam_o_indice_unico(self, arquivo_engine):
+        with arquivo_engine.begin() as conexao:
+            for ddl in _SCHEMA_ANTIGO:
+                conexao.execute(text(ddl))
+            # Mesmo e-mail (com outra caixa) na mesma vaga
+            conexao.execute(text("INSERT INTO candidato VALUES (2, NULL, 'Ana', '1', 'ANA@x.com', '', '', '', '', '', 1)"))
+
+        with pytest.raises(RuntimeError, match="1 candidatura"):
+            migrations.migrar(arquivo_engine)
+        migrations.migrar(arquivo_engine, remover_repetidas=True)
+
+        with arquivo_engine.connect() as conexao:
+            assert conexao.scalar(text("SELECT group_concat(id) FROM candidato")) == "1"
+            assert conexao.scalar(text("SELECT total_candidatos FROM vagas WHERE id = 1")) == 1
+            with pytest.raises(IntegrityError):
+                conexao.execute(text("INSERT INTO candidato (nome_completo, telefone, email, skill, video, "
+                                     "transcricao, \"Perfil\", video_url, vaga_id) "
+                                     "VALUES ('Ana', '1', 'Ana@X.com', '', '', '', '', '', 1)"))
+
+    def test_lifespan_pode_ser_desligado(self, monkeypatch):
+        chamadas = []
+        monkeypatch.setattr(migrations, "migrar", lambda: chamadas.append(1))
+        with TestClient(main.app):
+            pass
+        monkeypatch.setattr(main, "DB_CREATE_SCHEMA", False)
+        with TestClient(main.app):
+            pass
+        assert chamadas == [1]
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app import crud, models, pagination, schemas
+from tests.conftest import candidato_payload, vaga_payload
+
+
+def _criar_vagas(client, total):
+    return [
+        client.post("/vagas/", json=vaga_payload(slug=f"vaga-{i}")).json()["id"]
+        for i in range(total)
+    ]
+
+
+class TestCursorPagination:
+    """Testes da paginação por cursor (keyset)"""
+
+    def test_cursor_roundtrip(self):
+        cursor = pagination.codificar_cursor(42)
+        assert pagination.decodificar_cursor(cursor) == 42
+        assert pagination.decodificar_cursor("") is None
+
+    def test_percorre_todas_as_vagas(self, client):
+        ids = _criar_vagas(client, 7)
+        vistos, cursor = [], ""
+        while cursor is not None:
+            response = client.get("/vagas/", params={"cursor": cursor, "limit": 3})
+            assert response.status_code == 200
+            data = response.json()
+            vistos.extend(v["id"] for v in data["items"])
+            cursor = data["next_cursor"]
+        assert vistos == ids
+
+    def test_ultima_pagina_sem_cursor(self, client):
+        _criar_vagas(client, 3)
+        data = client.get("/vagas/", params={"cursor": "", "limit": 3}).json()
+        assert len(data["items"]) == 3
+        assert data["next_cursor"] is None
+
+    def test_skip_limit_continua_retornando_lista(self, client):
+        ids = _criar_vagas(client, 5)
+        response = client.get("/vagas/?skip=2&limit=2")
+        assert response.status_code == 200
+        assert [v["id"] for v in response.json()] == ids[2:4]
+
+    def test_limites_fora_da_faixa_respondem_422(self, client):
+        vaga_id = _criar_vagas(client, 1)[0]
+        for url in ("/vagas/", "/candidatos/", f"/vagas/{vaga_id}/candidatos/"):
+            for params in ({"limit": 0}, {"limit": 101}, {"skip": -1}):
+                assert client.get(url, params=params).status_code == 422, (url, params)
+        assert client.get("/candidatos/search", params={"q": "python", "limit": 0}).status_code == 422
+
+    def test_cursor_invalido(self, client):
+        response = client.get("/candidatos/", params={"cursor": "não-é-cursor"})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Cursor inválido"
+
+    def test_candidatos_por_vaga_com_cursor(self, client, db_session):
+        vaga_a, vaga_b = _criar_vagas(client, 2)
+        for i in range(5):
+            crud.create_candidato(db_session, schemas.CandidatoCreate(
+                **candidato_payload(vaga_a, email=f"a{i}@example.com")))
+            crud.create_candidato(db_session, schemas.CandidatoCreate(
+                **candidato_payload(vaga_b, email=f"b{i}@example.com")))
+
+        primeira = client.get(f"/vagas/{vaga_a}/candidatos/", params={"cursor": "", "limit": 4}).json()
+        segunda = client.get(f"/vagas/{vaga_a}/candidatos/",
+                             params={"cursor": primeira["next_cursor"], "limit": 4}).json()
+        emails = [c["email"] for c in primeira["items"] + segunda["items"]]
+        assert emails == [f"a{i}@example.com" for i in range(5)]
+        assert segunda["next_cursor"] is None
+
+    def test_cursor_ancorado_na_propria_vaga(self, client, db_session):
+        """Mesmo created_at em toda a vaga e ids fora da ordem de inscrição: nada repete nem some"""
+        vaga_a, vaga_b = _criar_vagas(client, 2)
+        mesmo_instante = datetime(2024, 1, 1, 12, 0, 0)
+        for i, (vaga_id, minutos) in enumerate([(vaga_a, 1), (vaga_b, 0), (vaga_a, 1), (vaga_a, 0), (vaga_b, 2)]):
+            db_session.execute(insert(models.Candidato).values(
+                **candidato_payload(vaga_id, email=f"c{i}@example.com"),
+                created_at=mesmo_instante + timedelta(minutes=minutos)))
+        db_session.commit()
+
+        vistos, cursor = [], ""
+        while cursor is not None:
+            data = client.get(f"/vagas/{vaga_a}/candidatos/", params={"cursor": cursor, "limit": 1}).json()
+            vistos += [c["email"] for c in data["items"]]
+            cursor = data["next_cursor"]
+        assert vistos == ["c3@example.com", "c0@example.com", "c2@example.com"]
+
+        # Cursor de um candidato de outra vaga: continua pela vaga pedida, sem pular ninguém
+        outra = pagination.codificar_cursor(2)
+        data = client.get(f"/vagas/{vaga_a}/candidatos/", params={"cursor": outra}).json()
+        assert [c["email"] for c in data["items"]] == ["c2@example.com"]
+
+    def test_cursor_de_candidato_removido(self, client, db_session):
+        vaga_a, vaga_b = _criar_vagas(client, 2)
+        for i in range(6):
+            crud.create_candidato(db_session, schemas.CandidatoCreate(
+                **candidato_payload((vaga_a, vaga_b)[i % 2], email=f"c{i}@example.com")))
+
+        primeira = client.get(f"/vagas/{vaga_a}/candidatos/", params={"cursor": "", "limit": 2}).json()
+        client.delete(f"/candidatos/{primeira['items'][-1]['id']}")
+        segunda = client.get(f"/vagas/{vaga_a}/candidatos/", params={"cursor": primeira["next_cursor"]}).json()
+        assert [c["email"] for c in segunda["items"]] == ["c4@example.com"]
@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.database import opcoes_pool
+from app.pool import PoolInstrumentado, resumo
+
+
+@pytest.fixture
+def pool_engine(tmp_path):
+    """Engine com pool instrumentado de uma única conexão e timeout curto"""
+    PoolInstrumentado.estatisticas.zerar()
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=PoolInstrumentado, pool_size=1, max_overflow=0, pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+    PoolInstrumentado.estatisticas.zerar()
+
+
+class TestPool:
+    """Testes do pool de conexões configurável e instrumentado"""
+
+    def test_opcoes_pool_lidas_do_ambiente(self):
+        opcoes = opcoes_pool("postgresql://u:p@host/db")
+        assert opcoes["poolclass"] is PoolInstrumentado
+        assert {"pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping"} <= set(opcoes)
+        assert opcoes_pool("sqlite://") == {}
+
+    def test_conta_checkouts_e_esgotamentos(self, pool_engine):
+        with pool_engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                pool_engine.connect()
+        with pool_engine.connect():
+            pass
+
+        dados = resumo(pool_engine.pool)
+        assert dados["checkouts"] == 2
+        assert dados["esgotamentos"] == 1
+        assert dados["esperas"] == 1
+        assert dados["tempo_checkout_max_ms"] >= 50
+        assert dados["em_uso"] == 0
+
+    def test_endpoint_diagnostico(self, client):
+        response = client.get("/diagnostico/pool")
+        assert response.status_code == 200
+        assert "classe" in response.json()["sincrono"]
@@ -0,0 +1,188 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, matching, models, processamento
+from tests.conftest import candidato_payload, vaga_payload
+
+
+class ProcessadorInstavel(processamento.ProcessadorOffline):
+    """Falha nas primeiras `falhas` transcrições"""
+
+    def __init__(self, falhas: int):
+        self.falhas = falhas
+        self.chamadas = 0
+
+    async def transcrever(self, candidato):
+        self.chamadas += 1
+        if self.chamadas <= self.falhas:
+            raise RuntimeError(f"serviço indisponível ({self.chamadas})")
+        return await super().transcrever(candidato)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """SQLite em arquivo: os workers do pipeline e as requisições usam conexões próprias
+
+    O banco em memória do conftest compartilha uma única conexão (StaticPool)
+    entre todas as threads, o que não suporta escritas concorrentes.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'pipeline.db'}", connect_args={"check_same_thread": False})
+    models.Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def configurar(engine):
+    """Troca o pipeline por um ligado ao banco de teste (threadpool no lugar de processos, sem espera)"""
+    anterior = processamento.pipeline
+    Sessao = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+
+    def configurar(**opcoes):
+        opcoes = {"sessoes": Sessao, "processos": 0, "espera": 0.01, **opcoes}
+        processamento.configurar_pipeline(processamento.Pipeline(**opcoes))
+        return processamento.pipeline
+
+    configurar()
+    yield configurar
+    processamento.configurar_pipeline(anterior)
+
+
+class ProcessadorBloqueado(processamento.ProcessadorOffline):
+    """Segura a transcrição até `liberar` ser sinalizado"""
+
+    def __init__(self):
+        self.iniciado = threading.Event()
+        self.liberar = threading.Event()
+
+    async def transcrever(self, candidato):
+        self.iniciado.set()
+        while not self.liberar.is_set():
+            await asyncio.sleep(0.01)
+        return await super().transcrever(candidato)
+
+
+def _pendente(vaga_id, **extra):
+    dados = candidato_payload(vaga_id, **extra)
+    del dados["transcricao"], dados["Perfil"]
+    return dados
+
+
+def _esperar(client, candidato_id, status, tentativas=500):
+    for _ in range(tentativas):
+        estado = client.get(f"/candidatos/{candidato_id}/processamento").json()
+        if estado["status"] == status:
+            return estado
+        time.sleep(0.01)
+    raise AssertionError(estado)
+
+
+class TestProcessamento:
+    """Pipeline de transcrição e perfil em segundo plano"""
+
+    def test_candidato_pendente_e_processado(self, client, configurar):
+        with client:
+            vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+            criado = client.post("/candidatos/", json=_pendente(vaga_id))
+            assert criado.status_code == 201
+            assert criado.json()["status_processamento"] == "pendente"
+            candidato_id = criado.json()["id"]
+
+            assert _esperar(client, candidato_id, "concluido")["erro"] is None
+            candidato = client.get(f"/candidatos/{candidato_id}").json()
+            assert candidato["transcricao"] == "[transcrição offline de https://example.com/video.mp4]"
+            assert candidato["Perfil"].startswith("Skills: Python, FastAPI, SQL.")
+            assert [c["id"] for c in client.get(f"/vagas/{vaga_id}/ranking").json()] == [candidato_id]
+
+    def test_candidato_completo_nao_passa_pelo_pipeline(self, client, configurar):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        candidato = client.post("/candidatos/", json=candidato_payload(vaga_id)).json()
+        assert candidato["status_processamento"] is None
+        assert processamento.pipeline.aguardando == 0
+
+    def test_tentativas_e_erro(self, client, configurar):
+        configurar(processador=ProcessadorInstavel(falhas=2), tentativas=3)
+        with client:
+            vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+            candidato_id = client.post("/candidatos/", json=_pendente(vaga_id)).json()["id"]
+            assert _esperar(client, candidato_id, "concluido")["erro"] is None
+
+        configurar(processador=ProcessadorInstavel(falhas=10), tentativas=2)
+        with client:
+            candidato_id = client.post("/candidatos/", json=_pendente(vaga_id, email="b@example.com")).json()["id"]
+            assert _esperar(client, candidato_id, "erro")["erro"] == "serviço indisponível (2)"
+
+    def test_fila_cheia_responde_503_sem_criar(self, client, configurar, db_session):
+        pipeline = configurar(fila_max=0)
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        resposta = client.post("/candidatos/", json=_pendente(vaga_id))
+        assert resposta.status_code == 503
+        assert int(resposta.headers["retry-after"]) >= 1
+        assert db_session.scalar(select(func.count()).select_from(models.Candidato)) == 0
+        assert pipeline.aguardando == 0
+
+    def test_pendentes_retomados_ao_subir(self, client, configurar, db_session):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        db_session.add(models.Candidato(**{**candidato_payload(vaga_id), "transcricao": "", "Perfil": "",
+                                           "status_processamento": "processando"}))
+        db_session.commit()
+        candidato_id = db_session.scalar(select(models.Candidato.id))
+        with client:
+            _esperar(client, candidato_id, "concluido")
+
+    def test_reserva_atomica_e_vencida(self, client, configurar, db_session):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        db_session.add(models.Candidato(**{**candidato_payload(vaga_id), "transcricao": "", "Perfil": "",
+                                           "status_processamento": "pendente"}))
+        db_session.commit()
+        candidato_id = db_session.scalar(select(models.Candidato.id))
+
+        assert crud.reservar_candidato(db_session, candidato_id, reserva_s=600) is not None
+        # Outro worker (ou outro processo ao subir) não pega o mesmo candidato
+        assert crud.reservar_candidato(db_session, candidato_id, reserva_s=600) is None
+        assert crud.get_candidatos_pendentes(db_session, reserva_s=600) == []
+        # Com a reserva vencida o candidato é retomado
+        assert crud.get_candidatos_pendentes(db_session, reserva_s=-1) == [candidato_id]
+        assert crud.reservar_candidato(db_session, candidato_id, reserva_s=-1) is not None
+
+    def test_edicao_durante_o_processamento_e_mantida(self, client, configurar, db_session):
+        processador = ProcessadorBloqueado()
+        configurar(processador=processador)
+        with client:
+            vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+            candidato_id = client.post("/candidatos/", json=_pendente(vaga_id)).json()["id"]
+            assert processador.iniciado.wait(5)
+            editado = {"skill": "Go, Kubernetes", "Perfil": "Perfil escrito pelo recrutador"}
+            assert client.put(f"/candidatos/{candidato_id}", json=editado).status_code == 200
+            processador.liberar.set()
+            _esperar(client, candidato_id, "concluido")
+
+            candidato = client.get(f"/candidatos/{candidato_id}").json()
+            assert {campo: candidato[campo] for campo in editado} == editado
+            assert candidato["transcricao"] == "[transcrição offline de https://example.com/video.mp4]"
+            # O vetor calculado com a skill antiga não foi gravado: vale o dos textos atuais
+            vetor = matching.vetorizar(editado["skill"], candidato["transcricao"])
+            assert db_session.scalar(select(models.Candidato.vetor)) == vetor
+            assert client.get(f"/vagas/{vaga_id}/ranking").json()[0]["id"] == candidato_id
+
+    def test_perfil_gerado_em_outro_processo(self, client, configurar):
+        configurar(processos=1)
+        with client:
+            vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+            candidato_id = client.post("/candidatos/", json=_pendente(vaga_id)).json()["id"]
+            _esperar(client, candidato_id, "concluido", tentativas=3000)
+            assert client.get(f"/candidatos/{candidato_id}").json()["Perfil"].startswith("Skills:")
+
+    def test_bulk_exige_os_textos(self, client):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        data = client.post("/candidatos/bulk", json=[_pendente(vaga_id)]).json()
+        assert data["total_inseridos"] == 0
+        assert data["erros"][0]["erros"] == ["transcricao, Perfil: obrigatórios na importação em lote"]
+
+    def test_processamento_de_candidato_inexistente(self, client):
+        assert client.get("/candidatos/999/processamento").status_code == 404
@@ -0,0 +1,97 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from app import profiler
+from tests.conftest import candidato_payload, vaga_payload
+
+
+class CursorFalho:
+    """Cursor DBAPI que falha no primeiro `falhar_em` executado"""
+
+    def __init__(self, falhar_em):
+        self.falhar_em = falhar_em
+        self.executados = []
+        self.fechado = False
+
+    def execute(self, sql, parametros=()):
+        self.executados.append(sql)
+        if sql.startswith(self.falhar_em):
+            raise RuntimeError(f"falhou: {sql}")
+
+    def fetchall(self):
+        return [("Seq Scan on candidato",)]
+
+    def close(self):
+        self.fechado = True
+
+
+@pytest.fixture
+def perfil(engine, monkeypatch):
+    """Profiler que registra todos os statements do engine de teste"""
+    instancia = profiler.Profiler(limite_ms=0)
+    instancia.instalar(engine)
+    monkeypatch.setattr(profiler, "profiler", instancia)
+    return instancia
+
+
+class TestProfiler:
+    """Testes do log de queries lentas"""
+
+    def test_normalizar_agrupa_valores_e_listas(self):
+        a = profiler.normalizar("SELECT * FROM candidato WHERE id IN (?, ?, ?) AND email = 'a@x.com' LIMIT 10")
+        b = profiler.normalizar("SELECT *  FROM candidato\n WHERE id IN (?) AND email = 'b@y.com' LIMIT 20")
+        assert a == b == "SELECT * FROM candidato WHERE id IN (?+) AND email = ? LIMIT ?"
+        assert profiler.normalizar("INSERT INTO t (a, b) VALUES (%(a_m0)s, %(b_m0)s), (%(a_m1)s, %(b_m1)s)") == \
+            "INSERT INTO t (a, b) VALUES (?+), ..."
+        assert profiler.impressao_digital("SELECT 1 FROM t WHERE id = :id_1") == \
+            profiler.impressao_digital("SELECT 1 FROM t WHERE id = :id_2")
+
+    def test_mascarar_pii(self):
+        assert profiler.mascarar(("ana@x.com", 42, None)) == ["<9 chars>", 42, None]
+        assert profiler.mascarar({"email_1": "ana@x.com", "limit": 5}) == {"email_1": "<9 chars>", "limit": 5}
+
+    def test_registra_rota_plano_e_deduplica(self, client, perfil, caplog):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        with caplog.at_level(logging.WARNING, logger="hireai.slow_query"):
+            client.post("/candidatos/", json=candidato_payload(vaga_id, email="ana@x.com"))
+            client.get(f"/vagas/{vaga_id}/candidatos/")
+            client.get(f"/vagas/{vaga_id}/candidatos/")
+
+        formas = client.get("/diagnostico/queries-lentas").json()["formas"]
+        listagem = [f for f in formas if "WHERE candidato.vaga_id = ?" in f["sql"]]
+        assert len(listagem) == 1
+        assert listagem[0]["ocorrencias"] == 2
+        assert listagem[0]["rotas"] == ["GET /vagas/{vaga_id}/candidatos/"]
+        assert "candidato" in listagem[0]["plano"]
+
+        assert sum("plano:" in r.message and "vaga_id = ?" in r.message for r in caplog.records) == 1
+        assert "ana@x.com" not in caplog.text
+
+    def test_sem_explain_depois_do_limite_de_formas(self, client, perfil, monkeypatch):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        monkeypatch.setattr(profiler, "MAX_FORMAS", len(perfil.formas))
+        explicados = []
+        monkeypatch.setattr(profiler, "explicar", lambda conn, sql, parametros: explicados.append(sql))
+
+        client.get(f"/vagas/{vaga_id}/candidatos/")
+        client.get("/vagas/stats")
+        assert explicados == []
+        assert len(perfil.formas) == profiler.MAX_FORMAS
+
+    def test_desligado(self, client, monkeypatch):
+        monkeypatch.setattr(profiler, "profiler", None)
+        assert client.get("/diagnostico/queries-lentas").json() == {"ativo": False, "limite_ms": None, "formas": []}
+
+    @pytest.mark.parametrize("falhar_em", ["SAVEPOINT", "EXPLAIN", "ROLLBACK TO"])
+    def test_explain_nunca_levanta(self, falhar_em):
+        cursor = CursorFalho(falhar_em)
+        conn = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"),
+                               connection=SimpleNamespace(cursor=lambda: cursor))
+        assert profiler.explicar(conn, "SELECT * FROM candidato WHERE id = %s", (1,)) is None
+        assert cursor.fechado
+        if falhar_em == "EXPLAIN":
+            # O erro do EXPLAIN é desfeito no savepoint antes de devolver a transação à requisição
+            assert cursor.executados[-2:] == ["ROLLBACK TO SAVEPOINT hireai_explain",
+                                              "RELEASE SAVEPOINT hireai_explain"]
@@ -0,0 +1,45 @@
+from sqlalchemy import update
+
+from app import models, projection
+from tests.conftest import ContadorQueries, candidato_payload, vaga_payload
+
+
+class TestProjection:
+    """Testes das listagens leves de candidatos"""
+
+    def _criar(self, client):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        candidato = client.post("/candidatos/", json=candidato_payload(vaga_id, transcricao="x" * 10_000)).json()
+        return vaga_id, candidato
+
+    def test_listagem_usa_resumo_sem_colunas_pesadas(self, client, engine, db_session):
+        vaga_id, candidato = self._criar(client)
+        db_session.execute(update(models.Candidato).values(status_processamento="erro"))
+        db_session.commit()
+        with ContadorQueries(engine) as contador:
+            data = client.get(f"/vagas/{vaga_id}/candidatos/").json()
+        assert set(data[0]) == set(projection.CAMPOS_RESUMO)
+        assert data[0]["status_processamento"] == "erro"
+        assert "transcricao" not in contador.statements[0]
+        assert "video" not in contador.statements[0]
+
+        completo = client.get(f"/candidatos/{candidato['id']}").json()
+        assert len(completo["transcricao"]) == 10_000
+
+    def test_fields_escolhe_colunas(self, client, engine):
+        self._criar(client)
+        with ContadorQueries(engine) as contador:
+            data = client.get("/candidatos/", params={"fields": "nome_completo,skill"}).json()
+        assert set(data[0]) == {"id", "nome_completo", "skill"}
+        assert "transcricao" not in contador.statements[0]
+
+    def test_fields_com_cursor(self, client):
+        self._criar(client)
+        data = client.get("/candidatos/", params={"fields": "email", "cursor": ""}).json()
+        assert data["items"] == [{"id": data["items"][0]["id"], "email": "maria@example.com"}]
+        assert data["next_cursor"] is None
+
+    def test_fields_invalido(self, client):
+        response = client.get("/candidatos/", params={"fields": "email,senha"})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Campos inválidos: senha"
@@ -0,0 +1,44 @@
+from tests.conftest import ContadorQueries, candidato_payload, vaga_payload
+
+
+class TestQueryCount:
+    """Cada rota de escrita deve custar exatamente um statement SQL"""
+
+    def _um_statement(self, engine, requisicao):
+        with ContadorQueries(engine) as contador:
+            response = requisicao()
+        assert contador.total == 1, contador.statements
+        return response
+
+    def test_escritas_de_vaga(self, client, engine):
+        response = self._um_statement(engine, lambda: client.post("/vagas/", json=vaga_payload()))
+        assert response.status_code == 201
+        vaga = response.json()
+        assert vaga["id"] and vaga["created_at"]
+
+        response = self._um_statement(
+            engine, lambda: client.put(f"/vagas/{vaga['id']}", json={"nome_vaga": "Dev Sênior"}))
+        assert response.json()["nome_vaga"] == "Dev Sênior"
+        assert response.json()["created_at"] == vaga["created_at"]
+
+        response = self._um_statement(engine, lambda: client.delete(f"/vagas/{vaga['id']}"))
+        assert response.status_code == 200
+
+    def test_escritas_de_candidato(self, client, engine):
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+
+        response = self._um_statement(engine, lambda: client.post("/candidatos/", json=candidato_payload(vaga_id)))
+        assert response.status_code == 201
+        candidato = response.json()
+
+        response = self._um_statement(
+            engine, lambda: client.put(f"/candidatos/{candidato['id']}", json={"skill": "Go", "transcricao": "gRPC"}))
+        assert response.json()["skill"] == "Go"
+        assert response.json()["email"] == candidato["email"]
+
+        response = self._um_statement(engine, lambda: client.delete(f"/candidatos/{candidato['id']}"))
+        assert response.status_code == 200
+
+    def test_inexistentes_continuam_404(self, client, engine):
+        assert self._um_statement(engine, lambda: client.put("/vagas/999", json={"slug": "x"})).status_code == 404
+        assert self._um_statement(engine, lambda: client.delete("/candidatos/999")).status_code == 404
@@ -0,0 +1,106 @@
+import shutil
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, text
+
+from app import database, models
+from main import app
+from tests.conftest import candidato_payload, vaga_payload
+
+
+def _engine(caminho):
+    return create_engine(f"sqlite:///{caminho}", connect_args={"check_same_thread": False})
+
+
+@pytest.fixture
+def bancos(tmp_path, monkeypatch):
+    """Dois SQLite em arquivo: o primário e uma réplica (cópia feita quando o teste pedir)"""
+    primario = _engine(tmp_path / "primario.db")
+    models.Base.metadata.create_all(bind=primario)
+    replica = _engine(tmp_path / "replica.db")
+
+    def replicar():
+        """Copia o primário para a réplica (a "replicação" só acontece aqui)"""
+        primario.dispose()
+        replica.dispose()
+        shutil.copy(tmp_path / "primario.db", tmp_path / "replica.db")
+
+    replicar()
+    bind_anterior = database.SessionLocal.kw.get("bind")
+    monkeypatch.setattr(database, "_engine", primario)
+    monkeypatch.setattr(database, "_replicas", None)
+    database.SessionLocal.configure(bind=primario)
+    database.configurar_replicas([replica])
+    yield primario, replica, replicar
+    database.SessionLocal.configure(bind=bind_anterior)
+    primario.dispose()
+    replica.dispose()
+
+
+class TestReplicas:
+    """Leituras em réplica com fallback e stickiness após escritas"""
+
+    def test_get_le_da_replica_e_escrita_vai_para_o_primario(self, bancos):
+        primario, replica, _ = bancos
+        client = TestClient(app)
+        resposta = client.post("/vagas/", json=vaga_payload())
+        assert resposta.status_code == 201
+        vaga_id = resposta.json()["id"]
+        with primario.connect() as conn:
+            assert conn.scalar(text("SELECT count(*) FROM vagas")) == 1
+        with replica.connect() as conn:
+            assert conn.scalar(text("SELECT count(*) FROM vagas")) == 0
+
+        # Outro cliente (sem o cookie) lê da réplica, que ainda não recebeu a vaga
+        assert TestClient(app).get(f"/vagas/{vaga_id}").status_code == 404
+
+    def test_le_o_que_acabou_de_escrever(self, bancos):
+        client = TestClient(app)
+        resposta = client.post("/vagas/", json=vaga_payload())
+        assert f"max-age={database.DB_REPLICA_STICKY_S}" in resposta.headers["set-cookie"].lower()
+        assert database.COOKIE_PRIMARIO in client.cookies
+        assert client.get(f"/vagas/{resposta.json()['id']}").status_code == 200
+
+    def test_replica_replicada_atende_o_get(self, bancos):
+        _, _, replicar = bancos
+        vaga_id = TestClient(app).post("/vagas/", json=vaga_payload()).json()["id"]
+        replicar()
+        assert TestClient(app).get(f"/vagas/{vaga_id}").json()["nome_vaga"] == vaga_payload()["nome_vaga"]
+
+    def test_replica_fora_do_ar_usa_o_primario(self, bancos, tmp_path):
+        database.configurar_replicas([_engine(tmp_path / "inexistente" / "replica.db")])
+        vaga_id = TestClient(app).post("/vagas/", json=vaga_payload()).json()["id"]
+        assert TestClient(app).get(f"/vagas/{vaga_id}").status_code == 200
+        assert database.get_replicas()[0].saudavel is False
+        assert database.estado_pool()["replicas"][0]["saudavel"] is False
+
+    def test_escrita_na_sessao_de_leitura_vai_para_o_primario(self, bancos):
+        primario, replica, _ = bancos
+        with database.SessionLocal() as db:
+            db.replica = replica
+            db.execute(insert(models.Vaga).values(**vaga_payload()))
+            db.commit()
+            assert db.scalar(text("SELECT count(*) FROM vagas")) == 0  # o SELECT vai para a réplica
+        with primario.connect() as conn:
+            assert conn.scalar(text("SELECT count(*) FROM vagas")) == 1
+
+    def test_pagina_publica_sem_cache_le_do_primario(self, bancos):
+        # A réplica ainda não tem a vaga; o que a página pública lê fica em cache por todo o TTL
+        vaga = TestClient(app).post("/vagas/", json=vaga_payload()).json()
+        assert TestClient(app).get(f"/vagas/publico/{vaga['slug']}").json()["id"] == vaga["id"]
+
+    def test_ranking_na_replica_nao_escreve(self, bancos):
+        primario, _, replicar = bancos
+        client = TestClient(app)
+        vaga_id = client.post("/vagas/", json=vaga_payload()).json()["id"]
+        client.post("/candidatos/", json=candidato_payload(vaga_id))
+        with primario.begin() as conn:
+            conn.execute(text("UPDATE candidato SET vetor = NULL"))
+        replicar()
+
+        # Os vetores ausentes são calculados em memória, sem gravar no primário
+        ranking = TestClient(app).get(f"/vagas/{vaga_id}/ranking")
+        assert ranking.status_code == 200 and len(ranking.json()) == 1
+        with primario.connect() as conn:
+            assert conn.scalar(text("SELECT vetor FROM candidato")) is None
@@ -0,0 +1,59 @@
+from app import crud, schemas, search
+from tests.conftest import candidato_payload, vaga_payload
+
+
+def _criar_candidatos(db_session, vaga_id, textos):
+    return [
+        crud.create_candidato(db_session, schemas.CandidatoCreate(
+            **candidato_payload(vaga_id, email=f"c{i}@example.com", transcricao=texto)))
+        for i, texto in enumerate(textos)
+    ]
+
+
+class TestSearch:
+    """Testes da busca textual de candidatos"""
+
+    def test_consulta_fts5_escapa_operadores(self):
+        assert search.consulta_fts5('python" OR NOT *') == '"python" "OR" "NOT"'
+
+    def test_busca_ignora_acentos_e_filtra_por_vaga(self, client, db_session):
+        vaga_a = crud.create_vaga(db_session, schemas.VagaCreate(**vaga_payload(slug="a")))
+        vaga_b = crud.create_vaga(db_session, schemas.VagaCreate(**vaga_payload(slug="b")))
+        (candidato,) = _criar_candidatos(db_session, vaga_a.id, ["Experiência com programação em Rust"])
+        _criar_candidatos(db_session, vaga_b.id, ["Também programação, mas em Go"])
+
+        data = client.get("/candidatos/search", params={"q": "programacao rust"}).json()
+        assert [c["id"] for c in data["items"]] == [candidato.id]
+        assert "transcricao" not in data["items"][0]
+
+        data = client.get("/candidatos/search", params={"q": "programação", "vaga_id": vaga_b.id}).json()
+        assert [c["vaga_id"] for c in data["items"]] == [vaga_b.id]
+
+    def test_ranking_e_paginacao(self, client, db_session):
+        vaga = crud.create_vaga(db_session, schemas.VagaCreate(**vaga_payload()))
+        textos = ["kubernetes " * n + "outros assuntos " * 5 for n in range(1, 8)]
+        candidatos = _criar_candidatos(db_session, vaga.id, textos)
+
+        vistos, cursor = [], ""
+        while cursor is not None:
+            data = client.get("/candidatos/search", params={"q": "kubernetes", "limit": 3, "cursor": cursor}).json()
+            vistos.extend(data["items"])
+            cursor = data["next_cursor"]
+        assert [c["id"] for c in vistos] == [c.id for c in reversed(candidatos)]
+        assert vistos[0]["score"] > vistos[-1]["score"]
+
+    def test_indice_acompanha_update_e_delete(self, client, db_session):
+        vaga = crud.create_vaga(db_session, schemas.VagaCreate(**vaga_payload()))
+        (candidato,) = _criar_candidatos(db_session, vaga.id, ["Sou especialista em Elixir"])
+
+        client.put(f"/candidatos/{candidato.id}", json={"transcricao": "Hoje trabalho com Haskell"})
+        assert client.get("/candidatos/search", params={"q": "elixir"}).json()["items"] == []
+        assert len(client.get("/candidatos/search", params={"q": "haskell"}).json()["items"]) == 1
+
+        client.delete(f"/candidatos/{candidato.id}")
+        assert client.get("/candidatos/search", params={"q": "haskell"}).json()["items"] == []
+
+    def test_importacao_em_lote_e_indexada(self, client, db_session):
+        vaga = crud.create_vaga(db_session, schemas.VagaCreate(**vaga_payload()))
+        client.post("/candidatos/bulk", json=[candidato_payload(vaga.id, skill="COBOL e mainframe")])
+        assert len(client.get("/candidatos/search", params={"q": "cobol"}).json()["items"]) == 1
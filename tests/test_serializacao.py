@@ -0,0 +1,34 @@
+import json
+from datetime import datetime
+from typing import List
+
+from fastapi.responses import ORJSONResponse
+
+from main import app
+from app import schemas, serializacao
+from tests.conftest import candidato_payload, vaga_payload
+
+
+class TestSerializacao:
+    """Testes do caminho rápido de serialização das listagens"""
+
+    def test_resposta_json_valida_uma_vez_e_respeita_exclude_unset(self):
+        itens = [{"id": 1, "email": "a@x.com", "created_at": datetime(2024, 1, 2, 3, 4, 5)}]
+        response = serializacao.resposta_json(List[schemas.CandidatoParcial], itens, exclude_unset=True)
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == [{"id": 1, "email": "a@x.com", "created_at": "2024-01-02T03:04:05"}]
+        assert serializacao.adaptador(List[schemas.CandidatoParcial]) is serializacao.adaptador(
+            List[schemas.CandidatoParcial])
+
+    def test_classe_padrao_e_orjson(self):
+        assert app.router.default_response_class is ORJSONResponse
+
+    def test_listagens_mantem_o_formato(self, client):
+        vaga = client.post("/vagas/", json=vaga_payload()).json()
+        candidato = client.post("/candidatos/", json=candidato_payload(vaga["id"])).json()
+
+        assert client.get("/vagas/").json() == [{**vaga, "total_candidatos": 1}]
+        resumo = client.get("/candidatos/").json()
+        assert resumo == [{campo: candidato[campo] for campo in schemas.CandidatoResumo.model_fields}]
+        pagina = client.get(f"/vagas/{vaga['id']}/candidatos/", params={"cursor": "", "fields": "email"}).json()
+        assert pagina == {"items": [{"id": candidato["id"], "email": candidato["email"]}], "next_cursor": None}
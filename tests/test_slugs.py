@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, schemas, slugs
+from app.models import Base, Vaga
+from tests.conftest import ContadorQueries, vaga_payload
+
+
+class TestSlugs:
+    """Testes da geração de slug no servidor"""
+
+    def test_normalizar(self):
+        assert slugs.normalizar("Desenvolvedor(a) Python Sênior!") == "desenvolvedor-a-python-senior"
+        assert slugs.normalizar("  Ação & Reação  ") == "acao-reacao"
+        assert slugs.normalizar("???") == "vaga"
+
+    def test_slug_gerado_em_um_statement(self, client, engine):
+        with ContadorQueries(engine) as contador:
+            vaga = client.post("/vagas/", json=vaga_payload(slug=None, nome_vaga="Engenheira de Dados")).json()
+        assert contador.total == 1, contador.statements
+        assert vaga["slug"] == f"engenheira-de-dados--{vaga['id']}"
+        assert client.get(f"/vagas/publico/{vaga['slug']}").json()["id"] == vaga["id"]
+
+    def test_slug_do_cliente_em_uso_responde_409(self, client):
+        assert client.post("/vagas/", json=vaga_payload()).status_code == 201
+        response = client.post("/vagas/", json=vaga_payload())
+        assert response.status_code == 409
+        outra = client.post("/vagas/", json=vaga_payload(slug="outra")).json()
+        assert client.put(f"/vagas/{outra['id']}", json={"slug": "desenvolvedor-python"}).status_code == 409
+        assert client.get(f"/vagas/{outra['id']}").json()["slug"] == "outra"
+
+    def test_slug_do_cliente_nao_toma_o_formato_gerado(self, client):
+        # "desenvolvedor-python--1" ocuparia o slug da próxima vaga criada sem slug
+        assert client.post("/vagas/", json=vaga_payload(slug="desenvolvedor-python--1")).status_code == 422
+        assert client.post("/vagas/", json=vaga_payload(slug="estagio-2025")).status_code == 201
+        gerada = client.post("/vagas/", json=vaga_payload(slug=None))
+        assert gerada.status_code == 201
+        assert gerada.json()["slug"] == f"desenvolvedor-python--{gerada.json()['id']}"
+
+        # O PUT pode reenviar o slug atual da própria vaga, mas não tomar o formato gerado
+        vaga_id = gerada.json()["id"]
+        assert client.put(f"/vagas/{vaga_id}", json=gerada.json()).status_code == 200
+        outra_id = client.post("/vagas/", json=vaga_payload(slug="outra")).json()["id"]
+        assert client.put(f"/vagas/{outra_id}", json={"slug": gerada.json()["slug"]}).status_code == 422
+        assert client.put(f"/vagas/{outra_id}", json={"slug": "python--3"}).status_code == 422
+        assert client.put(f"/vagas/{outra_id}", json={"slug": "python-3"}).status_code == 200
+
+    def test_slugs_de_vagas_antigas(self, client, db_session):
+        """Linhas gravadas antes da regra: o PUT reenvia o próprio slug e a geração não responde 500"""
+        for slug in ("desenvolvedor-python-11", "desenvolvedor-python--2"):
+            db_session.execute(insert(Vaga).values(**vaga_payload(slug=slug, nome_vaga="Antiga")))
+        db_session.commit()
+        antiga = client.get("/vagas/publico/desenvolvedor-python-11").json()
+        assert client.put(f"/vagas/{antiga['id']}", json={"slug": antiga["slug"]}).status_code == 200
+
+        # A próxima vaga gerada (id 3) não colide com o formato antigo
+        assert client.post("/vagas/", json=vaga_payload(slug=None)).json()["slug"] == "desenvolvedor-python--3"
+        client.delete("/vagas/3")
+        db_session.execute(update(Vaga).where(Vaga.id == 2).values(slug="desenvolvedor-python--3"))
+        db_session.commit()
+        assert client.post("/vagas/", json=vaga_payload(slug=None)).status_code == 409
+
+    def test_outra_violacao_de_integridade_nao_vira_409(self, db_session):
+        with pytest.raises(IntegrityError):
+            crud.create_vaga(db_session, schemas.VagaCreate.model_construct(**vaga_payload(nome_vaga=None)))
+
+
+@pytest.fixture
+def sessao_concorrente(tmp_path):
+    """SessionLocal sobre um SQLite em arquivo, compartilhável entre threads"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'slugs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    engine.dispose()
+
+
+def test_criacoes_concorrentes_com_o_mesmo_titulo(sessao_concorrente):
+    total = 2000
+
+    def criar(_):
+        with sessao_concorrente() as db:
+            return crud.create_vaga(db, schemas.VagaCreate(**vaga_payload(slug=None))).slug
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        gerados = list(executor.map(criar, range(total)))
+
+    assert len(set(gerados)) == total
+    assert all(slug.startswith("desenvolvedor-python--") for slug in gerados)